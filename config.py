@@ -1,4 +1,5 @@
 import os
+import logging
 import secrets
 from typing import List
 from dotenv import load_dotenv
@@ -23,7 +24,7 @@ if not SECRET_KEY:
     # Only generate a new key in development; in production this should cause an error
     if DEBUG:
         SECRET_KEY = secrets.token_hex(32)
-        print("WARNING: Using a randomly generated SECRET_KEY. This is only suitable for development.")
+        logging.getLogger("uqifeed").warning("Using a randomly generated SECRET_KEY. This is only suitable for development.")
     else:
         raise ValueError("SECRET_KEY must be set in production environment.")
         
@@ -55,9 +56,38 @@ FRONTEND_HOME_URL = f"{FRONTEND_URL}/home"
 # API services
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # "json" or "console"
+LOG_FILE = os.getenv("LOG_FILE", "app_errors.log")  # Empty to log to stdout only
+
+# Tracing
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "True").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", str(DEBUG)).lower() == "true"  # Exposes span timings to clients
+OTEL_EXPORT_ENABLED = os.getenv("OTEL_EXPORT_ENABLED", "False").lower() == "true"  # Needs opentelemetry-api and an SDK
+
+# Event loop monitoring
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "True").lower() == "true"
+LOOP_STALL_SAMPLING = os.getenv("LOOP_STALL_SAMPLING", str(DEBUG)).lower() == "true"  # Log stacks of blocking calls
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+
 # File upload config
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
 MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", "5242880"))  # 5MB default
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "media")  # WebP renditions, sharded by content hash
+
+# Meal reminder scheduler
+REMINDER_SCHEDULER_ENABLED = os.getenv("REMINDER_SCHEDULER_ENABLED", "True").lower() == "true"
+REMINDER_TIMEZONE = os.getenv("REMINDER_TIMEZONE", "Asia/Ho_Chi_Minh")  # Zone of the HH:MM reminder times
+
+# Background jobs
+JOBS_ENABLED = os.getenv("JOBS_ENABLED", "True").lower() == "true"
+JOB_TIMEZONE = os.getenv("JOB_TIMEZONE", REMINDER_TIMEZONE)  # Zone of the nightly job windows
+TASK_WORKER_COUNT = int(os.getenv("TASK_WORKER_COUNT", "4"))  # Queue workers per process, 0 disables them
+
+# Notification streaming
+# Change streams need a replica set; they let every worker push notifications created by any other
+NOTIFICATION_CHANGE_STREAMS = os.getenv("NOTIFICATION_CHANGE_STREAMS", "False").lower() == "true"
 
 # Rate limiting
 RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "100/minute")  # Default rate limit
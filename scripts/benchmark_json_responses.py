@@ -0,0 +1,132 @@
+"""
+Compare JSON serialization of food lists
+
+Times FastAPI's default path (response_model validation, jsonable_encoder
+and json.dumps) against MongoJSONResponse rendering for 1000 food
+documents shaped like those in the foods collection.
+
+Usage: python scripts/benchmark_json_responses.py [--foods 1000] [--rounds 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.responses import dumps_mongo
+
+class BenchmarkIngredient(BaseModel):
+    ingredient_id: Optional[str] = None
+    name: str
+    quantity: float
+    unit: str
+    calories: float
+    protein: float
+    fat: float
+    carb: float
+    fiber: float
+
+class BenchmarkFood(BaseModel):
+    id: str
+    user_id: str
+    name: str
+    meal_type: str
+    description: Optional[str] = None
+    image_url: Optional[str] = None
+    eating_time: datetime
+    total_calories: float
+    total_protein: float
+    total_fat: float
+    total_carb: float
+    total_fiber: float
+    ingredients: List[BenchmarkIngredient] = []
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+def build_foods(count: int) -> List[Dict[str, Any]]:
+    """Build food documents as Motor returns them"""
+    now = datetime.utcnow()
+    foods = []
+    for index in range(count):
+        _id = ObjectId()
+        foods.append({
+            "_id": _id,
+            "id": str(_id),
+            "user_id": "64b7f0c2a1e4d2b3c4d5e6f7",
+            "name": f"Phở bò {index}",
+            "meal_type": "lunch",
+            "description": "Phở bò tái chín với hành và rau thơm",
+            "image_url": f"uploads/{index}.jpg",
+            "eating_time": now - timedelta(hours=index),
+            "total_calories": 450.5,
+            "total_protein": 25.2,
+            "total_fat": 12.1,
+            "total_carb": 60.3,
+            "total_fiber": 3.4,
+            "ingredients": [
+                {
+                    "ingredient_id": ObjectId(),
+                    "name": name,
+                    "quantity": 100.0,
+                    "unit": "g",
+                    "calories": 120.0,
+                    "protein": 8.0,
+                    "fat": 3.0,
+                    "carb": 15.0,
+                    "fiber": 1.0
+                }
+                for name in ["Bánh phở", "Thịt bò", "Hành lá", "Giá đỗ", "Nước dùng"]
+            ],
+            "created_at": now,
+            "updated_at": now
+        })
+    return foods
+
+def default_path(foods: List[Dict[str, Any]]) -> bytes:
+    """Validate against the response model, encode and dump like FastAPI does by default"""
+    validated = [
+        BenchmarkFood(**{
+            **food,
+            "ingredients": [{**i, "ingredient_id": str(i["ingredient_id"])} for i in food["ingredients"]]
+        })
+        for food in foods
+    ]
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+def trusted_path(foods: List[Dict[str, Any]]) -> bytes:
+    """Render the documents directly like endpoints returning MongoJSONResponse do"""
+    return dumps_mongo(foods)
+
+def measure(render, foods: List[Dict[str, Any]], rounds: int) -> float:
+    """Best time of several rounds in milliseconds"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        render(foods)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--foods", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    foods = build_foods(args.foods)
+    before = measure(default_path, foods, args.rounds)
+    after = measure(trusted_path, foods, args.rounds)
+
+    print(f"Serializing {args.foods} foods, best of {args.rounds} rounds")
+    print(f"  response_model + jsonable_encoder: {before:8.2f} ms")
+    print(f"  MongoJSONResponse (orjson):        {after:8.2f} ms")
+    print(f"  Speedup:                           {before / after:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,80 @@ MACRO_RATIOS: Dict[str, Dict[str, float]] = {
     "drinks": {"max_calories_per_100ml": 20}
 }
 
+# Nutrition history settings
+HISTORY_MAX_DAYS = 366  # Longest range served by the history endpoint
+HISTORY_DEFAULT_DAYS = 30
+HISTORY_MOVING_AVERAGE_DAYS = 7
+
+# Autocomplete settings
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = 25
+SUGGEST_INDEX_REFRESH_SECONDS = 300  # Rebuild to pick up writes from other workers
+
+# Food search settings
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+FOODS_TEXT_INDEX = "foods_search_text"
+FOODS_TEXT_WEIGHTS = {"name": 10, "ingredients.name": 5, "description": 1}
+
+# Meal reminder scheduler settings
+MEAL_REMINDER_TYPES = ["breakfast", "lunch", "dinner"]
+REMINDER_BATCH_SIZE = 500  # Notifications per insert_many
+REMINDER_TICK_SECONDS = 60
+REMINDER_MAX_CATCHUP_MINUTES = 15  # Missed minutes still worth a late reminder
+REMINDER_LOCK_NAME = "meal_reminder_scheduler"
+REMINDER_LOCK_TTL_SECONDS = 180  # Leader renews every tick, expiry hands over to another worker
+
+# Notification stream settings
+STREAM_QUEUE_SIZE = 100  # Pending events per connection before the client is told to resync
+STREAM_HEARTBEAT_SECONDS = 15  # Keeps proxies from closing idle connections
+STREAM_REPLAY_LIMIT = 100  # Missed notifications replayed on reconnect
+STREAM_RETRY_MILLISECONDS = 3000
+
+# Unread notification counter settings
+UNREAD_RECOUNT_SECONDS = 60 * 60  # Counters older than this are recounted on read, healing any drift
+
+# Nutrition target recompute settings
+TARGET_RECOMPUTE_BATCH_SIZE = 500
+
+# Background job settings
+JOB_TICK_SECONDS = 60
+JOB_LOCK_TTL_SECONDS = 600  # Renewed at every checkpoint, expiry frees a job whose worker died
+JOB_RETRY_DELAY_SECONDS = 15 * 60  # Wait before retrying a failed job inside its window
+TARGET_REFRESH_HOUR = 2  # Local hour the nightly target refresh window opens
+TARGET_REFRESH_WINDOW_HOURS = 3
+TARGET_REFRESH_BATCH_SIZE = 200
+TARGET_REFRESH_PAUSE_SECONDS = 0.5  # Pause between batches to leave capacity for requests
+UPLOAD_SWEEP_HOUR = 4  # Local hour the orphaned upload sweep window opens
+UPLOAD_SWEEP_WINDOW_HOURS = 2
+UPLOAD_SWEEP_GRACE_HOURS = 24  # Newer files may belong to a dish that is not saved yet
+UPLOAD_SWEEP_BATCH_SIZE = 500
+UPLOAD_SWEEP_PAUSE_SECONDS = 0.2
+
+# Task queue settings
+TASK_LEASE_SECONDS = 60  # A task still running after its lease is reclaimed by another worker
+TASK_LEASE_RENEW_SECONDS = 20  # Running tasks extend their lease this often
+TASK_MAX_ATTEMPTS = 5
+TASK_RETRY_BASE_SECONDS = 5  # Doubled after every failed attempt
+TASK_POLL_SECONDS = 5  # Idle workers check for tasks enqueued by other processes
+TASK_FAILED_RETENTION_DAYS = 7  # Tasks that gave up are kept this long for inspection
+
+# Retention settings
+# TTL indexes: {collection: (date field, seconds after that date the document is removed)}
+RETENTION_TTL_INDEXES = {
+    "refresh_tokens": ("expires_at", 0),
+    "blacklisted_tokens": ("expires_at", 0),
+    "scheduler_locks": ("expires_at", 0),
+    "notification_archives": ("expires_at", 0),
+    "task_queue": ("expires_at", 0)
+}
+NOTIFICATION_ARCHIVE_AFTER_DAYS = 30  # Read notifications move to monthly archive buckets
+NOTIFICATION_ARCHIVE_RETENTION_DAYS = 730  # Archive buckets expire this long after their month starts
+RETENTION_BATCH_SIZE = 1000
+RETENTION_INTERVAL_SECONDS = 6 * 60 * 60
+RETENTION_LOCK_NAME = "retention_job"
+RETENTION_LOCK_TTL_SECONDS = 2 * RETENTION_INTERVAL_SECONDS  # Held across runs, so one worker keeps the job
+
 # Authentication Constants
 MAX_LOGIN_ATTEMPTS = 5
 LOGIN_TIMEOUT_MINUTES = 15
@@ -37,6 +111,23 @@ PASSWORD_REQUIREMENTS = {
     "require_special": True
 }
 
+# Logging Settings
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024  # 10MB
+LOG_FILE_BACKUP_COUNT = 5
+# {event: share of events kept}, for INFO events logged on every request
+LOG_SAMPLE_RATES = {
+    "db_operation_success": 0.01
+}
+
+# Tracing Settings
+SERVER_TIMING_MAX_ENTRIES = 5  # Span groups listed in the Server-Timing header
+
+# Event Loop Monitoring
+LOOP_LAG_INTERVAL_SECONDS = 0.5  # Ticker period, lag is how late each tick wakes up
+LOOP_LAG_WINDOW = 600  # Ticks kept for the percentiles, 5 minutes
+LOOP_LAG_REPORT_SECONDS = 60
+LOOP_STALL_STACK_DEPTH = 15  # Innermost frames logged for a blocked loop
+
 # Cache Settings
 CACHE_TTL = 300  # 5 minutes
 CACHE_SIZE = 1000
@@ -51,6 +142,15 @@ DB_WAIT_QUEUE_TIMEOUT_MS = 10000
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 ALLOWED_FILE_TYPES = ["image/jpeg", "image/png", "image/gif"]
 
+# Image Renditions
+# {rendition: longest side in pixels}, written as WebP next to every uploaded photo
+IMAGE_RENDITIONS = {
+    "thumb": 256,
+    "medium": 960
+}
+IMAGE_WEBP_QUALITY = 80
+IMAGE_CACHE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60  # Rendition URLs are content addressed, so they never change
+
 # Error Messages
 ERROR_MESSAGES = {
     "invalid_credentials": "Invalid username or password",
@@ -11,11 +11,17 @@ from datetime import datetime
 
 # Get logger
 from src.utils.error_handling import logger
+from src.utils.tracing import MongoCommandTracer
+from src.config.constants import FOODS_TEXT_INDEX, FOODS_TEXT_WEIGHTS, RETENTION_TTL_INDEXES
 
 load_dotenv()
 
 # Database connection setup
-client = AsyncIOMotorClient(config.MONGO_URI)
+# Every command becomes a span of the request that issued it
+client = AsyncIOMotorClient(
+    config.MONGO_URI,
+    event_listeners=[MongoCommandTracer()] if config.TRACING_ENABLED else []
+)
 db = client[config.DATABASE_NAME]
 
 # Collections
@@ -23,6 +29,7 @@ users_collection = db.users
 profiles_collection = db.profiles
 nutrition_targets_collection = db.nutrition_targets
 ingredients_collection = db.ingredients
+ingredient_catalog_collection = db.ingredient_catalog
 foods_collection = db.foods
 food_ingredients_collection = db.food_ingredients
 nutrition_comparisons_collection = db.nutrition_comparisons
@@ -31,10 +38,78 @@ advises_collection = db.advises
 daily_reports_collection = db.daily_reports
 weekly_reports_collection = db.weekly_reports
 weekly_ingredient_usages_collection = db.weekly_ingredient_usages
+ingredient_usage_rollups_collection = db.ingredient_usage_rollups
 weekly_report_comments_collection = db.weekly_report_comments
 meal_type_standards_collection = db.meal_type_standards
 notifications_collection = db.notifications
 notification_settings_collection = db.notification_settings
+notification_counters_collection = db.notification_counters
+notification_archives_collection = db.notification_archives
+scheduler_locks_collection = db.scheduler_locks
+jobs_collection = db.jobs
+task_queue_collection = db.task_queue
+
+# Named projections for hot reads, so only the fields a use case needs are sent and decoded
+# Authenticated user attached to requests, never the password hash
+USER_SESSION_PROJECTION = {"password": 0}
+
+# Food totals for reports, meal sums and comparisons
+FOOD_TOTALS_PROJECTION = {
+    "name": 1,
+    "user_id": 1,
+    "meal_type": 1,
+    "eating_time": 1,
+    "total_calories": 1,
+    "total_protein": 1,
+    "total_fat": 1,
+    "total_carb": 1,
+    "total_fiber": 1,
+    "nutrition_score": 1,
+    "updated_at": 1
+}
+
+# Compact food rows for list views, ingredients are expanded on request
+FOOD_LIST_PROJECTION = {
+    "name": 1,
+    "meal_type": 1,
+    "eating_time": 1,
+    "total_calories": 1,
+    "total_protein": 1,
+    "total_fat": 1,
+    "total_carb": 1,
+    "total_fiber": 1,
+    "image_url": 1,
+    "thumbnail_url": 1
+}
+
+# Notification fields of NotificationResponse, so list pages can be sent as read
+NOTIFICATION_LIST_PROJECTION = {
+    "title": 1,
+    "message": 1,
+    "type": 1,
+    "is_read": 1,
+    "data": 1,
+    "user_id": 1,
+    "created_at": 1
+}
+
+# Daily nutrient goals and their version
+TARGET_VALUES_PROJECTION = {
+    "calories": 1,
+    "protein": 1,
+    "fat": 1,
+    "carb": 1,
+    "fiber": 1,
+    "updated_at": 1
+}
+
+# Target version only, for checking stored results
+TARGET_VERSION_PROJECTION = {"updated_at": 1}
+
+# Body measurements for BMI
+PROFILE_BODY_PROJECTION = {"height": 1, "weight": 1}
+refresh_tokens_collection = db.refresh_tokens
+blacklisted_tokens_collection = db.blacklisted_tokens
 
 # MongoDB ID helper class
 class PyObjectId(ObjectId):
@@ -89,7 +164,24 @@ async def create_database_indexes():
         # Foods collection indexes
         await foods_collection.create_index("user_id")
         await foods_collection.create_index("date")
-        await foods_collection.create_index([("food_name", TEXT)], default_language='english')
+        await foods_collection.create_index([("user_id", ASCENDING), ("eating_time", ASCENDING)])
+        # Lookups by photo for the orphaned upload sweep
+        await foods_collection.create_index("image_url", sparse=True)
+        await foods_collection.create_index("thumbnail_url", sparse=True)
+        # A collection holds one text index, drop older ones (e.g. on "food_name")
+        for index_name, index_info in (await foods_collection.index_information()).items():
+            is_text = any(kind == TEXT for _, kind in index_info["key"])
+            if is_text and index_name != FOODS_TEXT_INDEX:
+                await foods_collection.drop_index(index_name)
+        
+        # Search index over dish names, ingredient names and descriptions
+        # "none" skips English stemming, which would mangle Vietnamese dish names
+        await foods_collection.create_index(
+            [(field, TEXT) for field in FOODS_TEXT_WEIGHTS],
+            name=FOODS_TEXT_INDEX,
+            weights=FOODS_TEXT_WEIGHTS,
+            default_language='none'
+        )
         
         # Food ingredients collection indexes
         await food_ingredients_collection.create_index("food_id")
@@ -97,12 +189,28 @@ async def create_database_indexes():
         
         # Ingredients collection indexes
         await ingredients_collection.create_index([("name", TEXT)], default_language='english')
+        await ingredients_collection.create_index("food_id")
+        
+        # Ingredient catalogue indexes
+        await ingredient_catalog_collection.create_index("normalized_name", unique=True)
         
         # Nutrition comparisons collection indexes
         await nutrition_comparisons_collection.create_index("food_id")
         await nutrition_comparisons_collection.create_index("user_id")
         await nutrition_comparisons_collection.create_index("date")
         
+        # One comparison per food and target version, older rows without versions are left out
+        await nutrition_comparisons_collection.create_index(
+            [
+                ("food_id", ASCENDING),
+                ("user_id", ASCENDING),
+                ("food_updated_at", ASCENDING),
+                ("target_updated_at", ASCENDING)
+            ],
+            unique=True,
+            partialFilterExpression={"nutrition_score": {"$exists": True}}
+        )
+        
         # Daily reports collection indexes
         await daily_reports_collection.create_index([("user_id", ASCENDING), ("date", ASCENDING)], unique=True)
         await daily_reports_collection.create_index("date")
@@ -114,13 +222,41 @@ async def create_database_indexes():
         # Weekly ingredient usages collection indexes
         await weekly_ingredient_usages_collection.create_index([("report_id", ASCENDING), ("ingredient_name", ASCENDING)])
         await weekly_ingredient_usages_collection.create_index([("count", DESCENDING)])
+        await weekly_ingredient_usages_collection.create_index([("report_id", ASCENDING), ("count", DESCENDING)])
         
         # Notifications collection indexes
         await notifications_collection.create_index([("user_id", ASCENDING), ("created_at", DESCENDING)])
         await notifications_collection.create_index([("user_id", ASCENDING), ("is_read", ASCENDING)])
+        await notifications_collection.create_index([("is_read", ASCENDING), ("created_at", ASCENDING)])
         
         # Notification settings collection indexes
         await notification_settings_collection.create_index("user_id", unique=True)
+        await notification_settings_collection.create_index([("reminder_times.$**", ASCENDING)])
+        
+        # Scheduled reminders are sent at most once per user and key
+        await notifications_collection.create_index(
+            [("user_id", ASCENDING), ("data.reminder_key", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"data.reminder_key": {"$exists": True}}
+        )
+        
+        # Task queue indexes: workers claim by availability, expired leases are reclaimed
+        await task_queue_collection.create_index([("status", ASCENDING), ("available_at", ASCENDING)])
+        await task_queue_collection.create_index([("status", ASCENDING), ("locked_until", ASCENDING)])
+        
+        # At most one pending task per dedupe key
+        await task_queue_collection.create_index(
+            "dedupe_key",
+            unique=True,
+            partialFilterExpression={"status": "pending", "dedupe_key": {"$exists": True}}
+        )
+        
+        # Notification archive indexes
+        await notification_archives_collection.create_index([("user_id", ASCENDING), ("month", DESCENDING)])
+        
+        # TTL indexes let MongoDB remove expired documents itself
+        for collection_name, (field, expire_after_seconds) in RETENTION_TTL_INDEXES.items():
+            await db[collection_name].create_index(field, expireAfterSeconds=expire_after_seconds)
         
         logger.info("Database indexes created successfully")
     except Exception as e:
@@ -24,18 +24,41 @@ from src.routes.food import food_router
 from src.routes.calorie.calorie_routes import router as calorie_router
 from src.routes.notification import router as notification_router
 from src.routes.dish import router as dish_router
-from src.utils.error_handling import error_handling_middleware, SecureHeadersMiddleware, APIMetricsMiddleware
+from src.routes.admin import router as admin_router
+from src.routes.image import router as image_router
+from src.utils.error_handling import error_handling_middleware, SecureHeadersMiddleware, APIMetricsMiddleware, RequestContextMiddleware
+from src.utils.tracing import TracingMiddleware, enable_opentelemetry_export
+from src.utils.loop_monitor import loop_monitor
+from src.utils.background_tasks import start_background_task, cancel_background_tasks
 from src.config.database import initialize_database, initialize_meal_type_standards, client
+from src.services.food.food_suggest import load_suggestion_index, refresh_suggestion_index
+from src.services.notification.reminder_scheduler import run_reminder_scheduler
+from src.services.notification.notification_stream import run_change_stream_feed
+from src.services.retention.retention_service import run_retention_job
+from src.services.jobs import (
+    register_job,
+    run_job_scheduler,
+    run_task_workers,
+    TARGET_REFRESH_JOB,
+    refresh_age_dependent_targets,
+    UPLOAD_SWEEP_JOB,
+    sweep_orphaned_uploads,
+    TARGET_RECOMPUTE_JOB,
+    recompute_nutrition_targets
+)
+import src.services.calorie.precompute_tasks  # Registers the post-save precompute tasks
+from src.config.constants import (
+    TARGET_REFRESH_HOUR,
+    TARGET_REFRESH_WINDOW_HOURS,
+    UPLOAD_SWEEP_HOUR,
+    UPLOAD_SWEEP_WINDOW_HOURS,
+    SERVER_TIMING_MAX_ENTRIES
+)
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename='app_errors.log'
-)
+# Logging is configured by src.utils.error_handling
 logger = logging.getLogger(__name__)
 
 # Initialize rate limiter
@@ -69,6 +92,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record each request as a trace of its Mongo, Gemini and password spans
+if config.TRACING_ENABLED:
+    app.add_middleware(
+        TracingMiddleware,
+        server_timing_limit=SERVER_TIMING_MAX_ENTRIES if config.SERVER_TIMING_ENABLED else None
+    )
+    if config.OTEL_EXPORT_ENABLED:
+        enable_opentelemetry_export()
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -89,6 +121,9 @@ async def add_process_time_header(request: Request, call_next):
         error_response.headers["X-Process-Time"] = str(process_time)
         return error_response
 
+# Tag log lines with the request; registered last so it is outermost and every middleware's logs carry it
+app.add_middleware(RequestContextMiddleware)
+
 # Include routers
 app.include_router(user_router)
 app.include_router(food_router)
@@ -96,16 +131,62 @@ app.include_router(calorie_router)
 app.include_router(social_auth_routes)
 app.include_router(notification_router)
 app.include_router(dish_router)
+app.include_router(admin_router)
+app.include_router(image_router)
 
 @app.on_event("startup")
 async def startup_db_client():
     """Initialize database connection and setup on application startup"""
+    # Measure event loop lag, and in debug mode name the calls that block it
+    if config.LOOP_MONITOR_ENABLED:
+        start_background_task(loop_monitor.run())
+        if config.LOOP_STALL_SAMPLING:
+            loop_monitor.start_stall_sampler(config.LOOP_STALL_THRESHOLD_MS)
+    
     try:
         # Initialize database connection and indexes
         db_initialized = await initialize_database()
         if db_initialized:
             # Only initialize meal type standards if database connection is successful
             await initialize_meal_type_standards()
+            
+            # Build the autocomplete index and keep it fresh
+            await load_suggestion_index()
+            start_background_task(refresh_suggestion_index())
+            
+            # Send scheduled meal reminders, only one worker dispatches at a time
+            if config.REMINDER_SCHEDULER_ENABLED:
+                start_background_task(run_reminder_scheduler())
+            
+            # Feed notification streams from every worker's inserts
+            if config.NOTIFICATION_CHANGE_STREAMS:
+                start_background_task(run_change_stream_feed())
+            
+            # Archive old notifications on one worker
+            start_background_task(run_retention_job())
+            
+            # Jobs without a window only run when an admin starts them
+            register_job(TARGET_RECOMPUTE_JOB, recompute_nutrition_targets)
+            
+            # Run nightly jobs inside their windows
+            if config.JOBS_ENABLED:
+                register_job(
+                    TARGET_REFRESH_JOB,
+                    refresh_age_dependent_targets,
+                    hour=TARGET_REFRESH_HOUR,
+                    window_hours=TARGET_REFRESH_WINDOW_HOURS
+                )
+                register_job(
+                    UPLOAD_SWEEP_JOB,
+                    sweep_orphaned_uploads,
+                    hour=UPLOAD_SWEEP_HOUR,
+                    window_hours=UPLOAD_SWEEP_WINDOW_HOURS
+                )
+                start_background_task(run_job_scheduler())
+            
+            # Process queued post-save work
+            if config.TASK_WORKER_COUNT > 0:
+                start_background_task(run_task_workers(config.TASK_WORKER_COUNT))
             logger.info("Application startup completed successfully")
         else:
             logger.critical("Database initialization failed")
@@ -118,6 +199,11 @@ async def startup_db_client():
             import sys
             sys.exit(1)
 
+@app.on_event("shutdown")
+async def shutdown_background_tasks():
+    """Cancel background loops and admin-started jobs, waiting for their cleanup and lock releases"""
+    await cancel_background_tasks()
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 @limiter.limit("10/minute")
@@ -145,7 +231,8 @@ async def health():
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "database": db_status
+        "database": db_status,
+        "event_loop": loop_monitor.snapshot()
     }
 
 # Custom OpenAPI schema for better documentation
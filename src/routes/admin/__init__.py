@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from .admin_routes import router as admin_routes
+
+# Main admin router
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+# Include sub-routers
+router.include_router(admin_routes)
+
+# Export the main router
+__all__ = ["router"]
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.config.database import jobs_collection
+
+from src.services.authentication.user_auth import get_current_user
+from src.services.retention.retention_service import archive_read_notifications, get_collection_sizes
+from src.services.jobs.scheduler import JOBS, run_job
+from src.services.jobs.target_recompute_job import TARGET_RECOMPUTE_JOB
+from src.utils.background_tasks import start_background_task
+
+# Initialize router
+router = APIRouter(
+    tags=["admin"]
+)
+
+async def get_admin_user(current_user = Depends(get_current_user)):
+    """Allow only administrators through"""
+    if current_user.get("role") != "admin":
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return current_user
+
+@router.get("/collections")
+async def collection_sizes(admin_user = Depends(get_admin_user)):
+    """Report document counts, data and index sizes per collection"""
+    return {"collections": await get_collection_sizes()}
+
+@router.post("/retention/run")
+async def run_retention(admin_user = Depends(get_admin_user)):
+    """Archive old read notifications now instead of waiting for the scheduled run"""
+    archived = await archive_read_notifications()
+    return {"status": "success", "archived_count": archived}
+
+@router.post("/nutrition-targets/recompute", status_code=202)
+async def recompute_nutrition_targets(admin_user = Depends(get_admin_user)):
+    """
+    Start recomputing every user's nutrition target, e.g. after a formula change
+    
+    Runs as a background job; its progress is reported by GET /admin/jobs under the returned name.
+    """
+    return await trigger_job(TARGET_RECOMPUTE_JOB, admin_user)
+
+@router.get("/jobs")
+async def list_jobs(admin_user = Depends(get_admin_user)):
+    """Report the status, progress and next run of every registered job"""
+    states = {
+        state["_id"]: state
+        async for state in jobs_collection.find({"_id": {"$in": list(JOBS)}})
+    }
+    jobs = []
+    for name, job in JOBS.items():
+        state = states.get(name, {})
+        state.pop("_id", None)
+        jobs.append({"name": name, "hour": job.hour, "window_hours": job.window_hours, **state})
+    return {"jobs": jobs}
+
+@router.post("/jobs/{name}/run", status_code=202)
+async def trigger_job(name: str, admin_user = Depends(get_admin_user)):
+    """Start a job now outside its window, resuming from its last checkpoint"""
+    job = JOBS.get(name)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    start_background_task(run_job(job))
+    return {"status": "started", "name": name}
@@ -1,25 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, Body, Query
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Header
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from pydantic import BaseModel
+import json
 
 from src.services.calorie import (
     calculate_dish_calories,
     create_nutrition_comparison,
-    calculate_nutrition_score,
-    generate_strengths,
-    generate_weaknesses,
     generate_nutrient_comment,
-    update_daily_report,
+    get_daily_report,
     generate_weekly_report,
     get_weekly_statistics,
     calculate_meal_calories,
-    calculate_total_nutrition
+    calculate_total_nutrition,
+    iter_daily_nutrition,
+    get_nutrition_history,
+    validate_history_range,
+    resolve_locale
 )
+from src.config.constants import HISTORY_DEFAULT_DAYS
 from src.middleware import get_current_user
 
 router = APIRouter()
 
+def get_locale(
+    lang: Optional[str] = Query(None, description="Language of comments, e.g. vi or en"),
+    accept_language: Optional[str] = Header(None)
+) -> str:
+    """Pick the comment language from the lang parameter or Accept-Language"""
+    return resolve_locale(lang or accept_language)
+
 class CaloriesRequest(BaseModel):
     food_id: str
 
@@ -33,6 +44,12 @@ class MealRequest(BaseModel):
     date: str  # Format: YYYY-MM-DD
     meal_type: str  # breakfast, lunch, dinner, snack
 
+class HistoryRequest(BaseModel):
+    end_date: Optional[str] = None  # Format: YYYY-MM-DD, defaults to today
+    start_date: Optional[str] = None  # Format: YYYY-MM-DD, overrides days
+    days: int = HISTORY_DEFAULT_DAYS  # e.g. 30, 90 or 365
+    stream: bool = False  # Stream daily rows as NDJSON
+
 @router.post("/dish-calories")
 async def dish_calories_endpoint(
     request: CaloriesRequest,
@@ -44,31 +61,28 @@ async def dish_calories_endpoint(
 @router.post("/comparison")
 async def create_comparison_endpoint(
     request: CaloriesRequest, 
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    locale: str = Depends(get_locale)
 ):
     """Create a nutrition comparison between food and user's target"""
+    # Stored per food and target version, so repeated opens reuse one document
     comparison = await create_nutrition_comparison(request.food_id, current_user["id"])
     
-    # Enhance the comparison with analysis
-    comparison["nutrition_score"] = await calculate_nutrition_score(comparison)
-    comparison["strengths"] = await generate_strengths(comparison)
-    comparison["weaknesses"] = await generate_weaknesses(comparison)
-    
     # Add specific nutrient comments
     comparison["calories_comment"] = await generate_nutrient_comment(
-        comparison, "diff_calories", "calorie"
+        comparison, "diff_calories", "calorie", locale
     )
     comparison["protein_comment"] = await generate_nutrient_comment(
-        comparison, "diff_protein", "protein"
+        comparison, "diff_protein", "protein", locale
     )
     comparison["fat_comment"] = await generate_nutrient_comment(
-        comparison, "diff_fat", "fat"
+        comparison, "diff_fat", "fat", locale
     )
     comparison["carb_comment"] = await generate_nutrient_comment(
-        comparison, "diff_carb", "carbohydrate"
+        comparison, "diff_carb", "carbohydrate", locale
     )
     comparison["fiber_comment"] = await generate_nutrient_comment(
-        comparison, "diff_fiber", "fiber"
+        comparison, "diff_fiber", "fiber", locale
     )
     
     return comparison
@@ -81,7 +95,7 @@ async def daily_report_endpoint(
     """Get or update daily nutrition report"""
     try:
         date_obj = datetime.strptime(request.date, "%Y-%m-%d").date()
-        return await update_daily_report(current_user["id"], date_obj)
+        return await get_daily_report(current_user["id"], date_obj)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
@@ -100,7 +114,8 @@ async def weekly_report_endpoint(
 @router.post("/weekly-statistics")
 async def weekly_statistics_endpoint(
     request: Optional[WeekRequest] = None,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    locale: str = Depends(get_locale)
 ):
     """Get weekly statistics for visualization"""
     try:
@@ -108,9 +123,39 @@ async def weekly_statistics_endpoint(
         if request and request.week_start_date:
             start_date = datetime.strptime(request.week_start_date, "%Y-%m-%d").date()
             
-        return await get_weekly_statistics(current_user["id"], start_date)
+        return await get_weekly_statistics(current_user["id"], start_date, locale)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+@router.post("/history")
+async def nutrition_history_endpoint(
+    request: HistoryRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """Get per-day and per-week nutrition history for an arbitrary range"""
+    try:
+        end_date = datetime.now().date()
+        if request.end_date:
+            end_date = datetime.strptime(request.end_date, "%Y-%m-%d").date()
+        
+        if request.start_date:
+            start_date = datetime.strptime(request.start_date, "%Y-%m-%d").date()
+        else:
+            start_date = end_date - timedelta(days=max(request.days, 1) - 1)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    if not request.stream:
+        return await get_nutrition_history(current_user["id"], start_date, end_date)
+    
+    # Validate up front since errors cannot be reported once streaming starts
+    validate_history_range(start_date, end_date)
+    
+    async def ndjson_rows():
+        async for day in iter_daily_nutrition(current_user["id"], start_date, end_date):
+            yield json.dumps(day) + "\n"
+    
+    return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
 
 @router.post("/meal-calories")
 async def meal_calories_endpoint(
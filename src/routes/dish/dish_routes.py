@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
 from typing import List, Optional
 from datetime import date
 
@@ -15,9 +15,12 @@ from src.services.food import (
     upload_dish_image,
     save_new_dish_to_db,
     get_food_with_ingredients,
-    search_foods,
     detect_food_from_image
 )
+from src.services.food.food_service import list_food_summaries
+from src.services.food.image_store import create_image_renditions, rendition_fields
+from src.schemas.food.food_schema import FoodSummaryResponse
+from src.utils.responses import MongoJSONResponse
 
 # Initialize router
 router = APIRouter(
@@ -29,9 +32,10 @@ async def upload_image(
     file: UploadFile = File(...),
     current_user = Depends(get_current_user)
 ):
-    """Upload a food image"""
+    """Upload a food image and create its WebP thumbnail and medium renditions"""
     file_path = await upload_dish_image(file)
-    return {"file_path": file_path}
+    renditions = await create_image_renditions(file_path)
+    return {"file_path": file_path, **rendition_fields(renditions)}
 
 @router.post("/analyze-uploaded", response_model=FoodRecognitionResponse)
 async def analyze_uploaded_image(
@@ -67,17 +71,20 @@ async def get_food(
     
     return food
 
-@router.get("/", response_model=List[FoodResponse])
+@router.get("/", response_model=List[FoodSummaryResponse])
 async def list_foods(
     skip: int = 0,
     limit: int = 100,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     meal_type: Optional[str] = None,
+    expand: Optional[str] = Query(None, regex="^ingredients$"),
     current_user = Depends(get_current_user)
 ):
-    """List user's food entries with filtering options"""
-    foods = await search_foods(
+    """List user's food entries in compact form, expand=ingredients adds their ingredients"""
+    # Summaries hold exactly the FoodSummaryResponse fields, so they are sent as built
+    foods = await list_food_summaries(
+        expand_ingredients=expand == "ingredients",
         user_id=current_user["id"],
         skip=skip,
         limit=limit,
@@ -86,4 +93,4 @@ async def list_foods(
         meal_type=meal_type
     )
     
-    return foods
\ No newline at end of file
+    return MongoJSONResponse(foods)
\ No newline at end of file
@@ -4,6 +4,8 @@ import os
 import uuid
 from datetime import datetime
 
+import config
+
 from src.services.authentication.user_auth import get_current_user
 from src.services.food import detect_food_from_image
 from src.schemas.food.food_schema import FoodDetectionResponse, FoodItem
@@ -28,7 +30,7 @@ async def detect_food(
     # Save uploaded file temporarily
     file_extension = os.path.splitext(file.filename)[1]
     unique_filename = f"{uuid.uuid4()}{file_extension}"
-    upload_folder = "uploads"
+    upload_folder = config.UPLOAD_DIR
     
     # Ensure upload directory exists
     os.makedirs(upload_folder, exist_ok=True)
@@ -5,30 +5,97 @@ from src.utils.error_handling import handle_api_error, NotFoundError, Authorizat
 
 from src.middleware import get_current_user
 from src.services.food import search_foods, get_food_with_ingredients, update_food, delete_food
-from src.schemas.food.food_schema import FoodUpdate, FoodResponse
+from src.services.food.food_suggest import suggestion_index
+from src.services.food.food_service import search_foods_text, list_food_summaries
+from src.schemas.food.food_schema import FoodUpdate, FoodResponse, FoodSummaryResponse
+from src.config.constants import SUGGEST_DEFAULT_LIMIT, SUGGEST_MAX_LIMIT, SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+from src.utils.responses import MongoJSONResponse
 
 # Initialize router
 router = APIRouter(
     tags=["food-service"]
 )
 
-@router.get("/", response_model=List[FoodResponse])
+@router.get("/", response_model=List[FoodSummaryResponse])
 async def list_foods(
     name: Optional[str] = Query(None, description="Filter by food name"),
     category: Optional[str] = Query(None, description="Filter by food category"),
     skip: int = Query(0, description="Number of records to skip"),
     limit: int = Query(100, description="Maximum number of records to return"),
+    expand: Optional[str] = Query(None, regex="^ingredients$", description="Set to ingredients to include each food's ingredients"),
     current_user = Depends(get_current_user)
 ):
     """
     List foods with optional filtering
     
+    Foods are returned in their compact form; use GET /foods/{food_id} for full details.
+    
     - **name**: Optional filter by food name (partial match)
     - **category**: Optional filter by food category
     - **skip**: Number of records to skip for pagination
     - **limit**: Maximum number of records to return
+    - **expand**: Optional, "ingredients" to include each food's ingredients
+    """
+    # Summaries hold exactly the FoodSummaryResponse fields, so they are sent as built
+    return MongoJSONResponse(await list_food_summaries(
+        expand_ingredients=expand == "ingredients",
+        name=name,
+        category=category,
+        user_id=current_user["id"],
+        skip=skip,
+        limit=limit
+    ))
+
+@router.get("/suggest", response_model=dict)
+async def suggest_names(
+    q: str = Query(..., min_length=1, description="Typed prefix, accents optional"),
+    kind: Optional[str] = Query(None, alias="type", regex="^(food|ingredient)$", description="Restrict to food or ingredient names"),
+    limit: int = Query(SUGGEST_DEFAULT_LIMIT, ge=1, le=SUGGEST_MAX_LIMIT, description="Maximum number of suggestions"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Autocomplete food and ingredient names
+    
+    Served from an in-memory prefix index, so no database query runs per keystroke.
+    Food names come from the user's own log, ingredient names from the shared catalogue.
+    
+    - **q**: Prefix of any word in the name, e.g. "pho" or "bo" for "Phở bò"
+    - **type**: Optional filter, "food" or "ingredient"
+    - **limit**: Maximum number of suggestions
+    """
+    return {
+        "query": q,
+        "suggestions": suggestion_index.search(q, limit=limit, kind=kind, user_id=current_user["id"])
+    }
+
+@router.get("/search", response_model=dict)
+async def search_foods_by_relevance(
+    q: str = Query(..., min_length=1, description="Words to match in names, ingredients and descriptions"),
+    meal_type: Optional[str] = Query(None, description="Filter by meal type"),
+    start_date: Optional[datetime] = Query(None, description="Earliest eating time"),
+    end_date: Optional[datetime] = Query(None, description="Latest eating time"),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Search your foods ranked by relevance
+    
+    - **q**: Search terms, matched against dish names, ingredient names and descriptions
+    - **meal_type**: Optional filter by meal type
+    - **start_date**, **end_date**: Optional eating time range
+    - **limit**: Maximum number of results per page
+    - **cursor**: Pass the returned next_cursor to get the following page
     """
-    return await search_foods(name=name, category=category, user_id=current_user["id"], skip=skip, limit=limit)
+    return await search_foods_text(
+        user_id=current_user["id"],
+        query=q,
+        meal_type=meal_type,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit,
+        cursor=cursor
+    )
 
 @router.get("/{food_id}", response_model=FoodResponse)
 @handle_api_error
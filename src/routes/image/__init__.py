@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from .image_routes import router as image_routes
+
+# Main image router
+router = APIRouter(
+    prefix="/images",
+    tags=["images"]
+)
+
+# Include sub-routers
+router.include_router(image_routes)
+
+# Export the main router
+__all__ = ["router"]
@@ -0,0 +1,41 @@
+import os
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from src.config.constants import IMAGE_CACHE_MAX_AGE_SECONDS
+from src.services.food.image_store import rendition_path
+
+# Initialize router
+router = APIRouter(
+    tags=["images"]
+)
+
+@router.get("/{digest}/{rendition}.webp", response_class=FileResponse)
+async def get_image_rendition(digest: str, rendition: str, request: Request):
+    """
+    Serve a WebP rendition of an uploaded photo
+    
+    URLs are content addressed, so responses may be cached forever and a
+    revalidating client always gets 304. FileResponse answers Range requests.
+    
+    - **digest**: SHA-256 of the uploaded photo
+    - **rendition**: "thumb" or "medium"
+    """
+    path = rendition_path(digest, rendition)
+    if not path or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    # The URL identifies the content, so it doubles as the ETag
+    etag = f'"{digest}-{rendition}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={IMAGE_CACHE_MAX_AGE_SECONDS}, immutable"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since"):
+        # Any copy the client holds of this URL is the current one
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(path, media_type="image/webp", headers=headers)
@@ -1,21 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict
 from datetime import datetime, date, time, timedelta
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne, DeleteOne, ReturnDocument
 
-from src.config.database import notifications_collection, notification_settings_collection
+from src.config.database import notifications_collection, notification_settings_collection, NOTIFICATION_LIST_PROJECTION
 from src.schemas.notification.notification_schema import (
     NotificationResponse, 
     NotificationSettingsResponse, 
-    NotificationSettingsUpdate
+    NotificationSettingsUpdate,
+    NotificationBatchRequest
 )
 from src.services.authentication.user_auth import get_current_user
+from src.utils.db_utils import upsert_document
+from src.services.notification.reminder_scheduler import build_meal_reminder
+from src.services.notification.notification_service import insert_notification
+from src.services.notification.unread_counter import get_unread_count, decrement_unread
+from src.services.notification.notification_stream import stream_notifications
+from src.utils.responses import MongoJSONResponse
 
 # Initialize router
 router = APIRouter(
     tags=["notifications"]
 )
 
+def _parse_notification_id(notification_id: str) -> ObjectId:
+    """Convert a notification ID, answering 404 for malformed ones"""
+    try:
+        return ObjectId(notification_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=404, detail="Notification not found")
+
+def _default_notification_settings() -> Dict:
+    """Build the settings a user starts with"""
+    return {
+        "meal_reminders": True,
+        "weekly_report": True,
+        "nutrition_tips": True,
+        "progress_updates": True,
+        "marketing": False,
+        "reminder_times": {
+            "breakfast": "08:00",
+            "lunch": "12:00",
+            "dinner": "18:00"
+        }
+    }
+
 # Enhanced notification routes
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
@@ -37,28 +69,52 @@ async def get_notifications(
     if type:
         query["type"] = type
     
-    # Get notifications with pagination
-    notifications = await notifications_collection.find(query).sort(
+    # Get notifications with pagination, projected to the NotificationResponse fields
+    notifications = await notifications_collection.find(query, NOTIFICATION_LIST_PROJECTION).sort(
         "created_at", -1
     ).skip(offset).limit(limit).to_list(length=limit)
     
-    # Add id field for each notification
-    for notification in notifications:
-        notification["id"] = str(notification["_id"])
-    
-    return notifications
+    # Sent as read, _id is written as a string like the response model does
+    return MongoJSONResponse(notifications)
 
 @router.get("/count")
-async def get_unread_count(
+async def get_unread_notification_count(
+    request: Request,
     current_user = Depends(get_current_user)
 ):
-    """Get count of unread notifications"""
-    count = await notifications_collection.count_documents({
-        "user_id": current_user["id"],
-        "is_read": False
-    })
+    """Get count of unread notifications, answering 304 when it has not changed"""
+    count = await get_unread_count(current_user["id"])
     
-    return {"unread_count": count}
+    # The body is just the count, so the count itself identifies the version
+    etag = f'W/"unread-{count}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    return MongoJSONResponse({"unread_count": count}, headers=headers)
+
+@router.get("/stream")
+async def stream_user_notifications(
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    """
+    Push new notifications as server-sent events instead of polling
+    
+    Reconnecting clients send Last-Event-ID and receive what they missed.
+    A "resync" event means the client fell behind and should refetch.
+    """
+    events = stream_notifications(
+        current_user["id"],
+        last_event_id=request.headers.get("last-event-id"),
+        is_disconnected=request.is_disconnected
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # An explicit encoding keeps the gzip middleware from buffering events
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"}
+    )
 
 @router.put("/{notification_id}/read")
 async def mark_notification_read(
@@ -66,20 +122,20 @@ async def mark_notification_read(
     current_user = Depends(get_current_user)
 ):
     """Mark a notification as read"""
-    # Check if notification exists and belongs to the user
-    notification = await notifications_collection.find_one({
-        "_id": ObjectId(notification_id),
-        "user_id": current_user["id"]
-    })
+    # Mark as read in one step, matching only the user's own notification
+    previous = await notifications_collection.find_one_and_update(
+        {"_id": _parse_notification_id(notification_id), "user_id": current_user["id"]},
+        {"$set": {"is_read": True}},
+        projection={"is_read": 1},
+        return_document=ReturnDocument.BEFORE
+    )
     
-    if not notification:
+    if not previous:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    # Mark as read
-    await notifications_collection.update_one(
-        {"_id": ObjectId(notification_id)},
-        {"$set": {"is_read": True}}
-    )
+    # Only a notification that was unread lowers the badge
+    if not previous.get("is_read"):
+        await decrement_unread(current_user["id"])
     
     return {"status": "success"}
 
@@ -92,6 +148,8 @@ async def mark_all_read(
         {"user_id": current_user["id"], "is_read": False},
         {"$set": {"is_read": True}}
     )
+    # Only lower the badge by what this call changed, notifications inserted meanwhile stay unread
+    await decrement_unread(current_user["id"], result.modified_count)
     
     return {"status": "success", "updated_count": result.modified_count}
 
@@ -100,32 +158,12 @@ async def get_notification_settings(
     current_user = Depends(get_current_user)
 ):
     """Get user's notification settings"""
-    settings = await notification_settings_collection.find_one({
-        "user_id": current_user["id"]
-    })
-    
-    if not settings:
-        # Create default settings if none exist
-        settings = {
-            "user_id": current_user["id"],
-            "meal_reminders": True,
-            "weekly_report": True,
-            "nutrition_tips": True,
-            "progress_updates": True,
-            "marketing": False,
-            "reminder_times": {
-                "breakfast": "08:00",
-                "lunch": "12:00",
-                "dinner": "18:00"
-            },
-            "created_at": datetime.utcnow()
-        }
-        result = await notification_settings_collection.insert_one(settings)
-        settings["id"] = str(result.inserted_id)
-    else:
-        settings["id"] = str(settings["_id"])
-    
-    return settings
+    # Read the settings, creating the defaults on first access
+    return await upsert_document(
+        notification_settings_collection,
+        {"user_id": current_user["id"]},
+        defaults=_default_notification_settings()
+    )
 
 @router.put("/settings", response_model=NotificationSettingsResponse)
 async def update_notification_settings(
@@ -133,47 +171,16 @@ async def update_notification_settings(
     current_user = Depends(get_current_user)
 ):
     """Update user's notification settings"""
-    # Get current settings
-    current_settings = await notification_settings_collection.find_one({
-        "user_id": current_user["id"]
-    })
-    
     # Only update fields that are provided
     update_data = {k: v for k, v in settings_update.dict(exclude_unset=True).items() if v is not None}
     
-    if current_settings:
-        # Update existing settings
-        await notification_settings_collection.update_one(
-            {"user_id": current_user["id"]},
-            {"$set": {**update_data, "updated_at": datetime.utcnow()}}
-        )
-    else:
-        # Create new settings with defaults + updates
-        default_settings = {
-            "user_id": current_user["id"],
-            "meal_reminders": True,
-            "weekly_report": True,
-            "nutrition_tips": True,
-            "progress_updates": True,
-            "marketing": False,
-            "reminder_times": {
-                "breakfast": "08:00",
-                "lunch": "12:00",
-                "dinner": "18:00"
-            },
-            "created_at": datetime.utcnow()
-        }
-        await notification_settings_collection.insert_one({**default_settings, **update_data})
-    
-    # Get updated settings
-    updated_settings = await notification_settings_collection.find_one({
-        "user_id": current_user["id"]
-    })
-    
-    if updated_settings:
-        updated_settings["id"] = str(updated_settings["_id"])
-    
-    return updated_settings
+    # Update or create the settings and read them back in one step
+    return await upsert_document(
+        notification_settings_collection,
+        {"user_id": current_user["id"]},
+        update_data,
+        defaults=_default_notification_settings()
+    )
 
 @router.delete("/{notification_id}")
 async def delete_notification(
@@ -181,20 +188,47 @@ async def delete_notification(
     current_user = Depends(get_current_user)
 ):
     """Delete a notification"""
-    # Check if notification exists and belongs to the user
-    notification = await notifications_collection.find_one({
-        "_id": ObjectId(notification_id),
-        "user_id": current_user["id"]
-    })
+    # Delete in one step, matching only the user's own notification
+    notification = await notifications_collection.find_one_and_delete(
+        {"_id": _parse_notification_id(notification_id), "user_id": current_user["id"]},
+        projection={"is_read": 1}
+    )
     
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    # Delete the notification
-    await notifications_collection.delete_one({"_id": ObjectId(notification_id)})
+    if not notification.get("is_read"):
+        await decrement_unread(current_user["id"])
     
     return {"status": "success", "deleted_id": notification_id}
 
+@router.post("/batch")
+async def batch_update_notifications(
+    batch: NotificationBatchRequest,
+    current_user = Depends(get_current_user)
+):
+    """Mark as read or delete several notifications in one request"""
+    user_id = current_user["id"]
+    ids = [_parse_notification_id(notification_id) for notification_id in batch.ids]
+    
+    # Marking read first tells which of the targeted notifications were unread
+    operations = [
+        UpdateOne({"_id": _id, "user_id": user_id, "is_read": False}, {"$set": {"is_read": True}})
+        for _id in ids
+    ]
+    if batch.action == "delete":
+        operations.extend(DeleteOne({"_id": _id, "user_id": user_id}) for _id in ids)
+    
+    result = await notifications_collection.bulk_write(operations, ordered=True)
+    
+    # Keep the unread badge in step
+    if result.modified_count:
+        await decrement_unread(user_id, result.modified_count)
+    
+    if batch.action == "delete":
+        return {"status": "success", "deleted_count": result.deleted_count}
+    return {"status": "success", "updated_count": result.modified_count}
+
 # New notification creation endpoints for app features
 @router.post("/create")
 async def create_notification(
@@ -215,12 +249,13 @@ async def create_notification(
         "created_at": datetime.utcnow()
     }
     
-    result = await notifications_collection.insert_one(notification)
+    notification_id = await insert_notification(notification)
+    notification.pop("_id", None)
     
     return {
         "status": "success",
-        "id": str(result.inserted_id),
-        "notification": {**notification, "id": str(result.inserted_id)}
+        "id": notification_id,
+        "notification": {**notification, "id": notification_id}
     }
 
 @router.post("/meal-reminder")
@@ -237,19 +272,9 @@ async def create_meal_reminder(
     
     if not settings or settings.get("meal_reminders", True):
         # Create reminder notification
-        notification = {
-            "user_id": current_user["id"],
-            "title": f"Time for {meal_type}!",
-            "message": f"Don't forget to log your {meal_type} for today.",
-            "type": "meal_reminder",
-            "is_read": False,
-            "data": {"meal_type": meal_type},
-            "created_at": datetime.utcnow()
-        }
+        notification = build_meal_reminder(current_user["id"], meal_type)
         
-        background_tasks.add_task(
-            notifications_collection.insert_one, notification
-        )
+        background_tasks.add_task(insert_notification, notification)
         
         return {"status": "success", "message": f"{meal_type.capitalize()} reminder scheduled"}
     else:
@@ -5,10 +5,12 @@ from typing import List
 from src.config.database import profiles_collection
 from src.services.authentication.user_auth import get_current_user
 from src.services.user.profile_manager import get_bmi_category
+from src.services.user.profile_onboarding import apply_profile_changes
 from src.schemas.user.profile_schema import (
     ProfileNutritionCreate, 
     ProfileNutritionUpdate, 
     ProfileNutritionResponse,
+    ProfileOnboardingUpdate,
     Gender, 
     ActivityLevel,
     WeightGoal, 
@@ -432,6 +434,23 @@ async def update_profile(
     
     return updated_profile
 
+@router.patch("", response_model=dict)
+async def patch_profile(
+    profile_update: ProfileOnboardingUpdate,
+    current_user = Depends(get_current_user)
+):
+    """
+    Set any subset of onboarding fields in one request
+    
+    Replaces the step endpoints: all fields are written in one atomic update,
+    age and BMI are recomputed, and the nutrition target is returned once the
+    profile has everything it needs. Pass complete=true to finalize the profile.
+    """
+    changes = {k: v for k, v in profile_update.dict(exclude_unset=True).items() if v is not None}
+    complete = changes.pop("complete", False)
+    
+    return await apply_profile_changes(current_user["id"], changes, complete=complete)
+
 @router.get("", response_model=ProfileNutritionResponse)
 async def get_profile(
     current_user = Depends(get_current_user)
@@ -127,6 +127,20 @@ class FoodResponse(FoodBase):
     class Config:
         orm_mode = True
 
+class FoodSummaryResponse(BaseModel):
+    """Schema for foods in list responses - full details come from the food endpoint"""
+    id: str
+    name: str
+    meal_type: Optional[str] = None
+    eating_time: Optional[datetime] = None
+    total_calories: float = 0
+    total_protein: float = 0
+    total_fat: float = 0
+    total_carb: float = 0
+    total_fiber: float = 0
+    thumbnail_url: Optional[str] = None
+    ingredients: Optional[List[Dict]] = None
+
 # Dish Schemas
 class DishBase(BaseModel):
     """Base schema for dishes"""
@@ -3,6 +3,7 @@ from .notification_schema import (
     NotificationCreate,
     NotificationUpdate,
     NotificationResponse,
+    NotificationBatchRequest,
     ReminderTimes,
     NotificationSettingsBase,
     NotificationSettingsCreate,
@@ -15,6 +16,7 @@ __all__ = [
     "NotificationCreate",
     "NotificationUpdate",
     "NotificationResponse",
+    "NotificationBatchRequest",
     "ReminderTimes",
     "NotificationSettingsBase",
     "NotificationSettingsCreate",
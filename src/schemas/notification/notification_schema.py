@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Literal
 from datetime import datetime
 from src.config.database import PyObjectId
 from bson import ObjectId
@@ -36,6 +36,11 @@ class NotificationResponse(NotificationBase, MongoBaseModel):
     user_id: str
     created_at: Optional[datetime] = None
     
+class NotificationBatchRequest(BaseModel):
+    """Schema for marking or deleting several notifications at once"""
+    ids: List[str] = Field(..., min_items=1, max_items=100)
+    action: Literal["read", "delete"]
+
 class ReminderTimes(BaseModel):
     """Schema for reminder times"""
     breakfast: str = "08:00"  # HH:MM format
@@ -94,6 +94,22 @@ class ProfileNutritionUpdate(BaseModel):
     diet_type: Optional[DietType] = None
     additional_goals: Optional[List[AdditionalGoal]] = None
 
+class ProfileOnboardingUpdate(ProfileNutritionUpdate):
+    """Schema for setting any subset of onboarding steps in one request"""
+    complete: bool = False  # Also finalize the profile, like the /complete step
+
+    @validator('height', 'weight', 'desired_weight')
+    def measurements_must_be_positive(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('Height and weights must be positive')
+        return v
+
+    @validator('goal_duration_weeks')
+    def duration_must_be_positive(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError('Goal duration must be positive')
+        return v
+
 class ProfileNutritionResponse(BaseModel):
     """Schema for profile response - used when returning profile data"""
     id: str
@@ -99,7 +99,8 @@ async def blacklist_token(token: str) -> bool:
     try:
         # Decode token to get expiration
         payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
-        expires_at = datetime.fromtimestamp(payload["exp"])
+        # Stored in UTC like every other date, the TTL index compares against UTC
+        expires_at = datetime.utcfromtimestamp(payload["exp"])
         
         # Add to blacklist
         await safe_db_operation(
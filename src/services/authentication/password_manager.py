@@ -10,6 +10,7 @@ from fastapi import HTTPException
 from src.config.constants import ERROR_MESSAGES
 from src.utils.validation import validate_password_strength, validate_email
 from src.utils.rate_limiter import rate_limiter
+from src.utils.tracing import traced
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -54,6 +55,7 @@ def validate_password_strength(password: str) -> tuple[bool, str]:
     
     return True, ""
 
+@traced("password.verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash
@@ -67,6 +69,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+@traced("password.hash")
 def get_password_hash(password: str) -> str:
     """
     Hash a password
@@ -5,8 +5,9 @@ from pydantic import ValidationError
 from datetime import datetime
 from typing import Optional
 from bson import ObjectId
+import structlog
 
-from src.config.database import users_collection
+from src.config.database import users_collection, USER_SESSION_PROJECTION
 from src.schemas.user.user_schema import UserCreate
 from src.services.authentication.password_manager import get_password_hash
 from config import config
@@ -25,7 +26,7 @@ async def create_user(user_data: UserCreate):
         dict: Created user
     """
     # Check if user already exists
-    existing_user = await users_collection.find_one({"email": user_data.email})
+    existing_user = await users_collection.find_one({"email": user_data.email}, {"_id": 1})
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -38,12 +39,9 @@ async def create_user(user_data: UserCreate):
     result = await users_collection.insert_one(user_dict)
     
     # Return created user without password
-    created_user = await users_collection.find_one({"_id": result.inserted_id})
+    created_user = await users_collection.find_one({"_id": result.inserted_id}, USER_SESSION_PROJECTION)
     created_user["id"] = str(created_user["_id"])
     
-    # Remove sensitive fields
-    created_user.pop("password", None)
-    
     return created_user
 
 async def get_user_token_preference(user_id: str) -> str:
@@ -57,7 +55,7 @@ async def get_user_token_preference(user_id: str) -> str:
         str: Token preference ('short', 'default', 'extended', 'long')
     """
     # Check if user has a preference stored
-    user = await users_collection.find_one({"_id": ObjectId(user_id)})
+    user = await users_collection.find_one({"_id": ObjectId(user_id)}, {"token_preference": 1})
     if user and "token_preference" in user:
         return user["token_preference"]
     
@@ -108,11 +106,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    user = await users_collection.find_one({"email": email})
+    user = await users_collection.find_one({"email": email}, USER_SESSION_PROJECTION)
     if user is None:
         raise credentials_exception
     
     # Convert ObjectId to string
     user["id"] = str(user["_id"])
     
+    # Tag the rest of the request's log lines with the user
+    structlog.contextvars.bind_contextvars(user_id=user["id"])
+    
     return user
\ No newline at end of file
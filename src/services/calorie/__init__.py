@@ -1,31 +1,67 @@
 from src.services.calorie.calorie_service import (
     calculate_dish_calories,
     create_nutrition_comparison,
+    analyze_comparison,
     calculate_nutrition_score,
     generate_strengths,
     generate_weaknesses,
     generate_nutrient_comment,
     update_daily_report,
+    store_daily_report,
+    get_daily_report,
+    calculate_total_nutrition,
     generate_weekly_report,
     get_weekly_statistics,
+    iter_daily_nutrition,
+    get_nutrition_history,
+    validate_history_range,
     get_bmi_category,
     calculate_meal_calories,
     evaluate_meal_nutrition,
     get_meal_type_standard
 )
+from src.services.calorie.nutrition_rules import (
+    DEFAULT_LOCALE,
+    resolve_locale,
+    comment_daily_share,
+    comment_daily_shares
+)
+from src.services.calorie.ingredient_usage import (
+    record_food_usage,
+    remove_food_usage,
+    rebuild_ingredient_usage,
+    ensure_ingredient_usage,
+    get_food_diversity
+)
 
 __all__ = [
     "calculate_dish_calories",
     "create_nutrition_comparison",
+    "analyze_comparison",
     "calculate_nutrition_score",
     "generate_strengths",
     "generate_weaknesses",
     "generate_nutrient_comment",
     "update_daily_report",
+    "store_daily_report",
+    "get_daily_report",
+    "calculate_total_nutrition",
     "generate_weekly_report",
     "get_weekly_statistics",
+    "iter_daily_nutrition",
+    "get_nutrition_history",
+    "validate_history_range",
     "get_bmi_category",
     "calculate_meal_calories",
     "evaluate_meal_nutrition",
-    "get_meal_type_standard"
+    "get_meal_type_standard",
+    "DEFAULT_LOCALE",
+    "resolve_locale",
+    "comment_daily_share",
+    "comment_daily_shares",
+    "record_food_usage",
+    "remove_food_usage",
+    "rebuild_ingredient_usage",
+    "ensure_ingredient_usage",
+    "get_food_diversity"
 ]
\ No newline at end of file
@@ -1,6 +1,9 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from datetime import datetime, date, timedelta
+from collections import deque
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from fastapi import HTTPException
 from functools import lru_cache
 
@@ -10,18 +13,37 @@ from src.config.database import (
     nutrition_reviews_collection,
     advises_collection,
     nutrition_targets_collection,
-    profiles_collection
+    profiles_collection,
+    daily_reports_collection,
+    FOOD_TOTALS_PROJECTION,
+    TARGET_VALUES_PROJECTION,
+    TARGET_VERSION_PROJECTION,
+    PROFILE_BODY_PROJECTION
 )
 from src.services.food.food_detector import detect_food_from_image
+from src.services.calorie.ingredient_usage import get_food_diversity, ensure_ingredient_usage
 from src.config.constants import (
     CALORIE_DISTRIBUTION,
     MAX_CALORIES,
     MACRO_RATIOS,
     CACHE_SIZE,
-    ERROR_MESSAGES
+    ERROR_MESSAGES,
+    HISTORY_MAX_DAYS,
+    HISTORY_MOVING_AVERAGE_DAYS
 )
 from src.utils.validation import validate_nutrition_values, validate_date_format
 from src.utils.db_utils import safe_db_operation
+from src.services.calorie.nutrition_rules import (
+    DEFAULT_LOCALE,
+    MACRO_RATIO_RULE,
+    FIBER_RULE,
+    MEAL_CALORIE_RULE,
+    CALORIE_LIMIT_RULE,
+    evaluation_text,
+    nutrient_name,
+    comment_daily_share,
+    comment_daily_shares
+)
 
 async def calculate_dish_calories(food_id: str, user_id: str) -> Dict:
     """
@@ -74,24 +96,42 @@ async def calculate_dish_calories(food_id: str, user_id: str) -> Dict:
 
 async def create_nutrition_comparison(food_id: str, user_id: str) -> Dict:
     """
-    Create a comparison between food and user's nutrition target
+    Get the analyzed comparison between a food and the user's nutrition target
+    
+    Comparisons are stored once per food and target version: repeated calls
+    return the stored document, a changed food or target creates a new one
+    and drops the outdated versions.
     
     Args:
         food_id: The ID of the food
         user_id: The ID of the user
         
     Returns:
-        The created comparison
+        The comparison with its score, strengths and weaknesses
     """
-    # Get food and target data
-    food = await foods_collection.find_one({"_id": ObjectId(food_id)})
+    # Get food and target data, another user's food answers like a missing one
+    food = await foods_collection.find_one({"_id": ObjectId(food_id), "user_id": user_id}, FOOD_TOTALS_PROJECTION)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
     
-    target = await nutrition_targets_collection.find_one({"user_id": user_id})
+    target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VALUES_PROJECTION)
     if not target:
         raise HTTPException(status_code=404, detail="Nutrition target not found")
     
+    # Identify the comparison by the versions of its inputs
+    version_key = {
+        "food_id": food_id,
+        "user_id": user_id,
+        "food_updated_at": food.get("updated_at"),
+        "target_updated_at": target.get("updated_at")
+    }
+    
+    # The stored comparison is still current, skip the analysis
+    existing = await nutrition_comparisons_collection.find_one(version_key)
+    if existing:
+        existing["id"] = str(existing["_id"])
+        return existing
+    
     # Calculate differences
     diff_calories = round((food.get("total_calories", 0) / target.get("calories", 1)) * 100)
     diff_protein = round((food.get("total_protein", 0) / target.get("protein", 1)) * 100)
@@ -101,9 +141,8 @@ async def create_nutrition_comparison(food_id: str, user_id: str) -> Dict:
     
     # Create comparison document
     comparison = {
-        "food_id": food_id,
+        "_id": ObjectId(),
         "target_id": str(target["_id"]),
-        "user_id": user_id,
         "food_name": food.get("name", "Unknown Food"),
         "food_calories": food.get("total_calories", 0),
         "food_protein": food.get("total_protein", 0),
@@ -123,14 +162,53 @@ async def create_nutrition_comparison(food_id: str, user_id: str) -> Dict:
         "created_at": datetime.utcnow()
     }
     
-    # Insert into database
-    result = await nutrition_comparisons_collection.insert_one(comparison)
-    created_comparison = await nutrition_comparisons_collection.find_one({"_id": result.inserted_id})
+    # Store the analysis with the comparison
+    comparison.update(await analyze_comparison(comparison))
+    
+    # Insert only if no concurrent request stored this version meanwhile
+    try:
+        existing = await nutrition_comparisons_collection.find_one_and_update(
+            version_key,
+            {"$setOnInsert": comparison},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        # A concurrent request stored the same version first
+        existing = await nutrition_comparisons_collection.find_one(version_key)
+    
+    if existing:
+        comparison = existing
+    else:
+        comparison.update(version_key)
+        
+        # Outdated versions will never be served again
+        await nutrition_comparisons_collection.delete_many({
+            "food_id": food_id,
+            "user_id": user_id,
+            "_id": {"$ne": comparison["_id"]}
+        })
     
     # Add id field for response
-    created_comparison["id"] = str(created_comparison["_id"])
+    comparison["id"] = str(comparison["_id"])
     
-    return created_comparison
+    return comparison
+
+async def analyze_comparison(comparison: Dict) -> Dict[str, Any]:
+    """
+    Score a comparison and list its strengths and weaknesses
+    
+    Args:
+        comparison: The nutrition comparison
+        
+    Returns:
+        Dict with nutrition_score, strengths and weaknesses
+    """
+    return {
+        "nutrition_score": await calculate_nutrition_score(comparison),
+        "strengths": await generate_strengths(comparison),
+        "weaknesses": await generate_weaknesses(comparison)
+    }
 
 async def calculate_nutrition_score(comparison: Dict) -> int:
     """
@@ -278,7 +356,7 @@ async def update_daily_report(user_id: str, report_date: Optional[date] = None)
         foods = await foods_collection.find({
             "user_id": user_id,
             "eating_time": {"$gte": day_start, "$lte": day_end}
-        }).to_list(length=100)
+        }, FOOD_TOTALS_PROJECTION).to_list(length=100)
         
         # Calculate totals
         total_calories = sum(food.get("total_calories", 0) for food in foods)
@@ -288,7 +366,7 @@ async def update_daily_report(user_id: str, report_date: Optional[date] = None)
         total_fiber = sum(food.get("total_fiber", 0) for food in foods)
         
         # Get target
-        target = await nutrition_targets_collection.find_one({"user_id": user_id})
+        target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VALUES_PROJECTION)
         
         # Calculate percentages
         calories_percent = 0
@@ -353,6 +431,95 @@ async def update_daily_report(user_id: str, report_date: Optional[date] = None)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating daily report: {str(e)}")
 
+async def generate_nutrient_comment(
+    comparison: Dict,
+    diff_key: str,
+    nutrient: str,
+    locale: str = DEFAULT_LOCALE
+) -> str:
+    """
+    Comment on one nutrient of a comparison
+    
+    Args:
+        comparison: The nutrition comparison
+        diff_key: Field holding the percent of the daily target, e.g. "diff_protein"
+        nutrient: Nutrient name, e.g. "protein" or "carbohydrate"
+        locale: Language of the comment
+        
+    Returns:
+        Comment text
+    """
+    return comment_daily_share(nutrient, comparison.get(diff_key, 0), locale)
+
+async def store_daily_report(user_id: str, report_date: date) -> Dict:
+    """
+    Compute a daily report and store it for later reads
+    
+    Args:
+        user_id: The ID of the user
+        report_date: The date for the report
+        
+    Returns:
+        The daily report
+    """
+    # Read the target version first, a target changed mid-way makes the copy stale
+    target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VERSION_PROJECTION) or {}
+    report = await update_daily_report(user_id, report_date)
+    
+    await daily_reports_collection.replace_one(
+        {"user_id": user_id, "date": report["date"]},
+        {**report, "target_updated_at": target.get("updated_at"), "computed_at": datetime.utcnow()},
+        upsert=True
+    )
+    return report
+
+async def get_daily_report(user_id: str, report_date: Optional[date] = None) -> Dict:
+    """
+    Get a daily report, serving the stored copy while it is current
+    
+    Food writes drop the stored copy and queue a rebuild; a target change is
+    detected by comparing its version.
+    
+    Args:
+        user_id: The ID of the user
+        report_date: The date for the report (default: today)
+        
+    Returns:
+        The daily report
+    """
+    if not report_date:
+        report_date = datetime.now().date()
+    
+    target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VERSION_PROJECTION) or {}
+    stored = await daily_reports_collection.find_one(
+        {"user_id": user_id, "date": report_date.isoformat()},
+        {"_id": 0, "computed_at": 0}
+    )
+    if stored and stored.pop("target_updated_at", None) == target.get("updated_at"):
+        return stored
+    
+    return await store_daily_report(user_id, report_date)
+
+async def calculate_total_nutrition(user_id: str, date_str: Optional[str] = None) -> Dict:
+    """
+    Calculate total nutrition for a date
+    
+    Args:
+        user_id: The ID of the user
+        date_str: Date string in YYYY-MM-DD format (default: today)
+        
+    Returns:
+        The daily report with totals and percentages of the target
+    """
+    report_date = None
+    if date_str:
+        is_valid, error_msg = validate_date_format(date_str)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_msg)
+        report_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    
+    return await get_daily_report(user_id, report_date)
+
 async def generate_weekly_report(user_id: str, week_start_date: date) -> Dict:
     """
     Generate a weekly nutrition report
@@ -383,7 +550,7 @@ async def generate_weekly_report(user_id: str, week_start_date: date) -> Dict:
     }
     
     # Get target
-    target = await nutrition_targets_collection.find_one({"user_id": user_id})
+    target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VALUES_PROJECTION)
     if not target:
         raise HTTPException(status_code=404, detail="Nutrition target not found")
     
@@ -425,7 +592,8 @@ async def generate_weekly_report(user_id: str, week_start_date: date) -> Dict:
 
 async def get_weekly_statistics(
     user_id: str, 
-    week_start_date: Optional[date] = None
+    week_start_date: Optional[date] = None,
+    locale: str = DEFAULT_LOCALE
 ) -> Dict:
     """
     Get comprehensive weekly statistics for visualization
@@ -433,6 +601,7 @@ async def get_weekly_statistics(
     Args:
         user_id: The ID of the user
         week_start_date: Start date of the week (default: current week)
+        locale: Language of the nutrient reviews
         
     Returns:
         Weekly statistics
@@ -447,12 +616,12 @@ async def get_weekly_statistics(
         end_date = week_start_date + timedelta(days=6)
         
         # Get user profile for BMI calculation
-        profile = await profiles_collection.find_one({"user_id": user_id})
+        profile = await profiles_collection.find_one({"user_id": user_id}, PROFILE_BODY_PROJECTION)
         if not profile:
             raise HTTPException(status_code=404, detail="User profile not found")
         
         # Get nutrition target
-        target = await nutrition_targets_collection.find_one({"user_id": user_id})
+        target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VALUES_PROJECTION)
         if not target:
             raise HTTPException(status_code=404, detail="Nutrition target not found")
         
@@ -465,11 +634,6 @@ async def get_weekly_statistics(
         daily_carb = []
         daily_fiber = []
         
-        # Initialize ingredient counter for food diversity
-        from collections import Counter
-        ingredient_counter = Counter()
-        ingredient_details = {}
-        
         # Generate dates for the week
         current_date = week_start_date
         while current_date <= end_date:
@@ -489,7 +653,7 @@ async def get_weekly_statistics(
             }
             
             # Get all meals for the day
-            day_foods = await foods_collection.find(day_query).to_list(length=100)
+            day_foods = await foods_collection.find(day_query, FOOD_TOTALS_PROJECTION).to_list(length=100)
             
             # Calculate daily totals
             day_total_calories = 0
@@ -510,23 +674,6 @@ async def get_weekly_statistics(
                 # Add nutrition score if available
                 if "nutrition_score" in food:
                     day_scores.append(food["nutrition_score"])
-                
-                # Process ingredients for food diversity
-                if "ingredients" in food:
-                    for ingredient in food["ingredients"]:
-                        ingredient_name = ingredient.get("name", "Unknown")
-                        ingredient_counter[ingredient_name] += 1
-                        
-                        # Store ingredient details for later use
-                        ingredient_id = str(ingredient.get("_id", ""))
-                        if ingredient_id and ingredient_id not in ingredient_details:
-                            ingredient_details[ingredient_id] = {
-                                "name": ingredient_name,
-                                "protein": ingredient.get("protein", 0),
-                                "fat": ingredient.get("fat", 0),
-                                "carb": ingredient.get("carb", 0),
-                                "fiber": ingredient.get("fiber", 0)
-                            }
             
             # Calculate average score for the day
             day_avg_score = sum(day_scores) / len(day_scores) if day_scores else 0
@@ -552,15 +699,11 @@ async def get_weekly_statistics(
         weight = profile.get("weight", 70)
         bmi = round(weight / (height_m * height_m), 1)
         
-        # Get food diversity information
-        most_common_ingredients = ingredient_counter.most_common(50)  # Get top 50 ingredients
-        
-        food_diversity = []
-        for ingredient_name, count in most_common_ingredients:
-            food_diversity.append({
-                "name": ingredient_name,
-                "count": count,
-            })
+        # Get food diversity information from the weekly ingredient rollup
+        if week_start_date.weekday() == 0:
+            # Weeks logged before the rollup existed are rebuilt once from foods
+            await ensure_ingredient_usage(user_id, week_start_date)
+        food_diversity = await get_food_diversity(user_id, week_start_date)
         
         # Calculate deviations from target
         calories_deviation = round(((weekly_avg_calories / target.get("calories", 1)) - 1) * 100) if target.get("calories") else 0
@@ -580,7 +723,7 @@ async def get_weekly_statistics(
         }
         
         # Đánh giá dinh dưỡng của tuần
-        weekly_evaluation = await evaluate_meal_nutrition(weekly_meal_data, user_id)
+        weekly_evaluation = await evaluate_meal_nutrition(weekly_meal_data, user_id, locale)
         macro_reviews = {
             "calories": weekly_evaluation.get("calorie_comment", ""),
             "protein": weekly_evaluation.get("macro_evaluations", {}).get("protein", {}).get("comment", ""),
@@ -644,14 +787,173 @@ async def get_weekly_statistics(
             },
             
             # Food diversity data
-            "food_diversity": {
-                "total_count": len(ingredient_counter),
-                "ingredients": food_diversity
-            }
+            "food_diversity": food_diversity
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating weekly statistics: {str(e)}")
 
+HISTORY_NUTRIENTS = ["calories", "protein", "fat", "carb", "fiber"]
+
+def validate_history_range(start_date: date, end_date: date) -> None:
+    """
+    Validate a nutrition history date range
+    
+    Args:
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+        
+    Raises:
+        HTTPException: If the range is inverted or too long
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    if (end_date - start_date).days + 1 > HISTORY_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {HISTORY_MAX_DAYS} days"
+        )
+
+async def iter_daily_nutrition(
+    user_id: str,
+    start_date: date,
+    end_date: date,
+    window: int = HISTORY_MOVING_AVERAGE_DAYS
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream per-day nutrition totals for a date range
+    
+    Totals are grouped by day inside MongoDB so only one small row per day
+    crosses the wire. Days without meals are yielded with zero totals so the
+    client can plot a continuous series.
+    
+    Args:
+        user_id: The ID of the user
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+        window: Number of days used for the trailing moving averages
+        
+    Yields:
+        Daily totals, average nutrition score and moving averages
+    """
+    range_start = datetime.combine(start_date, datetime.min.time())
+    range_end = datetime.combine(end_date, datetime.max.time())
+    
+    # Group foods by day on the server
+    pipeline = [
+        {"$match": {
+            "user_id": user_id,
+            "eating_time": {"$gte": range_start, "$lte": range_end}
+        }},
+        {"$group": {
+            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$eating_time"}},
+            "calories": {"$sum": {"$ifNull": ["$total_calories", 0]}},
+            "protein": {"$sum": {"$ifNull": ["$total_protein", 0]}},
+            "fat": {"$sum": {"$ifNull": ["$total_fat", 0]}},
+            "carb": {"$sum": {"$ifNull": ["$total_carb", 0]}},
+            "fiber": {"$sum": {"$ifNull": ["$total_fiber", 0]}},
+            "score": {"$avg": "$nutrition_score"},
+            "meal_count": {"$sum": 1}
+        }}
+    ]
+    
+    days = {}
+    async for row in foods_collection.aggregate(pipeline):
+        days[row["_id"]] = row
+    
+    # Trailing windows for the moving averages
+    windows = {nutrient: deque(maxlen=window) for nutrient in HISTORY_NUTRIENTS + ["score"]}
+    
+    current_date = start_date
+    while current_date <= end_date:
+        day_key = current_date.strftime("%Y-%m-%d")
+        row = days.get(day_key, {})
+        
+        day = {
+            "date": day_key,
+            "meal_count": row.get("meal_count", 0),
+            "score": round(row.get("score") or 0)
+        }
+        for nutrient in HISTORY_NUTRIENTS:
+            day[nutrient] = round(row.get(nutrient, 0), 1)
+        
+        moving_average = {}
+        for nutrient, values in windows.items():
+            values.append(day[nutrient])
+            moving_average[nutrient] = round(sum(values) / len(values), 1)
+        day["moving_average"] = moving_average
+        
+        yield day
+        current_date += timedelta(days=1)
+
+async def get_nutrition_history(
+    user_id: str,
+    start_date: date,
+    end_date: date,
+    window: int = HISTORY_MOVING_AVERAGE_DAYS
+) -> Dict:
+    """
+    Get nutrition history for an arbitrary date range
+    
+    Args:
+        user_id: The ID of the user
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+        window: Number of days used for the trailing moving averages
+        
+    Returns:
+        Per-day and per-week totals, score trend and moving averages
+    """
+    validate_history_range(start_date, end_date)
+    
+    try:
+        daily = []
+        weekly = {}
+        
+        async for day in iter_daily_nutrition(user_id, start_date, end_date, window):
+            daily.append(day)
+            
+            # Bucket days into weeks starting on Monday
+            day_date = datetime.strptime(day["date"], "%Y-%m-%d").date()
+            week_start = (day_date - timedelta(days=day_date.weekday())).isoformat()
+            week = weekly.setdefault(week_start, {
+                "week_start_date": week_start,
+                "days": 0,
+                "meal_count": 0,
+                "scores": [],
+                **{nutrient: 0 for nutrient in HISTORY_NUTRIENTS}
+            })
+            week["days"] += 1
+            week["meal_count"] += day["meal_count"]
+            if day["meal_count"]:
+                week["scores"].append(day["score"])
+            for nutrient in HISTORY_NUTRIENTS:
+                week[nutrient] += day[nutrient]
+        
+        weeks = []
+        for week in weekly.values():
+            scores = week.pop("scores")
+            week["score"] = round(sum(scores) / len(scores)) if scores else 0
+            week["averages"] = {
+                nutrient: round(week[nutrient] / week["days"], 1)
+                for nutrient in HISTORY_NUTRIENTS
+            }
+            for nutrient in HISTORY_NUTRIENTS:
+                week[nutrient] = round(week[nutrient], 1)
+            weeks.append(week)
+        
+        return {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "moving_average_days": window,
+            "daily": daily,
+            "weekly": weeks,
+            "score_trend": [week["score"] for week in weeks]
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating nutrition history: {str(e)}")
+
 async def get_bmi_category(bmi: float) -> str:
     """
     Return the BMI category for a given BMI value
@@ -736,7 +1038,7 @@ async def calculate_meal_calories(user_id: str, date_str: str, meal_type: str) -
         
         # Get meals
         meals = await safe_db_operation(
-            foods_collection.find(query).to_list(length=100)
+            foods_collection.find(query, FOOD_TOTALS_PROJECTION).to_list(length=100)
         )
         
         # Calculate totals
@@ -778,13 +1080,18 @@ async def calculate_meal_calories(user_id: str, date_str: str, meal_type: str) -
             detail=ERROR_MESSAGES["db_operation_failed"].format(error=str(e))
         )
 
-async def evaluate_meal_nutrition(meal_data: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+async def evaluate_meal_nutrition(
+    meal_data: Dict[str, Any],
+    user_id: str,
+    locale: str = DEFAULT_LOCALE
+) -> Dict[str, Any]:
     """
     Đánh giá dinh dưỡng của bữa ăn dựa trên loại bữa ăn và tỷ lệ macro
     
     Args:
         meal_data: Dữ liệu bữa ăn
         user_id: ID của người dùng
+        locale: Ngôn ngữ của nhận xét
         
     Returns:
         Đánh giá dinh dưỡng của bữa ăn
@@ -793,7 +1100,7 @@ async def evaluate_meal_nutrition(meal_data: Dict[str, Any], user_id: str) -> Di
         meal_type = meal_data.get("meal_type", "lunch")
         
         # Lấy mục tiêu dinh dưỡng của người dùng
-        target = await nutrition_targets_collection.find_one({"user_id": user_id})
+        target = await nutrition_targets_collection.find_one({"user_id": user_id}, TARGET_VALUES_PROJECTION)
         if not target:
             raise HTTPException(status_code=404, detail="Không tìm thấy mục tiêu dinh dưỡng")
             
@@ -853,194 +1160,75 @@ async def evaluate_meal_nutrition(meal_data: Dict[str, Any], user_id: str) -> Di
         
         # Đánh giá calo
         calorie_ratio = actual_calories / target_meal_calories if target_meal_calories > 0 else 1
-        calorie_evaluation = ""
+        limit = None
         
         if meal_standard.get("calories_percentage"):  # Chỉ đánh giá calo cho các bữa chính
-            if calorie_ratio < 0.8:
-                calorie_evaluation = "Thấp hơn mục tiêu"
-                score -= 15
-            elif calorie_ratio > 1.2:
-                calorie_evaluation = "Cao hơn mục tiêu"
-                score -= 15
-            else:
-                calorie_evaluation = "Phù hợp với mục tiêu"
-        else:  # Đánh giá calo cho bữa phụ
-            if "max_calories" in meal_standard and actual_calories > meal_standard["max_calories"]:
-                calorie_evaluation = f"Vượt quá giới hạn ({meal_standard['max_calories']} kcal)"
-                score -= 15
-            elif meal_type == "drinks" and "max_calories_per_100ml" in meal_standard:
-                volume_ml = meal_data.get("volume_ml", 100)
-                max_cals = meal_standard["max_calories_per_100ml"] * (volume_ml / 100)
-                if actual_calories > max_cals:
-                    calorie_evaluation = f"Vượt quá giới hạn cho đồ uống ({meal_standard['max_calories_per_100ml']} kcal/100ml)"
-                    score -= 15
-                else:
-                    calorie_evaluation = "Phù hợp với giới hạn calo"
-            else:
-                calorie_evaluation = "Phù hợp với giới hạn calo"
+            calorie_band = MEAL_CALORIE_RULE.lookup(calorie_ratio)
+        elif "max_calories" in meal_standard:  # Đánh giá calo cho bữa phụ
+            limit = meal_standard["max_calories"]
+            calorie_band = CALORIE_LIMIT_RULE.lookup(actual_calories / limit if limit else 0)
+        elif meal_type == "drinks" and "max_calories_per_100ml" in meal_standard:
+            limit = meal_standard["max_calories_per_100ml"]
+            calorie_band = CALORIE_LIMIT_RULE.lookup(calorie_ratio)
+        else:
+            calorie_band = CALORIE_LIMIT_RULE.lookup(0)
+        
+        level = calorie_band.level
+        if level == "over_limit" and meal_type == "drinks":
+            level = "drink_over_limit"
+        calorie_evaluation = evaluation_text(level, locale, limit=limit)
+        score -= calorie_band.penalty
+        
+        # Nhận xét theo tỷ lệ so với mục tiêu ngày, tra bảng một lần cho mọi chất
+        comments = comment_daily_shares([{
+            "carbs": carb_percentage,
+            "protein": protein_percentage,
+            "fat": fat_percentage,
+            "fiber": fiber_percentage,
+            "calorie": calorie_percentage
+        }], locale)[0]
                 
         # Đánh giá các tỷ lệ macro
         macro_evaluations = {}
         
-        # Tạo chi tiết nhận xét về từng chất dinh dưỡng - theo phong cách khoa học, ngắn gọn
-        nutrient_comments = {
-            "protein": {
-                "balanced": "Lượng protein cân đối tốt cho nhu cầu cơ thể, hỗ trợ duy trì khối cơ và quá trình trao đổi chất.",
-                "excessive": {
-                    "high": "Lượng protein cao vượt nhu cầu. Lý tưởng cho tập luyện nặng, nhưng có thể gây áp lực lên thận nếu duy trì lâu dài.",
-                    "moderate": "Protein hơi cao so với nhu cầu. Tốt cho phục hồi cơ bắp sau tập luyện, nhưng khó tối ưu nếu không hoạt động thể chất."
-                },
-                "deficient": {
-                    "high": "Protein thấp hơn nhiều so với nhu cầu. Có thể dẫn đến mất cơ bắp và suy giảm chức năng miễn dịch. Cân nhắc bổ sung.",
-                    "moderate": "Protein hơi thấp. Khó đạt hiệu quả tối ưu khi tập luyện và duy trì khối cơ. Nên bổ sung thêm."
-                }
-            },
-            "fat": {
-                "balanced": "Chất béo ở mức cân đối, hỗ trợ hấp thu vitamin, sản xuất hormone và cung cấp năng lượng dài hạn.",
-                "excessive": {
-                    "high": "Chất béo vượt mức đáng kể. Tăng nguy cơ tích tụ mỡ thừa và rối loạn lipid máu. Nên giảm khẩu phần.",
-                    "moderate": "Chất béo hơi cao. Chú ý ưu tiên các nguồn béo không bão hòa từ cá, quả bơ và các loại hạt."
-                },
-                "deficient": {
-                    "high": "Chất béo quá thấp, ảnh hưởng đến hấp thu vitamin tan trong dầu và sản xuất hormone. Cần bổ sung từ nguồn lành mạnh.",
-                    "moderate": "Chất béo hơi thấp. Thêm dầu olive, hạt hoặc bơ đậu phộng để cải thiện hấp thu vitamin và hormone."
-                }
-            },
-            "carbs": {
-                "balanced": "Carb ở mức cân đối, cung cấp năng lượng tức thì và dự trữ glycogen cho hoạt động thể chất.",
-                "excessive": {
-                    "high": "Carb quá cao, dễ gây tăng đường huyết và tích trữ mỡ. Thích hợp nếu vận động mạnh, nếu không nên giảm khẩu phần.",
-                    "moderate": "Carb hơi cao. Ưu tiên nguồn carb phức hợp có chỉ số đường huyết thấp để tối ưu năng lượng."
-                },
-                "deficient": {
-                    "high": "Carb quá thấp, có thể dẫn đến thiếu năng lượng, mệt mỏi và khó tập trung. Nên bổ sung từ ngũ cốc nguyên hạt.",
-                    "moderate": "Carb hơi thấp. Thêm trái cây, khoai lang hoặc ngũ cốc nguyên hạt để duy trì năng lượng tối ưu."
-                }
-            },
-            "fiber": {
-                "balanced": "Chất xơ ở mức lý tưởng, hỗ trợ tiêu hóa khỏe mạnh, ổn định đường huyết và tạo cảm giác no lâu.",
-                "excessive": {
-                    "high": "Chất xơ vượt mức khuyến nghị. Tốt cho đường ruột nhưng cần uống nhiều nước để tránh khó tiêu và đầy hơi.",
-                    "moderate": "Chất xơ hơi cao. Đảm bảo uống đủ nước để tối ưu hiệu quả và tránh khó tiêu."
-                },
-                "deficient": {
-                    "high": "Chất xơ quá thấp, tăng nguy cơ táo bón và mất cân bằng hệ vi sinh đường ruột. Cần bổ sung rau xanh và trái cây.",
-                    "moderate": "Chất xơ hơi thấp. Thêm rau xanh, trái cây hoặc ngũ cốc nguyên hạt để cải thiện sức khỏe đường ruột."
-                }
-            },
-            "calorie": {
-                "balanced": "Calo cân đối với nhu cầu, hỗ trợ duy trì cân nặng hiện tại và cung cấp năng lượng tối ưu.",
-                "excessive": {
-                    "high": "Calo vượt mức đáng kể so với nhu cầu. Dẫn đến tích trữ mỡ thừa nếu không tăng hoạt động thể chất.",
-                    "moderate": "Calo hơi cao so với nhu cầu. Phù hợp nếu tập luyện cường độ cao, nếu không nên giảm nhẹ khẩu phần."
-                },
-                "deficient": {
-                    "high": "Calo quá thấp so với nhu cầu. Nguy cơ thiếu dinh dưỡng, giảm cơ và suy giảm chức năng trao đổi chất.",
-                    "moderate": "Calo hơi thấp. Phù hợp nếu đang giảm cân, nếu không nên tăng khẩu phần để đáp ứng nhu cầu năng lượng."
-                }
-            }
-        }
-        
         if meal_type != "drinks":  # Không đánh giá tỷ lệ macro cho đồ uống
-            # Đánh giá chi tiết cho từng macro và tạo nhận xét
-            for macro, actual_ratio, macro_name, target_percent, daily_target, actual_value in [
-                ("carbs", actual_carb_ratio, "Carbohydrate", carb_percentage, daily_carb, actual_carb),
-                ("protein", actual_protein_ratio, "Protein", protein_percentage, daily_protein, actual_protein),
-                ("fat", actual_fat_ratio, "Chất béo", fat_percentage, daily_fat, actual_fat)
+            # Đánh giá chi tiết cho từng macro
+            for macro, actual_ratio, target_percent, daily_target, actual_value in [
+                ("carbs", actual_carb_ratio, carb_percentage, daily_carb, actual_carb),
+                ("protein", actual_protein_ratio, protein_percentage, daily_protein, actual_protein),
+                ("fat", actual_fat_ratio, fat_percentage, daily_fat, actual_fat)
             ]:
                 # Đánh giá tỷ lệ trong bữa ăn
                 target_ratio = target_ratios.get(macro, 0.33)
-                ratio_diff = abs(actual_ratio - target_ratio)
-                
-                # Đánh giá tỉ lệ so với mục tiêu ngày
-                nutrient_comment = ""
-                if 90 <= target_percent <= 110:  # Cân đối
-                    nutrient_comment = nutrient_comments[macro]["balanced"]
-                elif target_percent > 110:  # Thừa
-                    if target_percent > 150:  # Thừa nhiều
-                        nutrient_comment = nutrient_comments[macro]["excessive"]["high"]
-                    else:  # Thừa vừa phải
-                        nutrient_comment = nutrient_comments[macro]["excessive"]["moderate"]
-                else:  # Thiếu
-                    if target_percent < 50:  # Thiếu nhiều
-                        nutrient_comment = nutrient_comments[macro]["deficient"]["high"]
-                    else:  # Thiếu vừa phải
-                        nutrient_comment = nutrient_comments[macro]["deficient"]["moderate"]
-                
-                # Đánh giá cho tỷ lệ trong bữa ăn
-                if ratio_diff < 0.05:  # Sai lệch dưới 5%
-                    evaluation = "Cân đối tốt"
-                elif ratio_diff < 0.1:  # Sai lệch dưới 10%
-                    evaluation = "Gần như cân đối"
-                    score -= 5
-                else:
-                    if actual_ratio > target_ratio:
-                        evaluation = "Cao hơn khuyến nghị"
-                    else:
-                        evaluation = "Thấp hơn khuyến nghị"
-                    score -= 10
-                
-                actual_percent = round(actual_ratio * 100)
-                target_ratio_percent = round(target_ratio * 100)
+                ratio_band = MACRO_RATIO_RULE.lookup(actual_ratio - target_ratio)
+                score -= ratio_band.penalty
                 
                 macro_evaluations[macro] = {
-                    "name": macro_name,
+                    "name": nutrient_name(macro, locale),
                     "actual_value": round(actual_value, 1),
                     "daily_target": round(daily_target, 1),
                     "percentage_of_daily": round(target_percent),
-                    "actual_ratio_percent": actual_percent,
-                    "target_ratio_percent": target_ratio_percent,
-                    "evaluation": evaluation,
-                    "comment": nutrient_comment
+                    "actual_ratio_percent": round(actual_ratio * 100),
+                    "target_ratio_percent": round(target_ratio * 100),
+                    "evaluation": evaluation_text(ratio_band.level, locale),
+                    "comment": comments[macro]
                 }
             
-            # Thêm đánh giá cho chất xơ
-            fiber_comment = ""
-            if 90 <= fiber_percentage <= 110:  # Cân đối
-                fiber_comment = nutrient_comments["fiber"]["balanced"]
-            elif fiber_percentage > 110:  # Thừa
-                if fiber_percentage > 150:  # Thừa nhiều
-                    fiber_comment = nutrient_comments["fiber"]["excessive"]["high"]
-                else:  # Thừa vừa phải
-                    fiber_comment = nutrient_comments["fiber"]["excessive"]["moderate"]
-            else:  # Thiếu
-                if fiber_percentage < 50:  # Thiếu nhiều
-                    fiber_comment = nutrient_comments["fiber"]["deficient"]["high"]
-                else:  # Thiếu vừa phải
-                    fiber_comment = nutrient_comments["fiber"]["deficient"]["moderate"]
-                    
             # Đánh giá chất xơ trong bữa ăn
-            if fiber_percentage < 70:
-                score -= 10
-                fiber_evaluation = "Thấp hơn khuyến nghị"
-            elif fiber_percentage > 130:
-                fiber_evaluation = "Cao hơn khuyến nghị"
-            else:
-                fiber_evaluation = "Cân đối tốt"
+            fiber_band = FIBER_RULE.lookup(fiber_percentage)
+            score -= fiber_band.penalty
                 
             macro_evaluations["fiber"] = {
-                "name": "Chất xơ",
+                "name": nutrient_name("fiber", locale),
                 "actual_value": round(actual_fiber, 1),
                 "daily_target": round(daily_fiber, 1),
                 "percentage_of_daily": round(fiber_percentage),
-                "evaluation": fiber_evaluation,
-                "comment": fiber_comment
+                "evaluation": evaluation_text(fiber_band.level, locale),
+                "comment": comments["fiber"]
             }
         
         # Đánh giá calo chi tiết
-        calorie_comment = ""
-        if 90 <= calorie_percentage <= 110:  # Cân đối
-            calorie_comment = nutrient_comments["calorie"]["balanced"]
-        elif calorie_percentage > 110:  # Thừa
-            if calorie_percentage > 150:  # Thừa nhiều
-                calorie_comment = nutrient_comments["calorie"]["excessive"]["high"]
-            else:  # Thừa vừa phải
-                calorie_comment = nutrient_comments["calorie"]["excessive"]["moderate"]
-        else:  # Thiếu
-            if calorie_percentage < 50:  # Thiếu nhiều
-                calorie_comment = nutrient_comments["calorie"]["deficient"]["high"]
-            else:  # Thiếu vừa phải
-                calorie_comment = nutrient_comments["calorie"]["deficient"]["moderate"]
+        calorie_comment = comments["calorie"]
         
         # Đảm bảo điểm số nằm trong khoảng 0-100
         score = max(0, min(100, score))
@@ -0,0 +1,255 @@
+from typing import Dict, List, Any, Optional
+from datetime import datetime, date, timedelta
+from collections import Counter
+from pymongo import UpdateOne
+
+from src.config.database import (
+    foods_collection,
+    weekly_ingredient_usages_collection,
+    ingredient_usage_rollups_collection
+)
+from src.utils.error_handling import logger
+
+# Number of ingredients returned for the food diversity chart
+FOOD_DIVERSITY_LIMIT = 50
+
+def get_week_start(day: date) -> date:
+    """
+    Get the Monday of the week containing a date
+
+    Args:
+        day: Any date in the week
+
+    Returns:
+        Start date of the week
+    """
+    return day - timedelta(days=day.weekday())
+
+def get_usage_report_id(user_id: str, week_start_date: date) -> str:
+    """
+    Build the rollup key for a user's week
+
+    Args:
+        user_id: The ID of the user
+        week_start_date: Start date of the week
+
+    Returns:
+        Report ID shared by all usage rows of that week
+    """
+    return f"{user_id}:{week_start_date.isoformat()}"
+
+def _food_week_start(food: Dict[str, Any]) -> date:
+    """Resolve the week a food belongs to from its eating time"""
+    eating_time = food.get("eating_time") or food.get("created_at") or datetime.utcnow()
+    if isinstance(eating_time, str):
+        try:
+            eating_time = datetime.fromisoformat(eating_time)
+        except ValueError:
+            eating_time = datetime.utcnow()
+    if isinstance(eating_time, datetime):
+        eating_time = eating_time.date()
+    return get_week_start(eating_time)
+
+async def _apply_usage(food: Dict[str, Any], sign: int, session=None) -> None:
+    """
+    Add or subtract a food's ingredients from its weekly rollup
+
+    Args:
+        food: Food document with user_id, eating_time and ingredients
+        sign: 1 to add the food, -1 to remove it
+        session: Optional Mongo session to join a running transaction
+    """
+    ingredients = food.get("ingredients") or []
+    if not ingredients or not food.get("user_id"):
+        return
+
+    counts = Counter()
+    quantities = Counter()
+    for ingredient in ingredients:
+        name = ingredient.get("name", "Unknown")
+        counts[name] += 1
+        quantities[name] += ingredient.get("quantity", 0) or 0
+
+    week_start = _food_week_start(food)
+    report_id = get_usage_report_id(food["user_id"], week_start)
+    now = datetime.utcnow()
+
+    operations = [
+        UpdateOne(
+            {"report_id": report_id, "ingredient_name": name},
+            {
+                "$inc": {"count": sign * count, "total_quantity": sign * quantities[name]},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {
+                    "user_id": food["user_id"],
+                    "week_start_date": week_start.isoformat(),
+                    "created_at": now
+                }
+            },
+            upsert=sign > 0
+        )
+        for name, count in counts.items()
+    ]
+    await weekly_ingredient_usages_collection.bulk_write(operations, ordered=False, session=session)
+
+    # Drop rows that no longer count any usage
+    if sign < 0:
+        await weekly_ingredient_usages_collection.delete_many(
+            {"report_id": report_id, "count": {"$lte": 0}},
+            session=session
+        )
+
+async def record_food_usage(food: Dict[str, Any], session=None) -> None:
+    """
+    Add a saved food's ingredients to the weekly ingredient rollup
+
+    Args:
+        food: Food document with user_id, eating_time and ingredients
+        session: Optional Mongo session to join a running transaction
+    """
+    await _apply_usage(food, 1, session=session)
+
+async def remove_food_usage(food: Dict[str, Any], session=None) -> None:
+    """
+    Remove a food's ingredients from the weekly ingredient rollup
+
+    Args:
+        food: Food document as it was stored before the change
+        session: Optional Mongo session to join a running transaction
+    """
+    await _apply_usage(food, -1, session=session)
+
+async def aggregate_ingredient_usage(user_id: str, week_start_date: date) -> List[Dict[str, Any]]:
+    """
+    Count ingredient usage for a seven-day window directly from foods
+
+    Args:
+        user_id: The ID of the user
+        week_start_date: First day of the window
+
+    Returns:
+        Rows with ingredient name, usage count and total quantity
+    """
+    week_start = datetime.combine(week_start_date, datetime.min.time())
+    week_end = datetime.combine(week_start_date + timedelta(days=6), datetime.max.time())
+
+    # Count ingredients on the server instead of loading whole foods
+    pipeline = [
+        {"$match": {"user_id": user_id, "eating_time": {"$gte": week_start, "$lte": week_end}}},
+        {"$unwind": "$ingredients"},
+        {"$group": {
+            "_id": {"$ifNull": ["$ingredients.name", "Unknown"]},
+            "count": {"$sum": 1},
+            "total_quantity": {"$sum": {"$ifNull": ["$ingredients.quantity", 0]}}
+        }},
+        {"$sort": {"count": -1}}
+    ]
+
+    return [
+        {"ingredient_name": row["_id"], "count": row["count"], "total_quantity": row["total_quantity"]}
+        async for row in foods_collection.aggregate(pipeline)
+    ]
+
+async def rebuild_ingredient_usage(user_id: str, week_start_date: date) -> int:
+    """
+    Recompute a week's ingredient rollup from the foods collection
+
+    Used to backfill weeks logged before the rollup existed. The week is
+    then marked as rolled up, so it is never rebuilt again.
+
+    Args:
+        user_id: The ID of the user
+        week_start_date: Start date of the week (a Monday)
+
+    Returns:
+        Number of distinct ingredients written
+    """
+    report_id = get_usage_report_id(user_id, week_start_date)
+    now = datetime.utcnow()
+
+    rows = [
+        {
+            **row,
+            "report_id": report_id,
+            "user_id": user_id,
+            "week_start_date": week_start_date.isoformat(),
+            "created_at": now,
+            "updated_at": now
+        }
+        for row in await aggregate_ingredient_usage(user_id, week_start_date)
+    ]
+
+    await weekly_ingredient_usages_collection.delete_many({"report_id": report_id})
+    if rows:
+        await weekly_ingredient_usages_collection.insert_many(rows)
+
+    await ingredient_usage_rollups_collection.update_one(
+        {"_id": report_id},
+        {"$set": {"user_id": user_id, "week_start_date": week_start_date.isoformat(), "rolled_up_at": now}},
+        upsert=True
+    )
+
+    logger.info(f"Rebuilt ingredient usage for {report_id}: {len(rows)} ingredients")
+    return len(rows)
+
+async def ensure_ingredient_usage(user_id: str, week_start_date: date) -> bool:
+    """
+    Backfill a week's rollup unless it has been rebuilt from foods before
+
+    Foods saved since the rollup was introduced are counted incrementally,
+    but weeks that started earlier may only hold part of their foods, so a
+    week counts as complete only once it carries a rolled-up marker.
+
+    Args:
+        user_id: The ID of the user
+        week_start_date: Start date of the week (a Monday)
+
+    Returns:
+        True when the week had to be rebuilt
+    """
+    report_id = get_usage_report_id(user_id, week_start_date)
+    if await ingredient_usage_rollups_collection.find_one({"_id": report_id}, {"_id": 1}):
+        return False
+
+    await rebuild_ingredient_usage(user_id, week_start_date)
+    return True
+
+async def get_food_diversity(
+    user_id: str,
+    week_start_date: date,
+    limit: int = FOOD_DIVERSITY_LIMIT
+) -> Dict[str, Any]:
+    """
+    Get the most used ingredients of a week from the rollup
+
+    Args:
+        user_id: The ID of the user
+        week_start_date: Start date of the week
+        limit: Maximum number of ingredients to return
+
+    Returns:
+        Distinct ingredient count and the top ingredients by usage
+    """
+    # Rollups are kept per Monday-based week, other windows are counted directly
+    if week_start_date.weekday() != 0:
+        rows = await aggregate_ingredient_usage(user_id, week_start_date)
+        return {
+            "total_count": len(rows),
+            "ingredients": [{"name": row["ingredient_name"], "count": row["count"]} for row in rows[:limit]]
+        }
+
+    report_id = get_usage_report_id(user_id, week_start_date)
+    query = {"report_id": report_id, "count": {"$gt": 0}}
+
+    rows = await weekly_ingredient_usages_collection.find(
+        query, {"_id": 0, "ingredient_name": 1, "count": 1}
+    ).sort("count", -1).limit(limit).to_list(length=limit)
+
+    total_count = len(rows)
+    if total_count == limit:
+        total_count = await weekly_ingredient_usages_collection.count_documents(query)
+
+    return {
+        "total_count": total_count,
+        "ingredients": [{"name": row["ingredient_name"], "count": row["count"]} for row in rows]
+    }
@@ -0,0 +1,265 @@
+import bisect
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+DEFAULT_LOCALE = "vi"
+
+@dataclass(frozen=True)
+class Band:
+    """Outcome of a rule for values up to an upper bound"""
+    level: str  # Key of the evaluation and comment texts
+    penalty: int = 0  # Points taken off the meal score
+
+class RuleTable:
+    """
+    Threshold rule compiled into a sorted table searched with bisect
+
+    Declared as (upper bound, bound included, band) rows in ascending order,
+    with a last row whose bound is None. A bound is stored as (value, 1) when
+    it belongs to its band and (value, 0) when it starts the next one, so
+    looking up (value, 0.5) lands on the right side of every boundary.
+    """
+
+    def __init__(self, rows: Sequence[Tuple[Optional[float], bool, Band]]):
+        self.keys = [(upper, 1 if inclusive else 0) for upper, inclusive, _ in rows[:-1]]
+        self.bands = [band for _, _, band in rows]
+
+    def _index(self, value: float) -> int:
+        return bisect.bisect_right(self.keys, (value, 0.5))
+
+    def lookup(self, value: float) -> Band:
+        """Get the band a value falls into"""
+        return self.bands[self._index(value)]
+
+    def lookup_many(self, values: Sequence[float]) -> List[Band]:
+        """Get the band of every value"""
+        return [self.bands[self._index(value)] for value in values]
+
+# Share of the daily target, in percent, eaten of a nutrient
+DAILY_SHARE_RULE = RuleTable([
+    (50, False, Band("deficient_high")),
+    (90, False, Band("deficient_moderate")),
+    (110, True, Band("balanced")),
+    (150, True, Band("excessive_moderate")),
+    (None, False, Band("excessive_high"))
+])
+
+# Meal macro ratio minus the meal type's target ratio
+MACRO_RATIO_RULE = RuleTable([
+    (-0.1, True, Band("below", 10)),
+    (-0.05, True, Band("nearly_balanced", 5)),
+    (0.05, False, Band("balanced")),
+    (0.1, False, Band("nearly_balanced", 5)),
+    (None, False, Band("above", 10))
+])
+
+# Share of the daily fiber target, in percent
+FIBER_RULE = RuleTable([
+    (70, False, Band("below", 10)),
+    (130, True, Band("balanced")),
+    (None, False, Band("above"))
+])
+
+# Main meal calories relative to the meal's share of the daily target
+MEAL_CALORIE_RULE = RuleTable([
+    (0.8, False, Band("calorie_below", 15)),
+    (1.2, True, Band("calorie_on_target")),
+    (None, False, Band("calorie_above", 15))
+])
+
+# Snack and drink calories relative to their limit
+CALORIE_LIMIT_RULE = RuleTable([
+    (1, True, Band("within_limit")),
+    (None, False, Band("over_limit", 15))
+])
+
+# Nutrient names used by callers mapped to comment keys
+NUTRIENT_ALIASES = {
+    "calorie": "calorie",
+    "calories": "calorie",
+    "protein": "protein",
+    "fat": "fat",
+    "carb": "carbs",
+    "carbs": "carbs",
+    "carbohydrate": "carbs",
+    "fiber": "fiber"
+}
+
+# Localized texts: evaluation labels, nutrient names and comments per daily share band
+TEXTS: Dict[str, Dict[str, Any]] = {
+    "vi": {
+        "evaluations": {
+            "below": "Thấp hơn khuyến nghị",
+            "nearly_balanced": "Gần như cân đối",
+            "balanced": "Cân đối tốt",
+            "above": "Cao hơn khuyến nghị",
+            "calorie_below": "Thấp hơn mục tiêu",
+            "calorie_on_target": "Phù hợp với mục tiêu",
+            "calorie_above": "Cao hơn mục tiêu",
+            "within_limit": "Phù hợp với giới hạn calo",
+            "over_limit": "Vượt quá giới hạn ({limit} kcal)",
+            "drink_over_limit": "Vượt quá giới hạn cho đồ uống ({limit} kcal/100ml)"
+        },
+        "names": {
+            "carbs": "Carbohydrate",
+            "protein": "Protein",
+            "fat": "Chất béo",
+            "fiber": "Chất xơ"
+        },
+        "comments": {
+            "protein": {
+                "balanced": "Lượng protein cân đối tốt cho nhu cầu cơ thể, hỗ trợ duy trì khối cơ và quá trình trao đổi chất.",
+                "excessive_high": "Lượng protein cao vượt nhu cầu. Lý tưởng cho tập luyện nặng, nhưng có thể gây áp lực lên thận nếu duy trì lâu dài.",
+                "excessive_moderate": "Protein hơi cao so với nhu cầu. Tốt cho phục hồi cơ bắp sau tập luyện, nhưng khó tối ưu nếu không hoạt động thể chất.",
+                "deficient_high": "Protein thấp hơn nhiều so với nhu cầu. Có thể dẫn đến mất cơ bắp và suy giảm chức năng miễn dịch. Cân nhắc bổ sung.",
+                "deficient_moderate": "Protein hơi thấp. Khó đạt hiệu quả tối ưu khi tập luyện và duy trì khối cơ. Nên bổ sung thêm."
+            },
+            "fat": {
+                "balanced": "Chất béo ở mức cân đối, hỗ trợ hấp thu vitamin, sản xuất hormone và cung cấp năng lượng dài hạn.",
+                "excessive_high": "Chất béo vượt mức đáng kể. Tăng nguy cơ tích tụ mỡ thừa và rối loạn lipid máu. Nên giảm khẩu phần.",
+                "excessive_moderate": "Chất béo hơi cao. Chú ý ưu tiên các nguồn béo không bão hòa từ cá, quả bơ và các loại hạt.",
+                "deficient_high": "Chất béo quá thấp, ảnh hưởng đến hấp thu vitamin tan trong dầu và sản xuất hormone. Cần bổ sung từ nguồn lành mạnh.",
+                "deficient_moderate": "Chất béo hơi thấp. Thêm dầu olive, hạt hoặc bơ đậu phộng để cải thiện hấp thu vitamin và hormone."
+            },
+            "carbs": {
+                "balanced": "Carb ở mức cân đối, cung cấp năng lượng tức thì và dự trữ glycogen cho hoạt động thể chất.",
+                "excessive_high": "Carb quá cao, dễ gây tăng đường huyết và tích trữ mỡ. Thích hợp nếu vận động mạnh, nếu không nên giảm khẩu phần.",
+                "excessive_moderate": "Carb hơi cao. Ưu tiên nguồn carb phức hợp có chỉ số đường huyết thấp để tối ưu năng lượng.",
+                "deficient_high": "Carb quá thấp, có thể dẫn đến thiếu năng lượng, mệt mỏi và khó tập trung. Nên bổ sung từ ngũ cốc nguyên hạt.",
+                "deficient_moderate": "Carb hơi thấp. Thêm trái cây, khoai lang hoặc ngũ cốc nguyên hạt để duy trì năng lượng tối ưu."
+            },
+            "fiber": {
+                "balanced": "Chất xơ ở mức lý tưởng, hỗ trợ tiêu hóa khỏe mạnh, ổn định đường huyết và tạo cảm giác no lâu.",
+                "excessive_high": "Chất xơ vượt mức khuyến nghị. Tốt cho đường ruột nhưng cần uống nhiều nước để tránh khó tiêu và đầy hơi.",
+                "excessive_moderate": "Chất xơ hơi cao. Đảm bảo uống đủ nước để tối ưu hiệu quả và tránh khó tiêu.",
+                "deficient_high": "Chất xơ quá thấp, tăng nguy cơ táo bón và mất cân bằng hệ vi sinh đường ruột. Cần bổ sung rau xanh và trái cây.",
+                "deficient_moderate": "Chất xơ hơi thấp. Thêm rau xanh, trái cây hoặc ngũ cốc nguyên hạt để cải thiện sức khỏe đường ruột."
+            },
+            "calorie": {
+                "balanced": "Calo cân đối với nhu cầu, hỗ trợ duy trì cân nặng hiện tại và cung cấp năng lượng tối ưu.",
+                "excessive_high": "Calo vượt mức đáng kể so với nhu cầu. Dẫn đến tích trữ mỡ thừa nếu không tăng hoạt động thể chất.",
+                "excessive_moderate": "Calo hơi cao so với nhu cầu. Phù hợp nếu tập luyện cường độ cao, nếu không nên giảm nhẹ khẩu phần.",
+                "deficient_high": "Calo quá thấp so với nhu cầu. Nguy cơ thiếu dinh dưỡng, giảm cơ và suy giảm chức năng trao đổi chất.",
+                "deficient_moderate": "Calo hơi thấp. Phù hợp nếu đang giảm cân, nếu không nên tăng khẩu phần để đáp ứng nhu cầu năng lượng."
+            }
+        }
+    },
+    "en": {
+        "evaluations": {
+            "below": "Below recommendation",
+            "nearly_balanced": "Nearly balanced",
+            "balanced": "Well balanced",
+            "above": "Above recommendation",
+            "calorie_below": "Below target",
+            "calorie_on_target": "On target",
+            "calorie_above": "Above target",
+            "within_limit": "Within the calorie limit",
+            "over_limit": "Over the limit ({limit} kcal)",
+            "drink_over_limit": "Over the drink limit ({limit} kcal/100ml)"
+        },
+        "names": {
+            "carbs": "Carbohydrate",
+            "protein": "Protein",
+            "fat": "Fat",
+            "fiber": "Fiber"
+        },
+        "comments": {
+            "protein": {
+                "balanced": "Protein is well matched to your needs, supporting muscle maintenance and metabolism.",
+                "excessive_high": "Protein is well above your needs. Ideal for heavy training, but may strain the kidneys if sustained.",
+                "excessive_moderate": "Protein is slightly high. Good for muscle recovery after training, less useful without physical activity.",
+                "deficient_high": "Protein is far below your needs. This can lead to muscle loss and weaker immunity. Consider adding more.",
+                "deficient_moderate": "Protein is slightly low. Training and muscle maintenance will be less effective. Add a little more."
+            },
+            "fat": {
+                "balanced": "Fat is balanced, supporting vitamin absorption, hormone production and long-lasting energy.",
+                "excessive_high": "Fat is well above the recommended level. This raises the risk of fat gain and blood lipid problems. Reduce the portion.",
+                "excessive_moderate": "Fat is slightly high. Prefer unsaturated fats from fish, avocado and nuts.",
+                "deficient_high": "Fat is too low, which affects fat-soluble vitamin absorption and hormone production. Add healthy sources.",
+                "deficient_moderate": "Fat is slightly low. Add olive oil, nuts or peanut butter to support vitamin absorption and hormones."
+            },
+            "carbs": {
+                "balanced": "Carbs are balanced, providing immediate energy and glycogen stores for physical activity.",
+                "excessive_high": "Carbs are too high, which can raise blood sugar and fat storage. Fine with heavy activity, otherwise reduce the portion.",
+                "excessive_moderate": "Carbs are slightly high. Prefer complex carbs with a low glycemic index.",
+                "deficient_high": "Carbs are too low, which can cause low energy, fatigue and poor focus. Add whole grains.",
+                "deficient_moderate": "Carbs are slightly low. Add fruit, sweet potato or whole grains to keep energy up."
+            },
+            "fiber": {
+                "balanced": "Fiber is at an ideal level, supporting digestion, stable blood sugar and lasting fullness.",
+                "excessive_high": "Fiber is above the recommendation. Good for the gut, but drink plenty of water to avoid bloating.",
+                "excessive_moderate": "Fiber is slightly high. Drink enough water to get the benefit without indigestion.",
+                "deficient_high": "Fiber is too low, raising the risk of constipation and an unbalanced gut flora. Add vegetables and fruit.",
+                "deficient_moderate": "Fiber is slightly low. Add vegetables, fruit or whole grains for better gut health."
+            },
+            "calorie": {
+                "balanced": "Calories match your needs, helping maintain your current weight with steady energy.",
+                "excessive_high": "Calories are well above your needs. This leads to fat gain without more physical activity.",
+                "excessive_moderate": "Calories are slightly high. Fine with intense training, otherwise trim the portion a little.",
+                "deficient_high": "Calories are far below your needs. Risk of undernutrition, muscle loss and a slower metabolism.",
+                "deficient_moderate": "Calories are slightly low. Fine while losing weight, otherwise eat a bit more to meet your energy needs."
+            }
+        }
+    }
+}
+
+def resolve_locale(value: Optional[str]) -> str:
+    """
+    Pick a supported locale from a language tag or Accept-Language header
+
+    Args:
+        value: e.g. "en", "en-US" or "vi-VN,vi;q=0.9,en;q=0.8"
+
+    Returns:
+        First supported language in the value, DEFAULT_LOCALE otherwise
+    """
+    for part in (value or "").split(","):
+        language = part.split(";")[0].strip().split("-")[0].lower()
+        if language in TEXTS:
+            return language
+    return DEFAULT_LOCALE
+
+def evaluation_text(level: str, locale: str = DEFAULT_LOCALE, **values: Any) -> str:
+    """Get the localized label of an evaluation level"""
+    return TEXTS[locale]["evaluations"][level].format(**values)
+
+def nutrient_name(nutrient: str, locale: str = DEFAULT_LOCALE) -> str:
+    """Get the localized display name of a nutrient"""
+    return TEXTS[locale]["names"][NUTRIENT_ALIASES[nutrient]]
+
+def comment_daily_shares(
+    rows: Sequence[Dict[str, float]],
+    locale: str = DEFAULT_LOCALE
+) -> List[Dict[str, str]]:
+    """
+    Comment on nutrients by the share of their daily target eaten
+
+    Args:
+        rows: One {nutrient: percent of daily target} dict per meal, day or comparison
+        locale: Language of the comments
+
+    Returns:
+        One {nutrient: comment} dict per row
+    """
+    comments = TEXTS[locale]["comments"]
+    return [
+        {
+            nutrient: comments[NUTRIENT_ALIASES[nutrient]][band.level]
+            for nutrient, band in zip(row, DAILY_SHARE_RULE.lookup_many(list(row.values())))
+        }
+        for row in rows
+    ]
+
+def comment_daily_share(nutrient: str, percentage: float, locale: str = DEFAULT_LOCALE) -> str:
+    """
+    Comment on one nutrient by the share of its daily target eaten
+
+    Args:
+        nutrient: Nutrient name, e.g. "protein" or "carbohydrate"
+        percentage: Percent of the daily target
+        locale: Language of the comment
+
+    Returns:
+        Comment text
+    """
+    return comment_daily_shares([{nutrient: percentage}], locale)[0][nutrient]
@@ -0,0 +1,64 @@
+from datetime import datetime, date
+from typing import Dict, Any, Optional
+
+from src.config.database import daily_reports_collection
+from src.services.jobs.task_queue import enqueue_task
+from src.utils.error_handling import logger
+
+ANALYZE_FOOD_TASK = "analyze_food"
+REFRESH_DAILY_REPORT_TASK = "refresh_daily_report"
+
+def _food_date(food: Dict[str, Any]) -> date:
+    """Resolve the day a food counts towards from its eating time"""
+    eating_time = food.get("eating_time") or food.get("created_at") or datetime.utcnow()
+    if isinstance(eating_time, str):
+        try:
+            eating_time = datetime.fromisoformat(eating_time)
+        except ValueError:
+            eating_time = datetime.utcnow()
+    if isinstance(eating_time, datetime):
+        eating_time = eating_time.date()
+    return eating_time
+
+async def invalidate_daily_report(user_id: str, report_date: date) -> None:
+    """
+    Drop a stored daily report and queue its rebuild
+
+    Args:
+        user_id: The ID of the user
+        report_date: Day whose foods changed
+    """
+    day = report_date.isoformat()
+    await daily_reports_collection.delete_one({"user_id": user_id, "date": day})
+    await enqueue_task(
+        REFRESH_DAILY_REPORT_TASK,
+        {"user_id": user_id, "date": day},
+        dedupe_key=f"{REFRESH_DAILY_REPORT_TASK}:{user_id}:{day}"
+    )
+
+async def queue_food_precompute(food: Optional[Dict[str, Any]], previous: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Queue the analysis and daily report work that follows a food write
+
+    Failures are logged rather than raised: the food is already saved and the
+    read endpoints compute anything missing themselves.
+
+    Args:
+        food: Food document as saved, None when it was deleted
+        previous: Food document before an update or delete
+    """
+    try:
+        if food:
+            food_id = str(food["_id"])
+            await enqueue_task(
+                ANALYZE_FOOD_TASK,
+                {"food_id": food_id, "user_id": food["user_id"]},
+                dedupe_key=f"{ANALYZE_FOOD_TASK}:{food_id}"
+            )
+
+        # Rebuild the report of every day the food moved from or to
+        days = {(doc["user_id"], _food_date(doc)) for doc in (food, previous) if doc}
+        for user_id, report_date in days:
+            await invalidate_daily_report(user_id, report_date)
+    except Exception as e:
+        logger.error(f"Error queueing food precompute: {str(e)}")
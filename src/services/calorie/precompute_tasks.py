@@ -0,0 +1,20 @@
+from datetime import date
+from typing import Dict, Any
+
+from src.services.calorie.calorie_service import create_nutrition_comparison, store_daily_report
+from src.services.calorie.precompute import ANALYZE_FOOD_TASK, REFRESH_DAILY_REPORT_TASK
+from src.services.jobs.task_queue import register_task
+
+# Kept apart from precompute, which food writes import: calorie_service imports
+# the food package, so importing it from there would close an import cycle
+
+async def _analyze_food(payload: Dict[str, Any]) -> None:
+    """Store the analyzed comparison of a food against its owner's target"""
+    await create_nutrition_comparison(payload["food_id"], payload["user_id"])
+
+async def _refresh_daily_report(payload: Dict[str, Any]) -> None:
+    """Store a fresh daily report"""
+    await store_daily_report(payload["user_id"], date.fromisoformat(payload["date"]))
+
+register_task(ANALYZE_FOOD_TASK, _analyze_food)
+register_task(REFRESH_DAILY_REPORT_TASK, _refresh_daily_report)
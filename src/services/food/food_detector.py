@@ -6,6 +6,8 @@ import google.generativeai as genai
 import PIL.Image
 
 from src.schemas.food.food_schema import FoodItem, FoodCategory
+from src.utils.error_handling import logger
+from src.utils.tracing import span, traced
 import config
 
 # Configure API key for Gemini Vision
@@ -32,6 +34,7 @@ async def detect_food_from_image(image_path: str, model: str = "gemini-pro-visio
     else:
         raise ValueError(f"Unsupported model: {model}")
 
+@traced("gemini.detect_food")
 async def detect_food_with_gemini(image_path: str) -> List[FoodItem]:
     """
     Use Google's Gemini Pro Vision model to detect food in an image
@@ -122,7 +125,8 @@ async def detect_food_with_gemini(image_path: str) -> List[FoodItem]:
     
     try:
         # Generate content
-        response = model.generate_content([prompt, image])
+        with span("gemini.generate_content", model="gemini-pro-vision"):
+            response = model.generate_content([prompt, image])
         
         # Extract the text response
         text_response = response.text
@@ -169,8 +173,7 @@ async def detect_food_with_gemini(image_path: str) -> List[FoodItem]:
                 return food_recognition
                 
             except json.JSONDecodeError as e:
-                print(f"Error parsing JSON response: {str(e)}")
-                print(f"Response text: {text_response}")
+                logger.warning(f"Error parsing JSON response: {str(e)}", extra={"response_text": text_response})
                 # Fall through to fallback method
         
         # Fallback: If proper JSON parsing fails, return basic food item
@@ -200,7 +203,7 @@ async def detect_food_with_gemini(image_path: str) -> List[FoodItem]:
         
     except Exception as e:
         # Log the error and return empty list
-        print(f"Error in Gemini food detection: {str(e)}")
+        logger.error(f"Error in Gemini food detection: {str(e)}")
         return []
 
 def extract_food_names_from_text(text: str) -> List[str]:
@@ -9,11 +9,21 @@ from motor.motor_asyncio import AsyncIOMotorClientSession
 import asyncio
 from functools import lru_cache
 import json
+import base64
 
-from src.config.database import ingredients_collection, foods_collection, get_db
+import config
+
+from src.config.database import ingredients_collection, foods_collection, get_db, FOOD_LIST_PROJECTION
 from src.schemas.food.food_schema import FoodCreate, FoodUpdate
 from src.schemas.dish import DishRequest, IngredientRecognition
 from src.utils.db_utils import safe_db_operation
+from src.utils.error_handling import logger
+from src.config.constants import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+from src.services.calorie.ingredient_usage import record_food_usage, remove_food_usage
+from src.services.food.ingredient_catalog import resolve_ingredient_refs, expand_ingredient_refs
+from src.services.food.food_suggest import index_food
+from src.services.food.image_store import find_image_renditions, rendition_fields, resolve_upload_path
+from src.services.calorie.precompute import queue_food_precompute
 
 # Cache settings
 CACHE_TTL = 300  # 5 minutes
@@ -87,63 +97,36 @@ async def save_new_dish_to_db(
             "updated_at": now
         }
         
+        # Point list views at the WebP renditions made when the photo was uploaded
+        food_doc.update(rendition_fields(await find_image_renditions(dish_request.image_url)))
+        
         # Process ingredients
         ingredients = food_data.get("ingredients", [])
-        ingredient_refs = []
         
         # Use transaction for atomic operation
         async with await get_db().client.start_session() as session:
             async with session.start_transaction():
-                # Insert new food document
+                # Register ingredients in the shared catalogue
+                ingredient_refs = await resolve_ingredient_refs(ingredients, session=session)
+                food_doc["ingredients"] = ingredient_refs
+                
+                # Insert new food document with its ingredient refs
                 food_result = await safe_db_operation(
                     foods_collection.insert_one(food_doc, session=session)
                 )
                 food_id = food_result.inserted_id
                 
-                # Process ingredients
-                for ing in ingredients:
-                    # Create ingredient document
-                    ingredient_doc = {
-                        "food_id": food_id,
-                        "name": ing.get("name", "Unknown Ingredient"),
-                        "quantity": ing.get("quantity", 0),
-                        "unit": ing.get("unit", "g"),
-                        "protein": ing.get("protein", 0),
-                        "fat": ing.get("fat", 0),
-                        "carb": ing.get("carb", 0),
-                        "fiber": ing.get("fiber", 0),
-                        "calories": ing.get("calories", 0),
-                        "did_you_know": ing.get("did_you_know", ""),
-                        "created_at": now,
-                        "updated_at": now
-                    }
-                    
-                    # Insert ingredient
-                    ingredient_result = await safe_db_operation(
-                        ingredients_collection.insert_one(ingredient_doc, session=session)
-                    )
-                    
-                    # Add reference to the list
-                    ingredient_refs.append({
-                        "ingredient_id": str(ingredient_result.inserted_id),
-                        "name": ing.get("name", "Unknown Ingredient"),
-                        "quantity": ing.get("quantity", 0),
-                        "unit": ing.get("unit", "g"),
-                        "did_you_know": ing.get("did_you_know", "")
-                    })
-                
-                # Update food with ingredients
-                await safe_db_operation(
-                    foods_collection.update_one(
-                        {"_id": food_id},
-                        {"$set": {"ingredients": ingredient_refs}},
-                        session=session
-                    )
-                )
+                # Add ingredients to the weekly usage rollup
+                await record_food_usage(food_doc, session=session)
+        
+        # Make the new names available to autocomplete
+        index_food(food_doc)
+        
+        # Analyze the dish and rebuild the day's report in the background
+        await queue_food_precompute(food_doc)
         
         # Prepare response
         food_doc["id"] = str(food_id)
-        food_doc["ingredients"] = ingredient_refs
         
         response = {
             "status": "success",
@@ -171,7 +154,7 @@ async def save_new_dish_to_db(
             "food_name": dish_request.food_data.get("food_name") if dish_request.food_data else None,
             "timestamp": datetime.utcnow().isoformat()
         }
-        print(f"Error saving dish: {json.dumps(error_details)}")
+        logger.error("Error saving dish", extra=error_details)
         
         # If showing loading screen, update status even on error
         if show_loading:
@@ -207,7 +190,7 @@ async def upload_dish_image(file: UploadFile) -> str:
         chunk_size = 1024 * 1024  # 1MB chunks
         
         # Create uploads directory if it doesn't exist
-        uploads_dir = "uploads"
+        uploads_dir = config.UPLOAD_DIR
         if not os.path.exists(uploads_dir):
             os.makedirs(uploads_dir)
         
@@ -248,7 +231,8 @@ async def search_foods(
     skip: int = 0, 
     limit: int = 100,
     sort_field: str = "eating_time",
-    sort_direction: int = -1
+    sort_direction: int = -1,
+    projection: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
     Unified search function for foods with comprehensive filtering options
@@ -264,6 +248,7 @@ async def search_foods(
         limit: Maximum number of records to return
         sort_field: Field to sort by
         sort_direction: Sort direction (1 for ascending, -1 for descending)
+        projection: Optional fields to return instead of whole documents
     
     Returns:
         List[Dict]: List of foods matching the criteria
@@ -307,7 +292,7 @@ async def search_foods(
         
         # Execute query with pagination and sorting
         foods = await safe_db_operation(
-            foods_collection.find(query)
+            foods_collection.find(query, projection)
             .sort(sort_field, sort_direction)
             .skip(skip)
             .limit(limit)
@@ -325,6 +310,176 @@ async def search_foods(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching foods: {str(e)}")
 
+def _encode_search_cursor(score: float, food_id: ObjectId) -> str:
+    """Encode the last result's sort key as an opaque page cursor"""
+    payload = json.dumps({"score": score, "id": str(food_id)}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+def _decode_search_cursor(cursor: str) -> tuple[float, ObjectId]:
+    """Decode a page cursor, raising 400 for tampered or stale values"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(payload["score"]), ObjectId(payload["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid search cursor")
+
+async def search_foods_text(
+    user_id: str,
+    query: str,
+    meal_type: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = SEARCH_DEFAULT_LIMIT,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Search a user's foods by relevance using the foods text index
+
+    Matches dish names, ingredient names and descriptions, ranked by text
+    score. Pages are keyed on (score, _id) so deep pages cost the same as
+    the first one.
+
+    Args:
+        user_id: The ID of the user
+        query: Search terms
+        meal_type: Optional filter by meal type
+        start_date: Optional start of the eating time range
+        end_date: Optional end of the eating time range
+        limit: Maximum number of results per page
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Scored foods and the cursor for the next page, None on the last page
+    """
+    try:
+        # Validate input parameters
+        if not query or not query.strip():
+            raise HTTPException(status_code=400, detail="Search query cannot be empty")
+        if limit < 1 or limit > SEARCH_MAX_LIMIT:
+            raise HTTPException(status_code=400, detail=f"Limit must be between 1 and {SEARCH_MAX_LIMIT}")
+
+        # $text must lead the pipeline, the remaining filters narrow its matches
+        match = {"$text": {"$search": query}, "user_id": user_id}
+        if meal_type:
+            match["meal_type"] = meal_type
+        if start_date or end_date:
+            date_query = {}
+            if start_date:
+                date_query["$gte"] = start_date
+            if end_date:
+                date_query["$lte"] = end_date
+            match["eating_time"] = date_query
+
+        pipeline = [
+            {"$match": match},
+            {"$addFields": {"score": {"$meta": "textScore"}}}
+        ]
+
+        # Continue after the last result of the previous page
+        if cursor:
+            last_score, last_id = _decode_search_cursor(cursor)
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": last_score}},
+                {"score": last_score, "_id": {"$lt": last_id}}
+            ]}})
+
+        # Fetch one extra result to know whether another page exists
+        pipeline.extend([
+            {"$sort": {"score": -1, "_id": -1}},
+            {"$limit": limit + 1}
+        ])
+
+        foods = await safe_db_operation(
+            foods_collection.aggregate(pipeline).to_list(length=limit + 1)
+        )
+
+        has_more = len(foods) > limit
+        foods = foods[:limit]
+        next_cursor = _encode_search_cursor(foods[-1]["score"], foods[-1]["_id"]) if has_more else None
+
+        # Convert ObjectIds to strings
+        for food in foods:
+            food["id"] = str(food.pop("_id"))
+            for ref in food.get("ingredients") or []:
+                if ref.get("catalog_id"):
+                    ref["catalog_id"] = str(ref["catalog_id"])
+
+        return {"items": foods, "next_cursor": next_cursor}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching foods: {str(e)}")
+
+def _food_summary(food: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the compact list representation of a food"""
+    return {
+        "id": str(food["_id"]),
+        "name": food.get("name"),
+        "meal_type": food.get("meal_type"),
+        "eating_time": food.get("eating_time"),
+        "total_calories": food.get("total_calories", 0),
+        "total_protein": food.get("total_protein", 0),
+        "total_fat": food.get("total_fat", 0),
+        "total_carb": food.get("total_carb", 0),
+        "total_fiber": food.get("total_fiber", 0),
+        "thumbnail_url": food.get("thumbnail_url") or food.get("image_url")
+    }
+
+async def _expand_food_ingredients(foods: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """Expand the ingredients of many foods with one catalogue and one legacy query"""
+    # Catalogue refs of all foods are expanded together, then split back per food
+    refs_by_food = [food.get("ingredients") or [] for food in foods]
+    catalog_refs = [refs if any(ref.get("catalog_id") for ref in refs) else [] for refs in refs_by_food]
+    expanded = await expand_ingredient_refs([ref for refs in catalog_refs for ref in refs])
+    
+    # Legacy foods keep their ingredients in per-food rows
+    legacy_ids = [food["_id"] for food, refs in zip(foods, catalog_refs) if not refs]
+    legacy_rows = await safe_db_operation(
+        ingredients_collection.find({"food_id": {"$in": legacy_ids}}).to_list(length=None)
+    ) if legacy_ids else []
+    rows_by_food: Dict[ObjectId, List[Dict[str, Any]]] = {}
+    for row in legacy_rows:
+        row["id"] = str(row["_id"])
+        rows_by_food.setdefault(row["food_id"], []).append(row)
+    
+    ingredients = []
+    offset = 0
+    for food, refs in zip(foods, catalog_refs):
+        if refs:
+            ingredients.append(expanded[offset:offset + len(refs)])
+            offset += len(refs)
+        else:
+            ingredients.append(rows_by_food.get(food["_id"], []))
+    return ingredients
+
+async def list_food_summaries(expand_ingredients: bool = False, **filters: Any) -> List[Dict[str, Any]]:
+    """
+    List foods in their compact representation
+    
+    Only the fields a list view shows are read; full details come from
+    get_food_with_ingredients.
+    
+    Args:
+        expand_ingredients: Whether to include each food's expanded ingredients
+        filters: Filters, pagination and sorting accepted by search_foods
+    
+    Returns:
+        List[Dict]: Food summaries matching the criteria
+    """
+    projection = dict(FOOD_LIST_PROJECTION)
+    if expand_ingredients:
+        projection["ingredients"] = 1
+    
+    foods = await search_foods(projection=projection, **filters)
+    summaries = [_food_summary(food) for food in foods]
+    
+    if expand_ingredients:
+        for summary, ingredients in zip(summaries, await _expand_food_ingredients(foods)):
+            summary["ingredients"] = ingredients
+    
+    return summaries
+
 async def get_food_with_ingredients(food_id: str) -> Dict:
     """
     Get food with its ingredients
@@ -349,15 +504,19 @@ async def get_food_with_ingredients(food_id: str) -> Dict:
         if not food:
             raise HTTPException(status_code=404, detail="Food not found")
         
-        # Get ingredients
-        ingredients = await safe_db_operation(
-            ingredients_collection.find({"food_id": ObjectId(food_id)}).to_list(length=None)
-        )
+        # Get ingredients from the catalogue, or per-food rows for legacy foods
+        refs = food.get("ingredients") or []
+        if any(ref.get("catalog_id") for ref in refs):
+            ingredients = await expand_ingredient_refs(refs)
+        else:
+            ingredients = await safe_db_operation(
+                ingredients_collection.find({"food_id": ObjectId(food_id)}).to_list(length=None)
+            )
+            for ingredient in ingredients:
+                ingredient["id"] = str(ingredient["_id"])
         
         # Convert ObjectId to string
         food["id"] = str(food["_id"])
-        for ingredient in ingredients:
-            ingredient["id"] = str(ingredient["_id"])
         
         # Add ingredients to food
         food["ingredients"] = ingredients
@@ -393,9 +552,29 @@ async def update_food(food_id: str, food_update: FoodUpdate) -> Dict[str, Any]:
         update_data = food_update.dict(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         
+        # A new photo brings its own renditions
+        if "image_url" in update_data:
+            update_data["thumbnail_url"] = None
+            update_data["medium_image_url"] = None
+            update_data.update(rendition_fields(await find_image_renditions(update_data["image_url"])))
+        
         # Use transaction for atomic operation
         async with await get_db().client.start_session() as session:
             async with session.start_transaction():
+                # Replace ingredients with catalogue refs if provided
+                if update_data.get("ingredients"):
+                    update_data["ingredients"] = await resolve_ingredient_refs(
+                        update_data["ingredients"], session=session
+                    )
+                    
+                    # Drop per-food ingredient rows left by legacy foods
+                    await safe_db_operation(
+                        ingredients_collection.delete_many(
+                            {"food_id": ObjectId(food_id)},
+                            session=session
+                        )
+                    )
+                
                 # Update food
                 await safe_db_operation(
                     foods_collection.update_one(
@@ -405,38 +584,18 @@ async def update_food(food_id: str, food_update: FoodUpdate) -> Dict[str, Any]:
                     )
                 )
                 
-                # Update ingredients if provided
-                if food_update.ingredients:
-                    # Delete existing ingredients
-                    await safe_db_operation(
-                        ingredients_collection.delete_many(
-                            {"food_id": ObjectId(food_id)},
-                            session=session
-                        )
-                    )
-                    
-                    # Insert new ingredients
-                    for ingredient in food_update.ingredients:
-                        ingredient_doc = {
-                            "food_id": ObjectId(food_id),
-                            "name": ingredient.name,
-                            "quantity": ingredient.quantity,
-                            "unit": ingredient.unit,
-                            "protein": ingredient.protein,
-                            "fat": ingredient.fat,
-                            "carb": ingredient.carb,
-                            "fiber": ingredient.fiber,
-                            "calories": ingredient.calories,
-                            "did_you_know": ingredient.did_you_know,
-                            "created_at": datetime.utcnow(),
-                            "updated_at": datetime.utcnow()
-                        }
-                        await safe_db_operation(
-                            ingredients_collection.insert_one(
-                                ingredient_doc,
-                                session=session
-                            )
-                        )
+                # Move the food's ingredients in the weekly usage rollup
+                if "ingredients" in update_data or "eating_time" in update_data:
+                    await remove_food_usage(food, session=session)
+                    await record_food_usage({**food, **update_data}, session=session)
+        
+        # Refresh autocomplete entries for renamed foods or changed ingredients
+        if "name" in update_data or "ingredients" in update_data:
+            index_food(food, -1)
+            index_food({**food, **update_data})
+        
+        # Redo the analysis and the reports of the days the food moved between
+        await queue_food_precompute({**food, **update_data}, food)
         
         # Get updated food
         updated_food = await get_food_with_ingredients(food_id)
@@ -485,11 +644,21 @@ async def delete_food(food_id: str) -> bool:
                         session=session
                     )
                 )
+                
+                # Remove ingredients from the weekly usage rollup
+                await remove_food_usage(food, session=session)
+        
+        # Drop the food's names from autocomplete
+        index_food(food, -1)
+        
+        # Rebuild the report of the day the food was eaten
+        await queue_food_precompute(None, food)
         
-        # Delete associated image if exists
-        if food.get("image_url"):
+        # Delete associated image if exists, never a path outside the uploads directory
+        image_path = resolve_upload_path(food.get("image_url"))
+        if image_path:
             try:
-                os.remove(food["image_url"])
+                os.remove(image_path)
             except OSError:
                 pass  # Ignore if file doesn't exist
         
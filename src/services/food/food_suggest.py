@@ -0,0 +1,227 @@
+import asyncio
+import bisect
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from src.config.constants import SUGGEST_DEFAULT_LIMIT, SUGGEST_INDEX_REFRESH_SECONDS
+from src.config.database import foods_collection, ingredient_catalog_collection
+from src.utils.error_handling import logger
+from src.utils.text_normalization import normalize_name
+
+# Prefix matches inspected per owner before ranking by popularity. Matches are
+# scanned in key order, so for very short prefixes the candidates are the first
+# ones alphabetically, not the most popular; a longer prefix narrows them down.
+MAX_CANDIDATES = 200
+
+class SuggestionIndex:
+    """
+    In-memory sorted-prefix index over normalized food and ingredient names
+
+    Every word start of a name is stored as a key, so "bo" finds "Pho bo" as
+    well as "Bo luc lac". Lookups are a bisect plus a short scan, no database
+    round trip.
+
+    Keys are grouped by owner: food names belong to the user who logged them,
+    while catalogue ingredients are shared, so a lookup only scans the shared
+    names and the caller's own.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str]] = []  # Sorted (owner, word suffix, entry id)
+        self._entries: Dict[str, Dict[str, Any]] = {}  # {entry id: {name, type, count}}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _owner(user_id: Optional[str]) -> str:
+        return user_id or ""
+
+    @staticmethod
+    def _entry_id(owner: str, kind: str, key: str) -> str:
+        return f"{owner}:{kind}:{key}"
+
+    @staticmethod
+    def _suffixes(key: str) -> List[str]:
+        words = key.split(" ")
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def add(self, name: str, kind: str, count: int = 1, user_id: Optional[str] = None) -> None:
+        """
+        Add a name or increase its popularity
+
+        Args:
+            name: Display name
+            kind: Entry type, "food" or "ingredient"
+            count: Number of usages to add
+            user_id: Owner of the name, None for names shared by everyone
+        """
+        for index_key in self._new_keys(name, kind, count, user_id):
+            bisect.insort(self._keys, index_key)
+
+    def add_many(self, names: Iterable[Tuple[str, str, int, Optional[str]]]) -> None:
+        """
+        Add many names, sorting the keys once instead of inserting each
+
+        Args:
+            names: (name, kind, count, user_id) tuples as taken by add
+        """
+        for name, kind, count, user_id in names:
+            self._keys.extend(self._new_keys(name, kind, count, user_id))
+        self._keys.sort()
+
+    def _new_keys(self, name: str, kind: str, count: int, user_id: Optional[str]) -> List[Tuple[str, str, str]]:
+        """Register a name or add to its count, returning the keys a new entry needs"""
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        owner = self._owner(user_id)
+        entry_id = self._entry_id(owner, kind, key)
+        entry = self._entries.get(entry_id)
+        if entry:
+            entry["count"] += count
+            return []
+
+        self._entries[entry_id] = {"name": name, "type": kind, "count": count}
+        return [(owner, suffix, entry_id) for suffix in self._suffixes(key)]
+
+    def remove(self, name: str, kind: str, count: int = 1, user_id: Optional[str] = None) -> None:
+        """
+        Decrease a name's popularity, dropping it when unused
+
+        Args:
+            name: Display name
+            kind: Entry type, "food" or "ingredient"
+            count: Number of usages to remove
+            user_id: Owner of the name, None for names shared by everyone
+        """
+        key = normalize_name(name)
+        owner = self._owner(user_id)
+        entry_id = self._entry_id(owner, kind, key)
+        entry = self._entries.get(entry_id)
+        if not entry:
+            return
+
+        entry["count"] -= count
+        if entry["count"] > 0:
+            return
+
+        del self._entries[entry_id]
+        for suffix in self._suffixes(key):
+            position = bisect.bisect_left(self._keys, (owner, suffix, entry_id))
+            if position < len(self._keys) and self._keys[position] == (owner, suffix, entry_id):
+                self._keys.pop(position)
+
+    def search(
+        self,
+        prefix: str,
+        limit: int = SUGGEST_DEFAULT_LIMIT,
+        kind: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find names with a word starting with the prefix
+
+        Args:
+            prefix: Text typed by the user, accents optional
+            limit: Maximum number of suggestions
+            kind: Optional entry type filter
+            user_id: User whose own names are searched besides the shared ones
+
+        Returns:
+            Suggestions ordered by popularity, among the first MAX_CANDIDATES
+            matches per owner in alphabetical order
+        """
+        key = normalize_name(prefix)
+        if not key:
+            return []
+
+        matches = {}
+        owners = {self._owner(None), self._owner(user_id)}
+        for owner in owners:
+            found = 0
+            position = bisect.bisect_left(self._keys, (owner, key, ""))
+            while position < len(self._keys) and found < MAX_CANDIDATES:
+                key_owner, suffix, entry_id = self._keys[position]
+                if key_owner != owner or not suffix.startswith(key):
+                    break
+                entry = self._entries[entry_id]
+                if kind is None or entry["type"] == kind:
+                    matches[entry_id] = entry
+                    found += 1
+                position += 1
+
+        ranked = sorted(matches.values(), key=lambda entry: (-entry["count"], entry["name"]))
+        return [{"name": entry["name"], "type": entry["type"]} for entry in ranked[:limit]]
+
+    def replace(self, other: "SuggestionIndex") -> None:
+        """Swap in the contents of a freshly built index"""
+        self._keys, self._entries = other._keys, other._entries
+
+# Shared index used by the suggest endpoint
+suggestion_index = SuggestionIndex()
+
+def index_food(food: Dict[str, Any], sign: int = 1) -> None:
+    """
+    Add or remove a food's name and ingredient names from the index
+
+    The food name is only suggested to its owner; ingredient names come from
+    the shared catalogue.
+
+    Args:
+        food: Food document with user_id, name and ingredients
+        sign: 1 to add the food, -1 to remove it
+    """
+    update = suggestion_index.add if sign > 0 else suggestion_index.remove
+    if food.get("name") and food.get("user_id"):
+        update(food["name"], "food", user_id=food["user_id"])
+    for ingredient in food.get("ingredients") or []:
+        if ingredient.get("name"):
+            update(ingredient["name"], "ingredient")
+
+async def load_suggestion_index() -> int:
+    """
+    Build the suggestion index from foods and the ingredient catalogue
+
+    Returns:
+        Number of indexed names
+    """
+    names = []
+
+    # Each user's food names with how often they logged them
+    async for row in foods_collection.aggregate([
+        {"$group": {"_id": {"user_id": "$user_id", "name": "$name"}, "count": {"$sum": 1}}}
+    ]):
+        if row["_id"].get("name") and row["_id"].get("user_id"):
+            names.append((row["_id"]["name"], "food", row["count"], row["_id"]["user_id"]))
+
+    # Catalogue names, counted by how many foods use them
+    usage = {}
+    async for row in foods_collection.aggregate([
+        {"$unwind": "$ingredients"},
+        {"$group": {"_id": "$ingredients.catalog_id", "count": {"$sum": 1}}}
+    ]):
+        usage[row["_id"]] = row["count"]
+    async for entry in ingredient_catalog_collection.find({}, {"name": 1}):
+        names.append((entry["name"], "ingredient", usage.get(entry["_id"], 1), None))
+
+    index = SuggestionIndex()
+    index.add_many(names)
+
+    suggestion_index.replace(index)
+    logger.info(f"Suggestion index loaded with {len(index)} names")
+    return len(index)
+
+async def refresh_suggestion_index(interval_seconds: int = SUGGEST_INDEX_REFRESH_SECONDS) -> None:
+    """
+    Periodically rebuild the index so other workers' writes show up
+
+    Args:
+        interval_seconds: Delay between rebuilds
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await load_suggestion_index()
+        except Exception as e:
+            logger.error(f"Error refreshing suggestion index: {str(e)}")
@@ -0,0 +1,166 @@
+import hashlib
+import io
+import os
+import re
+import uuid
+from typing import Dict, Optional
+
+import PIL.Image
+import PIL.ImageOps
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from src.config.constants import IMAGE_RENDITIONS, IMAGE_WEBP_QUALITY
+from src.utils.error_handling import logger
+
+_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+def image_digest(source_path: str) -> str:
+    """SHA-256 of an image file, the key its renditions are stored under"""
+    digest = hashlib.sha256()
+    with open(source_path, "rb") as source:
+        for chunk in iter(lambda: source.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def rendition_path(digest: str, rendition: str) -> Optional[str]:
+    """
+    Locate a rendition on disk
+
+    Renditions live under IMAGE_STORE_DIR/ab/cd/<digest>/<rendition>.webp, so
+    no directory grows past a few hundred entries.
+
+    Args:
+        digest: Content hash of the source image
+        rendition: Name of the rendition, a key of IMAGE_RENDITIONS
+
+    Returns:
+        File path, or None when the digest or rendition name is invalid
+    """
+    if not _DIGEST_PATTERN.match(digest) or rendition not in IMAGE_RENDITIONS:
+        return None
+    return os.path.join(config.IMAGE_STORE_DIR, digest[:2], digest[2:4], digest, f"{rendition}.webp")
+
+def rendition_url(digest: str, rendition: str) -> str:
+    """Public URL of a rendition, served by the image routes"""
+    return f"/images/{digest}/{rendition}.webp"
+
+def resolve_upload_path(path: Optional[str]) -> Optional[str]:
+    """
+    Resolve a client-supplied image path to a file in the uploads directory
+
+    Image paths come back from clients when a dish is saved, so they are only
+    trusted when they name a regular file directly inside UPLOAD_DIR, after
+    symlinks and ".." are resolved.
+
+    Args:
+        path: Image path as sent by the client
+
+    Returns:
+        Real path of the upload, None for any other path
+    """
+    if not path:
+        return None
+    real_path = os.path.realpath(path)
+    if os.path.dirname(real_path) != os.path.realpath(config.UPLOAD_DIR) or not os.path.isfile(real_path):
+        return None
+    return real_path
+
+def _mark_renditions_used(digest: str) -> None:
+    """Refresh the mtime of a digest's rendition directory, the upload sweep spares recent ones"""
+    os.utime(os.path.dirname(rendition_path(digest, next(iter(IMAGE_RENDITIONS)))))
+
+def _write_renditions(source_path: str) -> Dict[str, str]:
+    """Hash an image and encode any rendition not stored yet, blocking"""
+    digest = image_digest(source_path)
+    missing = [name for name in IMAGE_RENDITIONS if not os.path.exists(rendition_path(digest, name))]
+
+    if missing:
+        with PIL.Image.open(source_path) as image:
+            # Apply the camera orientation before EXIF is dropped by the re-encode
+            image = PIL.ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+            for name in missing:
+                size = IMAGE_RENDITIONS[name]
+                rendition = image.copy()
+                rendition.thumbnail((size, size), PIL.Image.LANCZOS)
+                buffer = io.BytesIO()
+                rendition.save(buffer, "WEBP", quality=IMAGE_WEBP_QUALITY, method=4)
+
+                # Write beside the target and rename, so readers never see a partial file
+                path = rendition_path(digest, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+                with open(temp_path, "wb") as output:
+                    output.write(buffer.getvalue())
+                os.replace(temp_path, path)
+
+    # Renditions reused from an earlier upload must not look abandoned
+    _mark_renditions_used(digest)
+    return {name: rendition_url(digest, name) for name in IMAGE_RENDITIONS}
+
+def _stored_renditions(source_path: str) -> Dict[str, str]:
+    """Hash an upload and list its renditions when all of them are stored, blocking"""
+    digest = image_digest(source_path)
+    if not all(os.path.exists(rendition_path(digest, name)) for name in IMAGE_RENDITIONS):
+        return {}
+    _mark_renditions_used(digest)
+    return {name: rendition_url(digest, name) for name in IMAGE_RENDITIONS}
+
+async def create_image_renditions(source_path: Optional[str]) -> Dict[str, str]:
+    """
+    Make sure the WebP renditions of an uploaded image exist
+
+    Only called for files the upload route just wrote. Hashing and encoding
+    run in the threadpool. Renditions are keyed by the content of the source,
+    so calling this again for the same image only re-hashes it.
+
+    Args:
+        source_path: Path of the uploaded image
+
+    Returns:
+        Dict: Rendition name to URL, empty when the image cannot be read
+    """
+    upload_path = resolve_upload_path(source_path)
+    if not upload_path:
+        return {}
+    try:
+        return await run_in_threadpool(_write_renditions, upload_path)
+    except (OSError, PIL.Image.DecompressionBombError) as e:
+        logger.warning(f"Could not create renditions for {source_path}: {str(e)}")
+        return {}
+
+async def find_image_renditions(image_url: Optional[str]) -> Dict[str, str]:
+    """
+    Look up the renditions made when an image was uploaded
+
+    Used when a dish is saved with a client-supplied image path: nothing is
+    encoded here, the upload is only hashed to find its renditions.
+
+    Args:
+        image_url: Image path sent by the client
+
+    Returns:
+        Dict: Rendition name to URL, empty for paths outside the uploads
+        directory or images without stored renditions
+    """
+    upload_path = resolve_upload_path(image_url)
+    if not upload_path:
+        return {}
+    try:
+        return await run_in_threadpool(_stored_renditions, upload_path)
+    except OSError as e:
+        logger.warning(f"Could not look up renditions for {image_url}: {str(e)}")
+        return {}
+
+def rendition_fields(renditions: Dict[str, str]) -> Dict[str, str]:
+    """Food document fields for a set of renditions"""
+    fields = {}
+    if "thumb" in renditions:
+        fields["thumbnail_url"] = renditions["thumb"]
+    if "medium" in renditions:
+        fields["medium_image_url"] = renditions["medium"]
+    return fields
@@ -0,0 +1,204 @@
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from src.config.database import ingredient_catalog_collection
+from src.utils.db_utils import safe_db_operation
+from src.utils.text_normalization import normalize_name
+
+NUTRIENT_FIELDS = ["protein", "fat", "carb", "fiber", "calories"]
+
+# Units whose nutrition is stored per 100 units, everything else per 1 unit
+PER_100_UNITS = {"g", "ml"}
+
+# Smallest difference between recognized and catalogue-derived values that is not rounding
+NUTRITION_TOLERANCE = 0.05
+
+def get_reference_quantity(unit: str) -> int:
+    """
+    Get the quantity catalogue nutrition values refer to for a unit
+
+    Args:
+        unit: Measurement unit of the ingredient
+
+    Returns:
+        100 for grams and millilitres, 1 for countable units
+    """
+    return 100 if (unit or "g").lower() in PER_100_UNITS else 1
+
+def _catalog_nutrition(ingredient: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """Scale recognized per-portion values to the catalogue reference quantity, None without a portion"""
+    quantity = ingredient.get("quantity", 0) or 0
+    if quantity <= 0:
+        return None
+
+    factor = get_reference_quantity(ingredient.get("unit", "g")) / quantity
+    return {field: round((ingredient.get(field, 0) or 0) * factor, 2) for field in NUTRIENT_FIELDS}
+
+def _matches_catalog(ingredient: Dict[str, Any], entry: Dict[str, Any]) -> bool:
+    """Check whether catalogue nutrition scaled to this portion gives the recognized values"""
+    nutrition = entry.get("nutrition")
+    if not nutrition or entry.get("unit", "g").lower() != (ingredient.get("unit", "g") or "g").lower():
+        return False
+
+    factor = (ingredient.get("quantity", 0) or 0) / entry.get("reference_quantity", 100)
+    for field in NUTRIENT_FIELDS:
+        expected = (nutrition.get(field, 0) or 0) * factor
+        actual = ingredient.get(field, 0) or 0
+        if abs(expected - actual) > max(NUTRITION_TOLERANCE, abs(actual) * 0.01):
+            return False
+    return True
+
+async def resolve_ingredient_refs(
+    ingredients: List[Dict[str, Any]],
+    session=None
+) -> List[Dict[str, Any]]:
+    """
+    Register ingredients in the catalogue and build the refs stored on foods
+
+    Each distinct normalized name is upserted once; existing entries keep
+    their nutrition and fact text. An entry's nutrition comes from the first
+    portion with a quantity, so entries created from zero-quantity rows get
+    their values once a real portion arrives. Refs hold only the quantity and
+    unit, plus the recognized nutrition whenever the catalogue values would
+    not reproduce it.
+
+    Args:
+        ingredients: Recognized ingredients with per-portion nutrition
+        session: Optional Mongo session to join a running transaction
+
+    Returns:
+        Ingredient refs in the same order as the input
+    """
+    if not ingredients:
+        return []
+
+    now = datetime.utcnow()
+    first_by_key = {}
+    nutrition_by_key = {}
+    for ing in ingredients:
+        key = normalize_name(ing.get("name", "Unknown Ingredient")) or "unknown ingredient"
+        first_by_key.setdefault(key, ing)
+        nutrition = _catalog_nutrition(ing)
+        if nutrition and key not in nutrition_by_key:
+            nutrition_by_key[key] = (ing.get("unit", "g"), nutrition)
+
+    operations = []
+    for key, ing in first_by_key.items():
+        unit = ing.get("unit", "g")
+        new_entry = {
+            "normalized_name": key,
+            "name": ing.get("name", "Unknown Ingredient"),
+            "unit": unit,
+            "reference_quantity": get_reference_quantity(unit),
+            "did_you_know": ing.get("did_you_know", ""),
+            "created_at": now
+        }
+        # Values are per reference quantity of their own unit
+        if key in nutrition_by_key and nutrition_by_key[key][0] == unit:
+            new_entry["nutrition"] = nutrition_by_key[key][1]
+        operations.append(UpdateOne({"normalized_name": key}, {"$setOnInsert": new_entry}, upsert=True))
+
+    # Entries without values, or with the zeros older zero-quantity rows seeded,
+    # take them from the first real portion of this batch
+    operations += [
+        UpdateOne(
+            {
+                "normalized_name": key,
+                "unit": unit,
+                "$or": [
+                    {"nutrition": None},
+                    {f"nutrition.{field}": 0 for field in NUTRIENT_FIELDS}
+                ]
+            },
+            {"$set": {"nutrition": nutrition, "updated_at": now}}
+        )
+        for key, (unit, nutrition) in nutrition_by_key.items()
+    ]
+
+    await safe_db_operation(
+        ingredient_catalog_collection.bulk_write(operations, ordered=False, session=session)
+    )
+    entries = await safe_db_operation(
+        ingredient_catalog_collection.find(
+            {"normalized_name": {"$in": list(first_by_key)}},
+            {"normalized_name": 1, "unit": 1, "reference_quantity": 1, "nutrition": 1},
+            session=session
+        ).to_list(length=None)
+    )
+    entries_by_key = {entry["normalized_name"]: entry for entry in entries}
+
+    refs = []
+    for ing in ingredients:
+        name = ing.get("name", "Unknown Ingredient")
+        entry = entries_by_key[normalize_name(name) or "unknown ingredient"]
+        ref = {
+            "catalog_id": entry["_id"],
+            "name": name,
+            "quantity": ing.get("quantity", 0),
+            "unit": ing.get("unit", "g")
+        }
+        # Keep this portion's values when the catalogue cannot reproduce them
+        if not _matches_catalog(ing, entry):
+            ref["nutrition"] = {field: ing.get(field, 0) for field in NUTRIENT_FIELDS}
+        refs.append(ref)
+
+    return refs
+
+async def expand_ingredient_refs(refs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand food ingredient refs with catalogue nutrition and facts
+
+    Args:
+        refs: Ingredient refs stored on a food document
+
+    Returns:
+        Ingredients with per-portion nutrition and did_you_know text
+    """
+    catalog_ids = list({ref["catalog_id"] for ref in refs if ref.get("catalog_id")})
+    entries = await safe_db_operation(
+        ingredient_catalog_collection.find({"_id": {"$in": catalog_ids}}).to_list(length=None)
+    ) if catalog_ids else []
+    entries_by_id = {entry["_id"]: entry for entry in entries}
+
+    expanded = []
+    for ref in refs:
+        entry = entries_by_id.get(ref.get("catalog_id"), {})
+        quantity = ref.get("quantity", 0) or 0
+        ingredient = {
+            "id": str(ref["catalog_id"]) if ref.get("catalog_id") else None,
+            "name": ref.get("name") or entry.get("name", "Unknown Ingredient"),
+            "quantity": quantity,
+            "unit": ref.get("unit") or entry.get("unit", "g"),
+            "did_you_know": entry.get("did_you_know", "")
+        }
+
+        if "nutrition" in ref:
+            ingredient.update(ref["nutrition"])
+        else:
+            factor = quantity / entry.get("reference_quantity", 100)
+            nutrition = entry.get("nutrition", {})
+            for field in NUTRIENT_FIELDS:
+                ingredient[field] = round(nutrition.get(field, 0) * factor, 2)
+
+        expanded.append(ingredient)
+
+    return expanded
+
+async def get_catalog_ingredient(catalog_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a catalogue entry by ID
+
+    Args:
+        catalog_id: Catalogue entry ID
+
+    Returns:
+        Catalogue entry if found, None otherwise
+    """
+    entry = await safe_db_operation(
+        ingredient_catalog_collection.find_one({"_id": ObjectId(catalog_id)})
+    )
+    if entry:
+        entry["id"] = str(entry.pop("_id"))
+    return entry
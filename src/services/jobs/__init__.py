@@ -0,0 +1,32 @@
+from src.services.jobs.scheduler import (
+    JobContext,
+    JobLockLost,
+    Job,
+    JOBS,
+    register_job,
+    run_job,
+    run_job_scheduler
+)
+from src.services.jobs.task_queue import register_task, enqueue_task, run_task_workers
+from src.services.jobs.target_refresh_job import TARGET_REFRESH_JOB, refresh_age_dependent_targets
+from src.services.jobs.upload_sweep_job import UPLOAD_SWEEP_JOB, sweep_orphaned_uploads
+from src.services.jobs.target_recompute_job import TARGET_RECOMPUTE_JOB, recompute_nutrition_targets
+
+__all__ = [
+    "JobContext",
+    "JobLockLost",
+    "Job",
+    "JOBS",
+    "register_job",
+    "run_job",
+    "run_job_scheduler",
+    "register_task",
+    "enqueue_task",
+    "run_task_workers",
+    "TARGET_REFRESH_JOB",
+    "refresh_age_dependent_targets",
+    "UPLOAD_SWEEP_JOB",
+    "sweep_orphaned_uploads",
+    "TARGET_RECOMPUTE_JOB",
+    "recompute_nutrition_targets"
+]
@@ -0,0 +1,194 @@
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, Awaitable, Callable, Optional
+from zoneinfo import ZoneInfo
+from pymongo import ReturnDocument
+
+import config
+from src.config.database import jobs_collection
+from src.config.constants import (
+    JOB_TICK_SECONDS,
+    JOB_LOCK_TTL_SECONDS,
+    JOB_RETRY_DELAY_SECONDS
+)
+from src.utils.error_handling import logger
+from src.utils.leader_lock import INSTANCE_ID, acquire_lock, release_lock
+
+class JobLockLost(Exception):
+    """Raised at a checkpoint when the job's lock expired and another run took it"""
+
+class JobContext:
+    """
+    Handle passed to a running job for checkpoints and pacing
+
+    The resume cursor survives restarts: a job that stops early or fails
+    starts from its last checkpoint on the next run.
+    """
+
+    def __init__(self, name: str, state: Dict[str, Any], deadline: Optional[datetime], lock_owner: str = INSTANCE_ID):
+        self.name = name
+        self.lock_owner = lock_owner
+        self.cursor = state.get("cursor")
+        self.stats: Dict[str, int] = dict(state.get("stats") or {})
+        self.deadline = deadline
+
+    async def checkpoint(self, cursor: Any, **counts: int) -> None:
+        """
+        Renew the job's lock and persist progress
+
+        Args:
+            cursor: Position to resume from
+            counts: Counters to add to the run statistics
+
+        Raises:
+            JobLockLost: If another run holds the lock now; the job must stop
+                without writing anything else
+        """
+        if not await acquire_lock(f"job:{self.name}", JOB_LOCK_TTL_SECONDS, owner=self.lock_owner):
+            raise JobLockLost(f"Job {self.name} lost its lock")
+
+        self.cursor = cursor
+        for key, value in counts.items():
+            self.stats[key] = self.stats.get(key, 0) + value
+
+        await jobs_collection.update_one(
+            {"_id": self.name},
+            {"$set": {"cursor": cursor, "stats": self.stats, "heartbeat_at": datetime.utcnow()}}
+        )
+
+    def out_of_time(self) -> bool:
+        """Check whether the job's window closed and it should stop for now"""
+        return self.deadline is not None and datetime.utcnow() >= self.deadline
+
+@dataclass
+class Job:
+    """A registered background job"""
+    name: str
+    run: Callable[[JobContext], Awaitable[bool]]  # Returns True when finished, False when paused
+    hour: Optional[int]  # Local hour the run window opens, None for jobs only started by hand
+    window_hours: Optional[int]  # Hours the job may run before pausing until the next window
+
+    def next_window(self, after: datetime) -> Optional[datetime]:
+        """Get the UTC start of the first window opening after a moment, None without a schedule"""
+        if self.hour is None:
+            return None
+        timezone = ZoneInfo(config.JOB_TIMEZONE)
+        local = after.replace(tzinfo=ZoneInfo("UTC")).astimezone(timezone)
+        start = local.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        if start <= local:
+            start += timedelta(days=1)
+        return start.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+
+    def window_end(self, now: datetime) -> Optional[datetime]:
+        """Get the UTC end of the window containing now, None when outside every window"""
+        if self.hour is None:
+            return None
+        window_start = self.next_window(now) - timedelta(days=1)
+        window_end = window_start + timedelta(hours=self.window_hours)
+        return window_end if window_start <= now < window_end else None
+
+# Registered jobs by name
+JOBS: Dict[str, Job] = {}
+
+def register_job(
+    name: str,
+    run: Callable[[JobContext], Awaitable[bool]],
+    hour: Optional[int] = None,
+    window_hours: Optional[int] = None
+) -> None:
+    """
+    Register a job to run daily in a window starting at a local hour
+
+    Jobs registered without an hour are never started by the scheduler,
+    only through run_job, e.g. from the admin routes.
+
+    Args:
+        name: Unique job name, also the key of its persisted state
+        run: Coroutine function doing the work, returning False when paused
+        hour: Local hour the window opens, in JOB_TIMEZONE
+        window_hours: Length of the window
+    """
+    JOBS[name] = Job(name=name, run=run, hour=hour, window_hours=window_hours)
+
+async def run_job(job: Job, deadline: Optional[datetime] = None) -> None:
+    """
+    Run one job under its lock and persist the outcome
+
+    Args:
+        job: Registered job
+        deadline: Optional UTC time after which the job should pause
+    """
+    # Owned per run, so a second run in the same process is refused too
+    lock_name = f"job:{job.name}"
+    lock_owner = f"{INSTANCE_ID}:{uuid.uuid4().hex[:8]}"
+    if not await acquire_lock(lock_name, JOB_LOCK_TTL_SECONDS, owner=lock_owner):
+        return
+
+    now = datetime.utcnow()
+    state = await jobs_collection.find_one_and_update(
+        {"_id": job.name},
+        {"$set": {"status": "running", "started_at": now, "error": None}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    context = JobContext(job.name, state, deadline, lock_owner)
+
+    try:
+        finished = await job.run(context)
+        if finished:
+            # Start from scratch in the next window
+            update = {
+                "status": "finished",
+                "cursor": None,
+                "stats": {},
+                "last_stats": context.stats,
+                "finished_at": datetime.utcnow(),
+                "next_run_at": job.next_window(datetime.utcnow())
+            }
+        else:
+            # Keep the cursor and continue in the next window
+            update = {"status": "paused", "next_run_at": job.next_window(datetime.utcnow())}
+        logger.info(f"Job {job.name} {update['status']}: {context.stats}")
+    except JobLockLost:
+        # The run holding the lock now owns the job's state
+        logger.warning(f"Job {job.name} stopped after losing its lock: {context.stats}")
+        return
+    except Exception as e:
+        logger.error(f"Job {job.name} failed: {str(e)}")
+        update = {
+            "status": "failed",
+            "error": str(e),
+            "next_run_at": datetime.utcnow() + timedelta(seconds=JOB_RETRY_DELAY_SECONDS)
+        }
+
+    # Record the outcome before another worker can take the lock
+    try:
+        await jobs_collection.update_one({"_id": job.name}, {"$set": update})
+    finally:
+        await release_lock(lock_name, owner=lock_owner)
+
+async def run_job_scheduler() -> None:
+    """
+    Start due jobs while they are inside their run window
+
+    Runs in every worker; the per-job lock lets only one of them execute a
+    given job at a time.
+    """
+    while True:
+        for job in JOBS.values():
+            try:
+                now = datetime.utcnow()
+                deadline = job.window_end(now)
+                if deadline is None:
+                    continue
+
+                state = await jobs_collection.find_one({"_id": job.name}, {"next_run_at": 1}) or {}
+                next_run_at = state.get("next_run_at")
+                if next_run_at is None or next_run_at <= now:
+                    await run_job(job, deadline)
+            except Exception as e:
+                logger.error(f"Error scheduling job {job.name}: {str(e)}")
+
+        await asyncio.sleep(JOB_TICK_SECONDS)
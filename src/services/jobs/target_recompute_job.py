@@ -0,0 +1,44 @@
+import asyncio
+
+from src.config.database import profiles_collection
+from src.config.constants import TARGET_RECOMPUTE_BATCH_SIZE
+from src.services.jobs.scheduler import JobContext
+from src.services.nutrition.nutrition_calculator import write_targets_for_profiles
+
+TARGET_RECOMPUTE_JOB = "recompute_nutrition_targets"
+
+# Profile fields the targets depend on
+PROFILE_FIELDS = ["user_id", "gender", "birthdate", "height", "weight", "activity_level", "goal", "diet_type"]
+
+async def recompute_nutrition_targets(context: JobContext) -> bool:
+    """
+    Recompute every user's nutrition target, e.g. after a formula change
+
+    Only started by hand from the admin routes. Profiles are streamed in _id
+    order, derived synchronously from the lookup tables and written with one
+    bulk_write per batch; a run that fails resumes after the last batch.
+
+    Args:
+        context: Job context holding the resume cursor
+
+    Returns:
+        True once every profile was processed
+    """
+    while not context.out_of_time():
+        query = {"weight": {"$gt": 0}, "height": {"$gt": 0}, "birthdate": {"$ne": None}}
+        if context.cursor:
+            query["_id"] = {"$gt": context.cursor}
+
+        profiles = await profiles_collection.find(
+            query, {field: 1 for field in PROFILE_FIELDS}
+        ).sort("_id", 1).limit(TARGET_RECOMPUTE_BATCH_SIZE).to_list(length=TARGET_RECOMPUTE_BATCH_SIZE)
+        if not profiles:
+            return True
+
+        updated = await write_targets_for_profiles(profiles)
+        await context.checkpoint(profiles[-1]["_id"], scanned=len(profiles), updated=updated)
+
+        # Let request handlers run between batches
+        await asyncio.sleep(0)
+
+    return False
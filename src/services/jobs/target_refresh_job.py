@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from pymongo import UpdateOne
+
+import config
+
+from src.config.database import profiles_collection, daily_reports_collection
+from src.config.constants import TARGET_REFRESH_BATCH_SIZE, TARGET_REFRESH_PAUSE_SECONDS
+from src.services.jobs.scheduler import JobContext
+from src.services.nutrition.nutrition_calculator import write_targets_for_profiles
+from src.services.nutrition.target_tables import get_age
+
+TARGET_REFRESH_JOB = "refresh_age_dependent_targets"
+
+# Profile fields read by the job
+PROFILE_FIELDS = ["user_id", "age", "gender", "birthdate", "height", "weight", "activity_level", "goal", "diet_type"]
+
+async def refresh_age_dependent_targets(context: JobContext) -> bool:
+    """
+    Recompute targets for users whose age changed since it was stored
+
+    BMR and the fiber band depend on age, which is stored when the birthdate
+    is set. Profiles are streamed in _id order; every batch of users who had
+    a birthday gets a new age and target in bulk, and their daily reports
+    from today on are dropped so they are rebuilt against the new target.
+
+    Args:
+        context: Job context holding the resume cursor
+
+    Returns:
+        True when all profiles were checked, False when the window closed first
+    """
+    # Birthdays turn over at midnight where the job's window is scheduled
+    today = datetime.now(ZoneInfo(config.JOB_TIMEZONE)).date()
+
+    while not context.out_of_time():
+        # Continue after the last profile checked
+        query = {"birthdate": {"$ne": None}}
+        if context.cursor:
+            query["_id"] = {"$gt": context.cursor}
+
+        profiles = await profiles_collection.find(
+            query, {field: 1 for field in PROFILE_FIELDS}
+        ).sort("_id", 1).limit(TARGET_REFRESH_BATCH_SIZE).to_list(length=TARGET_REFRESH_BATCH_SIZE)
+        if not profiles:
+            return True
+
+        # Users who had a birthday since their age was stored
+        aged = []
+        for profile in profiles:
+            age = get_age(profile["birthdate"], today)
+            if age != profile.get("age"):
+                profile["age"] = age
+                aged.append(profile)
+
+        if aged:
+            await profiles_collection.bulk_write([
+                UpdateOne({"_id": profile["_id"]}, {"$set": {"age": profile["age"], "updated_at": datetime.utcnow()}})
+                for profile in aged
+            ], ordered=False)
+            await write_targets_for_profiles(aged, today)
+
+            # Reports from today on compare against the old target
+            await daily_reports_collection.delete_many({
+                "user_id": {"$in": [profile["user_id"] for profile in aged]},
+                "date": {"$gte": today.isoformat()}
+            })
+
+        await context.checkpoint(profiles[-1]["_id"], scanned=len(profiles), updated=len(aged))
+
+        # Pace the job so it stays in the background
+        await asyncio.sleep(TARGET_REFRESH_PAUSE_SECONDS)
+
+    return False
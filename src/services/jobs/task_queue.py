@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Any, Awaitable, Callable, Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.config.database import task_queue_collection
+from src.config.constants import (
+    TASK_LEASE_SECONDS,
+    TASK_LEASE_RENEW_SECONDS,
+    TASK_MAX_ATTEMPTS,
+    TASK_RETRY_BASE_SECONDS,
+    TASK_POLL_SECONDS,
+    TASK_FAILED_RETENTION_DAYS
+)
+from src.utils.error_handling import logger
+
+# Task handlers by kind
+TASK_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {}
+
+# Wakes idle workers in this process when a task is enqueued
+_task_ready = asyncio.Event()
+
+def register_task(kind: str, handler: Callable[[Dict[str, Any]], Awaitable[None]]) -> None:
+    """
+    Register the coroutine that processes tasks of a kind
+
+    Args:
+        kind: Task kind stored with every queued task
+        handler: Coroutine function called with the task payload
+    """
+    TASK_HANDLERS[kind] = handler
+
+async def enqueue_task(kind: str, payload: Dict[str, Any], dedupe_key: Optional[str] = None) -> None:
+    """
+    Queue a task for the background workers
+
+    Tasks are stored in MongoDB, so they survive restarts and are picked up
+    by any worker process. A task with a dedupe key is skipped while another
+    task with the same key is still waiting.
+
+    Args:
+        kind: Registered task kind
+        payload: Arguments for the handler, must be BSON serializable
+        dedupe_key: Optional key collapsing repeated requests for the same work
+    """
+    now = datetime.utcnow()
+    task = {
+        "kind": kind,
+        "payload": payload,
+        "status": "pending",
+        "attempts": 0,
+        "available_at": now,
+        "created_at": now
+    }
+
+    if dedupe_key:
+        # Insert only when no task with this key is waiting
+        task["dedupe_key"] = dedupe_key
+        try:
+            await task_queue_collection.update_one(
+                {"dedupe_key": dedupe_key, "status": "pending"},
+                {"$setOnInsert": task},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # A concurrent request queued the same work
+    else:
+        await task_queue_collection.insert_one(task)
+
+    _task_ready.set()
+
+async def _claim_task() -> Optional[Dict[str, Any]]:
+    """Take the oldest available task, or one whose worker stopped renewing its lease"""
+    now = datetime.utcnow()
+    return await task_queue_collection.find_one_and_update(
+        {"$or": [
+            {"status": "pending", "available_at": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lte": now}}
+        ]},
+        {
+            "$set": {"status": "running", "locked_until": now + timedelta(seconds=TASK_LEASE_SECONDS)},
+            "$inc": {"attempts": 1}
+        },
+        sort=[("available_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+def _lease_filter(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Match a task only while this claim still holds it, every claim bumps attempts"""
+    return {"_id": task["_id"], "status": "running", "attempts": task["attempts"]}
+
+async def _renew_lease(task: Dict[str, Any]) -> None:
+    """Extend a running task's lease until cancelled, so it is not claimed twice"""
+    while True:
+        await asyncio.sleep(TASK_LEASE_RENEW_SECONDS)
+        try:
+            result = await task_queue_collection.update_one(
+                _lease_filter(task),
+                {"$set": {"locked_until": datetime.utcnow() + timedelta(seconds=TASK_LEASE_SECONDS)}}
+            )
+        except Exception as e:
+            logger.warning(f"Could not renew the lease of task {task['_id']}: {str(e)}")
+            continue
+        if not result.matched_count:
+            logger.warning(f"Task {task['kind']} {task['_id']} lost its lease")
+            return
+
+async def _run_task(task: Dict[str, Any]) -> None:
+    """Run a claimed task and record its outcome, unless another worker reclaimed it meanwhile"""
+    heartbeat = asyncio.create_task(_renew_lease(task))
+    try:
+        handler = TASK_HANDLERS.get(task["kind"])
+        if handler is None:
+            raise ValueError(f"No handler registered for task kind {task['kind']}")
+        await handler(task["payload"])
+        error = None
+    except Exception as e:
+        logger.error(f"Task {task['kind']} {task['_id']} failed: {str(e)}")
+        error = str(e)
+    finally:
+        heartbeat.cancel()
+
+    if error is None:
+        # Finished tasks are removed
+        await task_queue_collection.delete_one(_lease_filter(task))
+        return
+
+    now = datetime.utcnow()
+    if task["attempts"] >= TASK_MAX_ATTEMPTS:
+        # Give up, keep the task for a while to inspect
+        update = {
+            "status": "failed",
+            "error": error,
+            "expires_at": now + timedelta(days=TASK_FAILED_RETENTION_DAYS)
+        }
+    else:
+        # Retry with exponential backoff
+        update = {
+            "status": "pending",
+            "error": error,
+            "available_at": now + timedelta(seconds=TASK_RETRY_BASE_SECONDS * 2 ** (task["attempts"] - 1))
+        }
+
+    try:
+        await task_queue_collection.update_one(_lease_filter(task), {"$set": update})
+    except DuplicateKeyError:
+        # The same work was queued again meanwhile, that task replaces the retry
+        await task_queue_collection.delete_one(_lease_filter(task))
+
+async def _task_worker() -> None:
+    """Process tasks one at a time until cancelled"""
+    while True:
+        try:
+            # Clear before claiming so an enqueue during the claim is not missed
+            _task_ready.clear()
+            task = await _claim_task()
+            if task:
+                await _run_task(task)
+                continue
+        except Exception as e:
+            logger.error(f"Error in task worker: {str(e)}")
+
+        # Sleep until a local enqueue, or poll for tasks from other processes
+        try:
+            await asyncio.wait_for(_task_ready.wait(), timeout=TASK_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+async def run_task_workers(concurrency: int) -> None:
+    """
+    Run a pool of queue workers in this process
+
+    Args:
+        concurrency: Number of tasks processed at the same time
+    """
+    await asyncio.gather(*(_task_worker() for _ in range(concurrency)))
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import shutil
+import time
+from typing import Awaitable, Callable, Iterator, List, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+import config
+from src.config.database import foods_collection
+from src.config.constants import (
+    UPLOAD_SWEEP_GRACE_HOURS,
+    UPLOAD_SWEEP_BATCH_SIZE,
+    UPLOAD_SWEEP_PAUSE_SECONDS
+)
+from src.services.jobs.scheduler import JobContext
+from src.services.food.image_store import rendition_url
+
+UPLOAD_SWEEP_JOB = "sweep_orphaned_uploads"
+
+# (path, size in bytes) of a file or rendition directory on disk
+Candidate = Tuple[str, int]
+
+def _old_uploads(directory: str, cutoff: float) -> Iterator[Candidate]:
+    """Stream files in the uploads directory last modified before the cutoff"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime < cutoff:
+                    yield entry.path, stat.st_size
+
+def _subdirectories(directory: str) -> Iterator[os.DirEntry]:
+    """Stream the subdirectories of a directory"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield entry
+
+def _old_renditions(directory: str, cutoff: float) -> Iterator[Candidate]:
+    """Stream rendition directories (ab/cd/<digest>) last modified before the cutoff"""
+    for first in _subdirectories(directory):
+        for second in _subdirectories(first.path):
+            for entry in _subdirectories(second.path):
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    with os.scandir(entry.path) as files:
+                        size = sum(f.stat().st_size for f in files if f.is_file())
+                    yield entry.path, size
+
+def _next_batch(candidates: Iterator[Candidate]) -> List[Candidate]:
+    """Pull the next batch of candidates from a directory stream, blocking"""
+    batch = []
+    for candidate in candidates:
+        batch.append(candidate)
+        if len(batch) >= UPLOAD_SWEEP_BATCH_SIZE:
+            break
+    return batch
+
+def _remove_paths(paths: List[str]) -> int:
+    """Delete files and rendition directories, returning how many were removed"""
+    removed = 0
+    for path in paths:
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+def _upload_directory_spellings() -> Set[str]:
+    """Ways a food may have stored the uploads directory, e.g. relative, "./" or absolute"""
+    directory = os.path.normpath(config.UPLOAD_DIR)
+    return {
+        config.UPLOAD_DIR,
+        directory,
+        os.path.join(".", directory),
+        os.path.abspath(directory),
+        os.path.realpath(directory)
+    }
+
+async def _referenced_uploads(paths: List[str]) -> Set[str]:
+    """Paths of a batch that some food still uses as its image"""
+    # Upload file names are unique, so a batch is matched by name within UPLOAD_DIR
+    names = {os.path.basename(path) for path in paths}
+    spellings = [
+        os.path.join(directory, name)
+        for directory in _upload_directory_spellings()
+        for name in names
+    ]
+    foods = await foods_collection.find(
+        {"image_url": {"$in": spellings}}, {"image_url": 1}
+    ).to_list(length=None)
+
+    used = {os.path.basename(food["image_url"]) for food in foods}
+    return {path for path in paths if os.path.basename(path) in used}
+
+async def _referenced_renditions(paths: List[str]) -> Set[str]:
+    """Rendition directories of a batch that some food still shows"""
+    urls = {rendition_url(os.path.basename(path), "thumb"): path for path in paths}
+    foods = await foods_collection.find(
+        {"thumbnail_url": {"$in": list(urls)}}, {"thumbnail_url": 1}
+    ).to_list(length=None)
+    return {urls[food["thumbnail_url"]] for food in foods}
+
+async def _sweep(
+    context: JobContext,
+    directory: str,
+    stream: Callable[[str, float], Iterator[Candidate]],
+    referenced: Callable[[List[str]], Awaitable[Set[str]]],
+    kind: str
+) -> bool:
+    """Delete unreferenced candidates batch by batch, False when the window closed"""
+    # The directory is read lazily, one batch at a time in the threadpool
+    candidates = stream(directory, time.time() - UPLOAD_SWEEP_GRACE_HOURS * 3600)
+
+    try:
+        while not context.out_of_time():
+            batch = await run_in_threadpool(_next_batch, candidates)
+            if not batch:
+                return True
+
+            kept = await referenced([path for path, _ in batch])
+            orphans = [(path, size) for path, size in batch if path not in kept]
+            removed = await run_in_threadpool(_remove_paths, [path for path, _ in orphans])
+
+            await context.checkpoint(
+                None,
+                **{
+                    f"{kind}_scanned": len(batch),
+                    f"{kind}_deleted": removed,
+                    f"{kind}_bytes_freed": sum(size for _, size in orphans)
+                }
+            )
+
+            # Pace the job so it stays in the background
+            await asyncio.sleep(UPLOAD_SWEEP_PAUSE_SECONDS)
+    finally:
+        # Release the open directory handles when the window closes mid-scan
+        candidates.close()
+
+    return False
+
+async def sweep_orphaned_uploads(context: JobContext) -> bool:
+    """
+    Delete uploaded photos and renditions no food refers to
+
+    Detection-only uploads and abandoned recognitions leave files behind that
+    delete_food never sees. Both directories are streamed with os.scandir
+    and reconciled against foods in batches; anything newer than the grace
+    period is skipped, since its dish may not be saved yet. Scanned, deleted
+    and freed-byte counts are kept in the job's stats.
+
+    Args:
+        context: Job context for pacing and statistics
+
+    Returns:
+        True when both directories were swept, False when the window closed first
+    """
+    sweeps = [
+        (config.UPLOAD_DIR, _old_uploads, _referenced_uploads, "uploads"),
+        (config.IMAGE_STORE_DIR, _old_renditions, _referenced_renditions, "renditions")
+    ]
+    for directory, stream, referenced, kind in sweeps:
+        if not os.path.isdir(directory):
+            continue
+        if not await _sweep(context, directory, stream, referenced, kind):
+            return False
+    return True
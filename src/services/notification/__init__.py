@@ -0,0 +1,35 @@
+from src.services.notification.reminder_scheduler import (
+    build_meal_reminder,
+    dispatch_due_reminders,
+    run_reminder_scheduler
+)
+from src.services.notification.notification_service import insert_notification
+from src.services.notification.notification_stream import (
+    notification_broker,
+    publish_notification,
+    run_change_stream_feed,
+    stream_notifications
+)
+from src.services.notification.unread_counter import (
+    get_unread_count,
+    increment_unread,
+    increment_unread_many,
+    decrement_unread,
+    recount_unread
+)
+
+__all__ = [
+    "build_meal_reminder",
+    "dispatch_due_reminders",
+    "run_reminder_scheduler",
+    "insert_notification",
+    "notification_broker",
+    "publish_notification",
+    "run_change_stream_feed",
+    "stream_notifications",
+    "get_unread_count",
+    "increment_unread",
+    "increment_unread_many",
+    "decrement_unread",
+    "recount_unread"
+]
@@ -0,0 +1,26 @@
+from typing import Dict, Any
+
+from src.config.database import notifications_collection
+from src.services.notification.unread_counter import increment_unread
+from src.services.notification.notification_stream import publish_notification
+
+async def insert_notification(notification: Dict[str, Any]) -> str:
+    """
+    Save a notification, count it towards the user's unread badge and push it
+
+    Args:
+        notification: Notification document with user_id and is_read
+
+    Returns:
+        ID of the inserted notification
+    """
+    result = await notifications_collection.insert_one(notification)
+
+    # Keep the unread counter in step with the new notification
+    if not notification.get("is_read"):
+        await increment_unread(notification["user_id"])
+    
+    # Push to the user's open streams
+    publish_notification(notification)
+
+    return str(result.inserted_id)
@@ -0,0 +1,183 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, Optional, Set
+from bson import ObjectId
+
+import config
+from src.config.database import notifications_collection
+from src.config.constants import (
+    STREAM_QUEUE_SIZE,
+    STREAM_HEARTBEAT_SECONDS,
+    STREAM_REPLAY_LIMIT,
+    STREAM_RETRY_MILLISECONDS
+)
+from src.utils.error_handling import logger
+
+def _serialize_notification(notification: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a notification document into JSON-safe event data"""
+    data = {key: value for key, value in notification.items() if key != "_id"}
+    data["id"] = str(notification["_id"])
+    if isinstance(data.get("created_at"), datetime):
+        data["created_at"] = data["created_at"].isoformat()
+    return data
+
+class NotificationBroker:
+    """
+    In-process pub/sub that fans notifications out to connected streams
+
+    Every subscriber gets a bounded queue. A subscriber that falls
+    STREAM_QUEUE_SIZE events behind is told to resync instead of letting its
+    queue grow, which keeps a slow client from holding memory.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """
+        Register a stream for a user's notifications
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Queue receiving the user's events
+        """
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        """
+        Remove a stream when its client disconnects
+
+        Args:
+            user_id: The ID of the user
+            queue: Queue returned by subscribe
+        """
+        queues = self._subscribers.get(user_id)
+        if queues:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def deliver(self, notification: Dict[str, Any]) -> None:
+        """
+        Hand a stored notification to the user's connected streams
+
+        Args:
+            notification: Notification document including _id
+        """
+        queues = self._subscribers.get(notification.get("user_id"))
+        if not queues:
+            return
+
+        event = _serialize_notification(notification)
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind, drop the backlog and let the client refetch
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"resync": True})
+
+# Shared broker for this process
+notification_broker = NotificationBroker()
+
+def publish_notification(notification: Dict[str, Any]) -> None:
+    """
+    Publish a newly stored notification to connected streams
+
+    With change streams enabled the feed publishes every insert for all
+    workers, so local publishing is skipped to avoid duplicates.
+
+    Args:
+        notification: Notification document including _id
+    """
+    if not config.NOTIFICATION_CHANGE_STREAMS:
+        notification_broker.deliver(notification)
+
+async def run_change_stream_feed() -> None:
+    """
+    Publish notifications inserted by any worker using a Mongo change stream
+
+    Requires a replica set. The stream's resume token is kept so that a
+    dropped connection continues where it stopped.
+    """
+    resume_token = None
+    pipeline = [{"$match": {"operationType": "insert"}}]
+
+    while True:
+        try:
+            async with notifications_collection.watch(pipeline, resume_after=resume_token) as stream:
+                async for change in stream:
+                    notification_broker.deliver(change["fullDocument"])
+                    resume_token = stream.resume_token
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Notification change stream interrupted: {str(e)}")
+            await asyncio.sleep(STREAM_RETRY_MILLISECONDS / 1000)
+
+def _format_event(event: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    if event.get("resync"):
+        return "event: resync\ndata: {}\n\n"
+    return f"id: {event['id']}\nevent: notification\ndata: {json.dumps(event)}\n\n"
+
+async def stream_notifications(
+    user_id: str,
+    last_event_id: Optional[str] = None,
+    is_disconnected=None
+) -> AsyncIterator[str]:
+    """
+    Yield a user's notifications as server-sent events
+
+    Notification IDs are the event IDs, so a client reconnecting with
+    Last-Event-ID first receives what it missed, read from the collection.
+
+    Args:
+        user_id: The ID of the user
+        last_event_id: ID of the last notification the client received
+        is_disconnected: Optional coroutine function reporting a closed client
+
+    Yields:
+        Server-sent event text, with a comment line as heartbeat when idle
+    """
+    # Subscribe before replaying so nothing slips between the two
+    queue = notification_broker.subscribe(user_id)
+    try:
+        yield f"retry: {STREAM_RETRY_MILLISECONDS}\n\n"
+
+        # Replay notifications created since the client's last event
+        last_id = None
+        if last_event_id and ObjectId.is_valid(last_event_id):
+            last_id = ObjectId(last_event_id)
+            missed = await notifications_collection.find(
+                {"user_id": user_id, "_id": {"$gt": last_id}}
+            ).sort("_id", 1).limit(STREAM_REPLAY_LIMIT + 1).to_list(length=STREAM_REPLAY_LIMIT + 1)
+
+            if len(missed) > STREAM_REPLAY_LIMIT:
+                yield _format_event({"resync": True})
+            else:
+                for notification in missed:
+                    yield _format_event(_serialize_notification(notification))
+                    last_id = notification["_id"]
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if is_disconnected and await is_disconnected():
+                    break
+                yield ": heartbeat\n\n"
+                continue
+
+            # Skip events already sent during the replay
+            if last_id and not event.get("resync") and ObjectId(event["id"]) <= last_id:
+                continue
+            yield _format_event(event)
+    finally:
+        notification_broker.unsubscribe(user_id, queue)
@@ -0,0 +1,150 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from zoneinfo import ZoneInfo
+from pymongo.errors import BulkWriteError
+
+import config
+from src.config.database import notifications_collection, notification_settings_collection
+from src.config.constants import (
+    MEAL_REMINDER_TYPES,
+    REMINDER_BATCH_SIZE,
+    REMINDER_TICK_SECONDS,
+    REMINDER_MAX_CATCHUP_MINUTES,
+    REMINDER_LOCK_NAME,
+    REMINDER_LOCK_TTL_SECONDS
+)
+from src.utils.error_handling import logger
+from src.utils.leader_lock import acquire_lock, release_lock
+from src.services.notification.unread_counter import increment_unread_many
+from src.services.notification.notification_stream import publish_notification
+
+# Mongo error code for duplicate keys, raised when a reminder was already sent
+DUPLICATE_KEY_ERROR = 11000
+
+def build_meal_reminder(user_id: str, meal_type: str, reminder_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build a meal reminder notification document
+
+    Args:
+        user_id: The ID of the user
+        meal_type: Meal to remind about, e.g. "lunch"
+        reminder_key: Optional key that makes scheduled reminders unique per user
+
+    Returns:
+        Notification document ready to insert
+    """
+    data = {"meal_type": meal_type}
+    if reminder_key:
+        data["reminder_key"] = reminder_key
+
+    return {
+        "user_id": user_id,
+        "title": f"Time for {meal_type}!",
+        "message": f"Don't forget to log your {meal_type} for today.",
+        "type": "meal_reminder",
+        "is_read": False,
+        "data": data,
+        "created_at": datetime.utcnow()
+    }
+
+async def _insert_reminders(reminders: List[Dict[str, Any]]) -> int:
+    """
+    Insert a batch of reminders, skipping ones already sent
+
+    Args:
+        reminders: Notification documents
+
+    Returns:
+        Number of reminders inserted
+    """
+    failed = set()
+    try:
+        await notifications_collection.insert_many(reminders, ordered=False)
+    except BulkWriteError as e:
+        # Duplicates mean another run already covered these users
+        failed = {error["index"] for error in e.details["writeErrors"]}
+        errors = [error for error in e.details["writeErrors"] if error["code"] != DUPLICATE_KEY_ERROR]
+        if errors:
+            logger.error(f"Error inserting meal reminders: {errors[0]['errmsg']}")
+
+    # Count the reminders that were actually written towards unread badges and push them
+    inserted = [reminder for index, reminder in enumerate(reminders) if index not in failed]
+    await increment_unread_many(reminder["user_id"] for reminder in inserted)
+    for reminder in inserted:
+        publish_notification(reminder)
+    return len(inserted)
+
+async def dispatch_due_reminders(slot: datetime) -> int:
+    """
+    Send meal reminders to every user whose reminder time matches a slot
+
+    Users are read through the reminder_times index and reminders are
+    written with insert_many in bounded batches.
+
+    Args:
+        slot: Local wall-clock minute being processed
+
+    Returns:
+        Number of reminders created
+    """
+    slot_time = slot.strftime("%H:%M")
+    sent = 0
+
+    for meal_type in MEAL_REMINDER_TYPES:
+        reminder_key = f"{meal_type}:{slot.date().isoformat()}"
+        query = {f"reminder_times.{meal_type}": slot_time, "meal_reminders": {"$ne": False}}
+        cursor = notification_settings_collection.find(
+            query, {"_id": 0, "user_id": 1}
+        ).batch_size(REMINDER_BATCH_SIZE)
+
+        batch = []
+        async for settings in cursor:
+            batch.append(build_meal_reminder(settings["user_id"], meal_type, reminder_key))
+            if len(batch) >= REMINDER_BATCH_SIZE:
+                sent += await _insert_reminders(batch)
+                batch = []
+        if batch:
+            sent += await _insert_reminders(batch)
+
+    if sent:
+        logger.info(f"Sent {sent} meal reminders for {slot_time}")
+    return sent
+
+async def run_reminder_scheduler() -> None:
+    """
+    Send scheduled meal reminders every minute while holding the leader lock
+
+    Safe to start in every API worker or as a separate process; only the
+    lock holder dispatches. Minutes missed while the loop was busy or the
+    leader changed are caught up, up to REMINDER_MAX_CATCHUP_MINUTES.
+    """
+    timezone = ZoneInfo(config.REMINDER_TIMEZONE)
+    last_slot = None
+
+    try:
+        while True:
+            try:
+                if await acquire_lock(REMINDER_LOCK_NAME, REMINDER_LOCK_TTL_SECONDS):
+                    current_slot = datetime.now(timezone).replace(second=0, microsecond=0, tzinfo=None)
+                    earliest_slot = current_slot - timedelta(minutes=REMINDER_MAX_CATCHUP_MINUTES)
+                    slot = max(last_slot + timedelta(minutes=1), earliest_slot) if last_slot else earliest_slot
+
+                    # Process every minute since the last run, sent reminders are deduplicated
+                    while slot <= current_slot:
+                        await dispatch_due_reminders(slot)
+                        last_slot = slot
+                        slot += timedelta(minutes=1)
+                else:
+                    # Another worker leads, catch up from scratch if leadership moves here
+                    last_slot = None
+            except Exception as e:
+                logger.error(f"Error in reminder scheduler: {str(e)}")
+
+            await asyncio.sleep(REMINDER_TICK_SECONDS)
+    finally:
+        await release_lock(REMINDER_LOCK_NAME)
+
+if __name__ == "__main__":
+    # Run as a standalone worker: python -m src.services.notification.reminder_scheduler
+    asyncio.run(run_reminder_scheduler())
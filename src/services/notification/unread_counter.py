@@ -0,0 +1,101 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable
+from pymongo import UpdateOne
+
+from src.config.constants import UNREAD_RECOUNT_SECONDS
+from src.config.database import notifications_collection, notification_counters_collection
+
+async def recount_unread(user_id: str) -> int:
+    """
+    Recount a user's unread notifications and store the result in their counter
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        Number of unread notifications
+    """
+    unread = await notifications_collection.count_documents({"user_id": user_id, "is_read": False})
+    now = datetime.utcnow()
+    await notification_counters_collection.update_one(
+        {"_id": user_id},
+        {"$set": {"unread": unread, "counted_at": now, "updated_at": now}},
+        upsert=True
+    )
+    return unread
+
+async def get_unread_count(user_id: str) -> int:
+    """
+    Get a user's unread notification count from their counter document
+
+    Every change to notifications adjusts the counter in place. A counter
+    that was never counted, or was last counted more than
+    UNREAD_RECOUNT_SECONDS ago, is recounted from the notifications, so
+    updates lost between a count and a write cannot drift it for long.
+
+    Args:
+        user_id: The ID of the user
+
+    Returns:
+        Number of unread notifications
+    """
+    counter = await notification_counters_collection.find_one({"_id": user_id}, {"unread": 1, "counted_at": 1})
+    stale_before = datetime.utcnow() - timedelta(seconds=UNREAD_RECOUNT_SECONDS)
+    if counter and counter.get("counted_at") and counter["counted_at"] > stale_before:
+        return max(0, counter.get("unread", 0))
+
+    return await recount_unread(user_id)
+
+async def increment_unread(user_id: str, amount: int = 1) -> None:
+    """
+    Add new unread notifications to a user's counter
+
+    A missing counter is created without counted_at, so the first read
+    still counts everything.
+
+    Args:
+        user_id: The ID of the user
+        amount: Number of new unread notifications
+    """
+    await notification_counters_collection.update_one(
+        {"_id": user_id},
+        {"$inc": {"unread": amount}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+async def increment_unread_many(user_ids: Iterable[str]) -> None:
+    """
+    Add new unread notifications for many users in one round trip
+
+    Args:
+        user_ids: One entry per new notification, repeated for several per user
+    """
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne({"_id": user_id}, {"$inc": {"unread": amount}, "$set": {"updated_at": now}}, upsert=True)
+        for user_id, amount in Counter(user_ids).items()
+    ]
+    if operations:
+        await notification_counters_collection.bulk_write(operations, ordered=False)
+
+async def decrement_unread(user_id: str, amount: int = 1) -> None:
+    """
+    Remove notifications that were read or deleted from a user's counter
+
+    Args:
+        user_id: The ID of the user
+        amount: Number of notifications no longer unread
+    """
+    if amount <= 0:
+        return
+
+    # Clamp at zero so a drifted counter cannot go negative
+    await notification_counters_collection.update_one(
+        {"_id": user_id},
+        [{"$set": {
+            "unread": {"$max": [0, {"$subtract": [{"$ifNull": ["$unread", 0]}, amount]}]},
+            "updated_at": datetime.utcnow()
+        }}],
+        upsert=True
+    )
@@ -1,10 +1,20 @@
-from datetime import datetime
+from datetime import datetime, date
 from typing import Dict, List, Any, Optional
 import math
+from pymongo import UpdateOne
 
-from src.config.database import profiles_collection, nutrition_targets_collection
+from src.config.database import nutrition_targets_collection
 from src.services.user.profile_manager import get_user_profile
+from src.utils.db_utils import upsert_document
 from src.schemas.nutrition.nutrition_schema import ProgressProjection
+from src.services.nutrition.target_tables import (
+    WATER_ML_PER_KG,
+    get_age,
+    lookup_bmr_offset,
+    lookup_energy_factors,
+    lookup_fiber,
+    derive_targets
+)
 
 async def calculate_bmr(profile: Dict[str, Any]) -> float:
     """
@@ -19,18 +29,11 @@ async def calculate_bmr(profile: Dict[str, Any]) -> float:
     # Extract profile data
     weight = profile.get("weight", 0)  # kg
     height = profile.get("height", 0)  # cm
-    birthdate = profile.get("birthdate")
-    gender = profile.get("gender")
-    
-    # Calculate age from birthdate
-    today = datetime.now().date()
-    age = today.year - birthdate.year - ((today.month, today.day) < (birthdate.month, birthdate.day))
+    age = get_age(profile.get("birthdate"))
+    offset = lookup_bmr_offset(profile.get("gender"))
     
     # Calculate BMR using Mifflin-St Jeor Equation
-    if gender == "MALE":
-        bmr = (10 * weight) + (6.25 * height) - (5 * age) + 5
-    else:  # FEMALE
-        bmr = (10 * weight) + (6.25 * height) - (5 * age) - 161
+    bmr = (10 * weight) + (6.25 * height) - (5 * age) + offset
     
     return round(bmr)
 
@@ -45,16 +48,8 @@ async def calculate_tdee(bmr: float, activity_level: str) -> float:
     Returns:
         float: Calculated TDEE
     """
-    # Activity multiplier based on activity level
-    activity_multipliers = {
-        "SEDENTARY": 1.2,
-        "LIGHTLY_ACTIVE": 1.375,
-        "MODERATELY_ACTIVE": 1.55,
-        "VERY_ACTIVE": 1.725,
-        "EXTRA_ACTIVE": 1.9
-    }
-    
-    multiplier = activity_multipliers.get(activity_level, 1.2)
+    # Activity multiplier from the precomputed table
+    multiplier = lookup_energy_factors(activity_level, None, None)[0]
     tdee = bmr * multiplier
     
     return round(tdee)
@@ -72,29 +67,9 @@ async def calculate_macros(tdee: float, goal: str, diet_type: str, profile: Dict
     Returns:
         Dict: Calculated macronutrient targets
     """
-    # Adjust calories based on goal
-    if goal == "LOSE":
-        calorie_target = tdee - 500  # 500 calorie deficit
-    elif goal == "GAIN":
-        calorie_target = tdee + 500  # 500 calorie surplus
-    else:  # MAINTAIN
-        calorie_target = tdee
-    
-    # Base macro distribution (protein/carbs/fat) based on diet type
-    # Format: (carbs_ratio, protein_ratio, fat_ratio)
-    macro_ratios = {
-        "BALANCED": (0.50, 0.20, 0.30),
-        "VEGETARIAN": (0.55, 0.15, 0.30),
-        "VEGAN": (0.60, 0.15, 0.25),
-        "PALEO": (0.30, 0.30, 0.40),
-        "KETO": (0.05, 0.20, 0.75),
-        "HIGH_PROTEIN": (0.25, 0.35, 0.40),
-        "LOW_CARB": (0.20, 0.30, 0.50),
-        # Default to balanced if not specified
-        "STANDARD": (0.50, 0.20, 0.30)
-    }
-    
-    carbs_ratio, protein_ratio, fat_ratio = macro_ratios.get(diet_type, macro_ratios["STANDARD"])
+    # Goal adjustment and macro distribution from the precomputed table
+    _, adjustment, carbs_ratio, protein_ratio, fat_ratio = lookup_energy_factors(None, goal, diet_type)
+    calorie_target = tdee + adjustment
     
     # Calculate macros in grams
     protein_cals = calorie_target * protein_ratio
@@ -105,35 +80,12 @@ async def calculate_macros(tdee: float, goal: str, diet_type: str, profile: Dict
     carbs_g = round(carbs_cals / 4)      # 4 calories per gram of carbs
     fat_g = round(fat_cals / 9)          # 9 calories per gram of fat
     
-    # Calculate fiber based on gender and age
-    gender = profile.get("gender", "MALE")
-    birthdate = profile.get("birthdate")
-    
-    # Calculate age
-    today = datetime.now().date()
-    age = today.year - birthdate.year - ((today.month, today.day) < (birthdate.month, birthdate.day))
-    
-    # Determine fiber based on age and gender according to guidelines
-    fiber_g = 25  # Default value
-    
-    if age >= 18:
-        if age <= 50:
-            fiber_g = 38 if gender == "MALE" else 25
-        else:  # age > 50
-            fiber_g = 30 if gender == "MALE" else 21
-    else:  # Under 18
-        if age <= 3:
-            fiber_g = 19
-        elif age <= 8:
-            fiber_g = 25
-        elif age <= 13:
-            fiber_g = 26 if gender == "MALE" else 24
-        else:  # age <= 18
-            fiber_g = 38 if gender == "MALE" else 26
+    # Fiber from the age band and gender
+    fiber_g = lookup_fiber(profile.get("gender"), get_age(profile.get("birthdate")))
     
     # Calculate water recommendation (ml = weight in kg * 30)
     weight_kg = profile.get("weight", 70)
-    water_ml = round(weight_kg * 30)
+    water_ml = round(weight_kg * WATER_ML_PER_KG)
     
     return {
         "calories": round(calorie_target),
@@ -144,62 +96,55 @@ async def calculate_macros(tdee: float, goal: str, diet_type: str, profile: Dict
         "water": water_ml
     }
 
-async def create_or_update_nutrition_target(user_id: str) -> Dict[str, Any]:
+async def create_or_update_nutrition_target(user_id: str, profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Create or update a user's nutrition targets
     
     Args:
         user_id: User ID
+        profile: Optional profile already loaded by the caller
     
     Returns:
         Dict: Created or updated nutrition targets
     """
     # Get user profile
-    profile = await get_user_profile(user_id)
+    if profile is None:
+        profile = await get_user_profile(user_id)
     if not profile:
         return {"error": "User profile not found"}
     
-    # Calculate BMR and TDEE
-    bmr = await calculate_bmr(profile)
-    tdee = await calculate_tdee(bmr, profile["activity_level"])
-    
-    # Calculate macros
-    macros = await calculate_macros(tdee, profile["goal"], profile["diet_type"], profile)
-    
-    # Prepare nutrition target data
-    target_data = {
-        "user_id": user_id,
-        "bmr": bmr,
-        "tdee": tdee,
-        "calories": macros["calories"],
-        "protein": macros["protein"],
-        "carb": macros["carb"],
-        "fat": macros["fat"],
-        "fiber": macros["fiber"],
-        "water": macros["water"],
-        "updated_at": datetime.utcnow()
-    }
-    
-    # Check if target already exists
-    existing_target = await nutrition_targets_collection.find_one({"user_id": user_id})
+    # Same derivation as the bulk recompute, so both write identical targets
+    target_data = derive_targets([profile])[0]
+    if target_data is None:
+        return {"error": "Profile is missing weight, height or birthdate"}
     
-    if existing_target:
-        # Update existing target
-        await nutrition_targets_collection.update_one(
-            {"user_id": user_id},
-            {"$set": target_data}
-        )
-    else:
-        # Create new target
-        target_data["created_at"] = datetime.utcnow()
-        await nutrition_targets_collection.insert_one(target_data)
+    # Create or update the target and read it back in one step
+    return await upsert_document(nutrition_targets_collection, {"user_id": user_id}, target_data)
+
+async def write_targets_for_profiles(profiles: List[Dict[str, Any]], today: Optional[date] = None) -> int:
+    """
+    Derive and store targets for one batch of profiles
     
-    # Get the updated target
-    updated_target = await nutrition_targets_collection.find_one({"user_id": user_id})
-    if updated_target:
-        updated_target["id"] = str(updated_target["_id"])
+    Args:
+        profiles: Profiles with user_id and the fields targets depend on
+        today: Reference date for ages, defaults to today
     
-    return updated_target
+    Returns:
+        int: Number of targets written
+    """
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
+            {"user_id": profile["user_id"]},
+            {"$set": {**target, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+            upsert=True
+        )
+        for profile, target in zip(profiles, derive_targets(profiles, today))
+        if target
+    ]
+    if operations:
+        await nutrition_targets_collection.bulk_write(operations, ordered=False)
+    return len(operations)
 
 async def calculate_progress_projection(
     start_weight: float, 
@@ -0,0 +1,186 @@
+import bisect
+from datetime import datetime, date
+from itertools import product
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+# Activity multipliers applied to BMR
+ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "lightly_active": 1.375,
+    "moderately_active": 1.55,
+    "very_active": 1.725,
+    "extremely_active": 1.9
+}
+DEFAULT_ACTIVITY = "sedentary"
+
+# Daily calorie adjustment per weight goal
+GOAL_ADJUSTMENTS = {
+    "lose": -500,  # 500 calorie deficit
+    "maintain": 0,
+    "gain": 500  # 500 calorie surplus
+}
+DEFAULT_GOAL = "maintain"
+
+# Macro distribution per diet type: (carbs_ratio, protein_ratio, fat_ratio)
+MACRO_RATIOS = {
+    "balanced": (0.50, 0.20, 0.30),
+    "vegetarian": (0.55, 0.15, 0.30),
+    "vegan": (0.60, 0.15, 0.25),
+    "paleo": (0.30, 0.30, 0.40),
+    "keto": (0.05, 0.20, 0.75),
+    "high_protein": (0.25, 0.35, 0.40),
+    "low_carb": (0.20, 0.30, 0.50)
+}
+DEFAULT_DIET = "balanced"
+
+# Mifflin-St Jeor constant per gender, other genders use the female constant
+BMR_GENDER_OFFSETS = {"male": 5}
+DEFAULT_BMR_OFFSET = -161
+
+# Fiber bands: upper age of each band, then grams per day for (male, other)
+FIBER_AGE_LIMITS = [3, 8, 13, 17, 50]
+FIBER_BANDS = [(19, 19), (25, 25), (26, 24), (38, 26), (38, 25), (30, 21)]
+
+# Water in ml per kg of body weight
+WATER_ML_PER_KG = 30
+
+def _normalize(value: Any) -> str:
+    """Normalize enum values stored in either case, e.g. "MALE" or Gender.MALE"""
+    return str(getattr(value, "value", value) or "").lower()
+
+def _build_energy_table() -> Dict[Tuple[str, str, str], Tuple[float, int, float, float, float]]:
+    """Combine every activity, goal and diet into one lookup built at import"""
+    return {
+        (activity, goal, diet): (multiplier, adjustment, *ratios)
+        for (activity, multiplier), (goal, adjustment), (diet, ratios) in product(
+            ACTIVITY_MULTIPLIERS.items(), GOAL_ADJUSTMENTS.items(), MACRO_RATIOS.items()
+        )
+    }
+
+# {(activity, goal, diet): (multiplier, calorie adjustment, carbs, protein, fat ratios)}
+ENERGY_TABLE = _build_energy_table()
+
+def lookup_energy_factors(activity_level: Any, goal: Any, diet_type: Any) -> Tuple[float, int, float, float, float]:
+    """
+    Get the activity multiplier, goal adjustment and macro ratios for a profile
+
+    Args:
+        activity_level: Activity level
+        goal: Weight goal
+        diet_type: Diet type
+
+    Returns:
+        Tuple of multiplier, calorie adjustment and carbs, protein, fat ratios
+    """
+    activity = _normalize(activity_level)
+    goal = _normalize(goal)
+    diet = _normalize(diet_type)
+    return ENERGY_TABLE[(
+        activity if activity in ACTIVITY_MULTIPLIERS else DEFAULT_ACTIVITY,
+        goal if goal in GOAL_ADJUSTMENTS else DEFAULT_GOAL,
+        diet if diet in MACRO_RATIOS else DEFAULT_DIET
+    )]
+
+def get_age(birthdate: Any, today: Optional[date] = None) -> int:
+    """
+    Calculate age in full years from a stored birthdate
+
+    Args:
+        birthdate: Birthdate as date, datetime or ISO string
+        today: Reference date, defaults to today
+
+    Returns:
+        Age in years
+    """
+    if isinstance(birthdate, str):
+        birthdate = datetime.fromisoformat(birthdate)
+    if isinstance(birthdate, datetime):
+        birthdate = birthdate.date()
+    today = today or datetime.now().date()
+    return today.year - birthdate.year - ((today.month, today.day) < (birthdate.month, birthdate.day))
+
+def get_age_band(age: int) -> int:
+    """
+    Get the fiber band index an age falls into
+
+    Args:
+        age: Age in years
+
+    Returns:
+        Index into FIBER_BANDS
+    """
+    return bisect.bisect_left(FIBER_AGE_LIMITS, age)
+
+def lookup_fiber(gender: Any, age: int) -> int:
+    """
+    Get the daily fiber target for a gender and age
+
+    Args:
+        gender: Gender
+        age: Age in years
+
+    Returns:
+        Fiber in grams per day
+    """
+    male, other = FIBER_BANDS[get_age_band(age)]
+    return male if _normalize(gender) == "male" else other
+
+def lookup_bmr_offset(gender: Any) -> int:
+    """
+    Get the Mifflin-St Jeor constant for a gender
+
+    Args:
+        gender: Gender
+
+    Returns:
+        Constant added to the BMR formula
+    """
+    return BMR_GENDER_OFFSETS.get(_normalize(gender), DEFAULT_BMR_OFFSET)
+
+def derive_targets(profiles: Sequence[Dict[str, Any]], today: Optional[date] = None) -> List[Optional[Dict[str, int]]]:
+    """
+    Derive nutrition targets for many profiles at once without I/O
+
+    Synchronous and side-effect free, so a bulk recompute derives a whole
+    batch between two database calls at a few table lookups per profile.
+
+    Args:
+        profiles: Profiles with gender, birthdate, height, weight, activity_level, goal and diet_type
+        today: Reference date for ages, defaults to today
+
+    Returns:
+        Targets in input order, None for profiles missing a required field
+    """
+    today = today or datetime.now().date()
+    targets = []
+
+    for profile in profiles:
+        weight = profile.get("weight")
+        height = profile.get("height")
+        birthdate = profile.get("birthdate")
+        if not weight or not height or not birthdate:
+            targets.append(None)
+            continue
+
+        age = get_age(birthdate, today)
+        multiplier, adjustment, carbs_ratio, protein_ratio, fat_ratio = lookup_energy_factors(
+            profile.get("activity_level"), profile.get("goal"), profile.get("diet_type")
+        )
+        offset = lookup_bmr_offset(profile.get("gender"))
+
+        bmr = round((10 * weight) + (6.25 * height) - (5 * age) + offset)
+        tdee = round(bmr * multiplier)
+        calories = tdee + adjustment
+
+        targets.append({
+            "bmr": bmr,
+            "tdee": tdee,
+            "calories": calories,
+            "protein": round(calories * protein_ratio / 4),  # 4 calories per gram
+            "carb": round(calories * carbs_ratio / 4),  # 4 calories per gram
+            "fat": round(calories * fat_ratio / 9),  # 9 calories per gram
+            "fiber": lookup_fiber(profile.get("gender"), age),
+            "water": round(weight * WATER_ML_PER_KG)
+        })
+
+    return targets
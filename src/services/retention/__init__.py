@@ -0,0 +1,11 @@
+from src.services.retention.retention_service import (
+    archive_read_notifications,
+    get_collection_sizes,
+    run_retention_job
+)
+
+__all__ = [
+    "archive_read_notifications",
+    "get_collection_sizes",
+    "run_retention_job"
+]
@@ -0,0 +1,138 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+from pymongo import UpdateOne
+
+from src.config.database import db, notifications_collection, notification_archives_collection
+from src.config.constants import (
+    NOTIFICATION_ARCHIVE_AFTER_DAYS,
+    NOTIFICATION_ARCHIVE_RETENTION_DAYS,
+    RETENTION_BATCH_SIZE,
+    RETENTION_INTERVAL_SECONDS,
+    RETENTION_LOCK_NAME,
+    RETENTION_LOCK_TTL_SECONDS
+)
+from src.utils.error_handling import logger
+from src.utils.leader_lock import acquire_lock, release_lock
+
+def _archive_item(notification: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only what the history view needs from an archived notification"""
+    return {
+        "id": notification["_id"],
+        "type": notification.get("type"),
+        "title": notification.get("title"),
+        "created_at": notification["created_at"]
+    }
+
+async def archive_read_notifications(
+    older_than_days: int = NOTIFICATION_ARCHIVE_AFTER_DAYS,
+    batch_size: int = RETENTION_BATCH_SIZE
+) -> int:
+    """
+    Move old read notifications into monthly archive buckets
+
+    Each bucket holds one user's month as a single compact document. Items
+    are added with $addToSet, so a batch retried after a crash between the
+    bucket write and the delete does not duplicate anything.
+
+    Args:
+        older_than_days: Age after which read notifications are archived
+        batch_size: Notifications moved per round
+
+    Returns:
+        Number of notifications archived
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    query = {"is_read": True, "created_at": {"$lt": cutoff}}
+    archived = 0
+
+    while True:
+        notifications = await notifications_collection.find(
+            query, {"user_id": 1, "type": 1, "title": 1, "created_at": 1}
+        ).limit(batch_size).to_list(length=batch_size)
+        if not notifications:
+            break
+
+        # Group the batch into one bucket per user and month
+        buckets = defaultdict(list)
+        for notification in notifications:
+            month = notification["created_at"].strftime("%Y-%m")
+            buckets[(notification["user_id"], month)].append(_archive_item(notification))
+
+        now = datetime.utcnow()
+        operations = []
+        for (user_id, month), items in buckets.items():
+            month_start = datetime.strptime(month, "%Y-%m")
+            operations.append(UpdateOne(
+                {"_id": f"{user_id}:{month}"},
+                {
+                    "$addToSet": {"items": {"$each": items}},
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {
+                        "user_id": user_id,
+                        "month": month,
+                        "expires_at": month_start + timedelta(days=NOTIFICATION_ARCHIVE_RETENTION_DAYS)
+                    }
+                },
+                upsert=True
+            ))
+        await notification_archives_collection.bulk_write(operations, ordered=False)
+
+        # Remove the originals only once they are safely archived
+        result = await notifications_collection.delete_many(
+            {"_id": {"$in": [notification["_id"] for notification in notifications]}}
+        )
+        archived += result.deleted_count
+
+        # Yield between batches so request handling is not starved
+        await asyncio.sleep(0)
+
+    if archived:
+        logger.info(f"Archived {archived} read notifications older than {older_than_days} days")
+    return archived
+
+async def get_collection_sizes() -> List[Dict[str, Any]]:
+    """
+    Report document counts and storage sizes for every collection
+
+    Returns:
+        Collection sizes in bytes, largest working set first
+    """
+    report = []
+    for name in await db.list_collection_names():
+        stats = await db.command("collStats", name)
+        report.append({
+            "collection": name,
+            "count": stats.get("count", 0),
+            "size": stats.get("size", 0),
+            "avg_document_size": stats.get("avgObjSize", 0),
+            "storage_size": stats.get("storageSize", 0),
+            "index_size": stats.get("totalIndexSize", 0)
+        })
+
+    report.sort(key=lambda row: row["size"] + row["index_size"], reverse=True)
+    return report
+
+async def run_retention_job(interval_seconds: Optional[int] = None) -> None:
+    """
+    Archive old notifications periodically on one worker at a time
+
+    TTL indexes expire tokens, locks and archive buckets on their own; this
+    job covers the retention that needs more than a delete.
+
+    Args:
+        interval_seconds: Delay between runs, defaults to RETENTION_INTERVAL_SECONDS
+    """
+    interval_seconds = interval_seconds or RETENTION_INTERVAL_SECONDS
+    try:
+        while True:
+            try:
+                if await acquire_lock(RETENTION_LOCK_NAME, RETENTION_LOCK_TTL_SECONDS):
+                    await archive_read_notifications()
+            except Exception as e:
+                logger.error(f"Error in retention job: {str(e)}")
+
+            await asyncio.sleep(interval_seconds)
+    finally:
+        await release_lock(RETENTION_LOCK_NAME)
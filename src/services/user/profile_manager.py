@@ -3,6 +3,7 @@ from typing import Optional, Dict, Any
 from bson import ObjectId
 
 from src.config.database import profiles_collection
+from src.utils.db_utils import upsert_document
 
 async def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
     """
@@ -19,6 +20,25 @@ async def get_user_profile(user_id: str) -> Optional[Dict[str, Any]]:
         profile["id"] = str(profile["_id"])
     return profile
 
+def get_bmi_category(bmi: float) -> str:
+    """
+    Return the BMI category for a given BMI value
+    
+    Args:
+        bmi: BMI value
+    
+    Returns:
+        str: BMI category description
+    """
+    if bmi < 18.5:
+        return "Underweight"
+    elif bmi < 25:
+        return "Normal weight"
+    elif bmi < 30:
+        return "Overweight"
+    else:
+        return "Obesity"
+
 async def update_profile_field(user_id: str, field: str, value: Any) -> Dict[str, Any]:
     """
     Update a single field in a user's profile
@@ -31,22 +51,7 @@ async def update_profile_field(user_id: str, field: str, value: Any) -> Dict[str
     Returns:
         Dict: Update status
     """
-    # Check if user has a profile
-    profile = await profiles_collection.find_one({"user_id": user_id})
-    
-    if profile:
-        # Update existing profile
-        await profiles_collection.update_one(
-            {"user_id": user_id},
-            {"$set": {field: value, "updated_at": datetime.utcnow()}}
-        )
-    else:
-        # Create a new profile with the field
-        await profiles_collection.insert_one({
-            "user_id": user_id,
-            field: value,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        })
+    # Update the profile, creating it with the field if the user has none
+    await upsert_document(profiles_collection, {"user_id": user_id}, {field: value})
     
     return {"status": "success", field: value}
\ No newline at end of file
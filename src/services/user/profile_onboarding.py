@@ -0,0 +1,126 @@
+from datetime import datetime, date
+from typing import Dict, Any, Optional
+from fastapi import HTTPException
+
+from src.config.database import profiles_collection
+from src.services.user.profile_manager import get_bmi_category
+from src.services.nutrition.nutrition_calculator import create_or_update_nutrition_target
+from src.utils.db_utils import upsert_document
+
+# Fields needed before a nutrition target can be calculated
+TARGET_REQUIRED_FIELDS = ["gender", "birthdate", "height", "weight", "goal", "activity_level", "diet_type"]
+
+# Largest safe weight change per week in kg
+MAX_WEEKLY_WEIGHT_CHANGE = 1.0
+
+def calculate_age(birthdate: date, today: Optional[date] = None) -> int:
+    """
+    Calculate age in full years
+
+    Args:
+        birthdate: Date of birth
+        today: Reference date, defaults to today
+
+    Returns:
+        Age in years
+    """
+    today = today or datetime.now().date()
+    return today.year - birthdate.year - ((today.month, today.day) < (birthdate.month, birthdate.day))
+
+def _validate_weight_goal(profile: Dict[str, Any]) -> Optional[float]:
+    """Check the desired weight against the goal, returning the weekly change"""
+    desired_weight = profile.get("desired_weight")
+    weight = profile.get("weight")
+    if desired_weight is None or not weight:
+        return None
+
+    if profile.get("goal") == "maintain" and desired_weight != weight:
+        raise HTTPException(
+            status_code=400,
+            detail="Desired weight should match current weight for maintenance goal"
+        )
+
+    duration = profile.get("goal_duration_weeks") or 0
+    weekly_change = (desired_weight - weight) / duration if duration > 0 else 0
+    if abs(weekly_change) > MAX_WEEKLY_WEIGHT_CHANGE:
+        raise HTTPException(
+            status_code=400,
+            detail="Weekly weight change is too aggressive (max 1kg per week)"
+        )
+    return round(weekly_change, 2)
+
+async def apply_profile_changes(user_id: str, changes: Dict[str, Any], complete: bool = False) -> Dict[str, Any]:
+    """
+    Apply any subset of onboarding fields in one atomic update
+
+    Derived fields (age, BMI) are recomputed from the merged profile and the
+    nutrition target is refreshed once all fields it needs are present.
+
+    Args:
+        user_id: User ID
+        changes: Profile fields to set
+        complete: Whether to mark the profile as completed
+
+    Returns:
+        Dict: Updated profile, weekly weight change and nutrition target
+    """
+    try:
+        # Merge with the stored profile to derive fields that span several inputs
+        current = await profiles_collection.find_one({"user_id": user_id}) or {}
+        update_data = dict(changes)
+
+        # Dates are stored as datetimes, BSON has no date type
+        if isinstance(update_data.get("birthdate"), date) and not isinstance(update_data["birthdate"], datetime):
+            update_data["birthdate"] = datetime.combine(update_data["birthdate"], datetime.min.time())
+        merged = {**current, **update_data}
+
+        # Recompute age and BMI when their inputs change
+        if "birthdate" in update_data:
+            update_data["age"] = calculate_age(update_data["birthdate"].date())
+        if ("height" in update_data or "weight" in update_data) and merged.get("height") and merged.get("weight"):
+            height_m = merged["height"] / 100  # Convert cm to m
+            bmi = round(merged["weight"] / (height_m * height_m), 1)
+            update_data["bmi"] = bmi
+            update_data["bmi_category"] = get_bmi_category(bmi)
+
+        # Validate the weight goal against the merged values
+        weekly_change = _validate_weight_goal(merged)
+
+        # Completing requires every field the target depends on
+        missing_fields = [field for field in TARGET_REQUIRED_FIELDS if merged.get(field) is None]
+        if complete:
+            if missing_fields:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Please complete these profile fields first: {', '.join(missing_fields)}"
+                )
+            if merged["goal"] in ["lose", "gain"] and (
+                merged.get("desired_weight") is None or not merged.get("goal_duration_weeks")
+            ):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Please set desired weight and goal duration for weight loss/gain"
+                )
+            update_data["profile_completed"] = True
+
+        # Write every field in a single update
+        profile = await upsert_document(profiles_collection, {"user_id": user_id}, update_data)
+
+        # Refresh the target from the profile just written
+        nutrition_target = None
+        if not missing_fields:
+            nutrition_target = await create_or_update_nutrition_target(user_id, profile)
+            nutrition_target.pop("_id", None)
+        profile.pop("_id", None)
+
+        return {
+            "status": "success",
+            "profile": profile,
+            "weekly_change": weekly_change,
+            "nutrition_target": nutrition_target
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error updating profile: {str(e)}")
@@ -0,0 +1,19 @@
+import asyncio
+from typing import Coroutine, Set
+
+# Tasks run outside any request, cancelled and awaited on shutdown
+background_tasks: Set[asyncio.Task] = set()
+
+def start_background_task(coro: Coroutine) -> asyncio.Task:
+    """Run a coroutine for the lifetime of the app, keeping a reference to it"""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def cancel_background_tasks() -> None:
+    """Cancel running background tasks and wait for them, so their cleanup and lock releases run"""
+    tasks = list(background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
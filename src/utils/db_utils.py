@@ -3,6 +3,9 @@ from fastapi import HTTPException
 import asyncio
 import logging
 from datetime import datetime
+from typing import Dict, Any, Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 import structlog
 
 # Configure structured logging
@@ -68,6 +71,63 @@ async def safe_db_operation(operation, timeout=5, max_retries=3):
                 )
             await asyncio.sleep(1)
 
+def _overlaps(path: str, other: str) -> bool:
+    """Check whether two update paths touch the same field"""
+    return path == other or path.startswith(f"{other}.") or other.startswith(f"{path}.")
+
+async def upsert_document(
+    collection,
+    query: Dict[str, Any],
+    updates: Optional[Dict[str, Any]] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+    session=None
+) -> Dict[str, Any]:
+    """
+    Update or create a document and return it in one round trip
+
+    Fields in updates are always written; defaults only when the document
+    is created. Equality fields of the query are copied into new documents
+    by MongoDB itself.
+
+    Args:
+        collection: Motor collection to write to
+        query: Filter identifying the document, backed by a unique index
+        updates: Fields to set, also stamps updated_at when given
+        defaults: Fields for a newly created document
+        session: Optional Mongo session to join a running transaction
+
+    Returns:
+        The document after the write, with a string id
+    """
+    now = datetime.utcnow()
+    set_fields = {**updates, "updated_at": now} if updates else {}
+    on_insert = {
+        key: value for key, value in {"created_at": now, **(defaults or {})}.items()
+        if key not in query and not any(_overlaps(key, path) for path in set_fields)
+    }
+
+    update = {"$setOnInsert": on_insert}
+    if set_fields:
+        update["$set"] = set_fields
+
+    for attempt in range(2):
+        try:
+            document = await collection.find_one_and_update(
+                query,
+                update,
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+                session=session
+            )
+            break
+        except DuplicateKeyError:
+            # A concurrent request created the document first, the retry updates it
+            if attempt:
+                raise
+
+    document["id"] = str(document["_id"])
+    return document
+
 async def get_db_stats():
     """Get database connection pool statistics"""
     try:
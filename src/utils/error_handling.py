@@ -1,5 +1,4 @@
 import logging
-from logging.handlers import RotatingFileHandler
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -11,21 +10,12 @@ from datetime import datetime
 import os
 import uuid
 import sys
+import structlog
 
-# Configure logging with rotating file handler
-log_file_path = "app_errors.log"
-max_log_size = 10 * 1024 * 1024  # 10MB
-backup_count = 5  # Keep 5 backup logs
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        RotatingFileHandler(log_file_path, maxBytes=max_log_size, backupCount=backup_count),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+from src.utils.logging_config import configure_logging
+
+# Route all logging through the queued structured pipeline
+configure_logging()
 
 logger = logging.getLogger("uqifeed")
 
@@ -236,6 +226,23 @@ class SecureHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class RequestContextMiddleware(BaseHTTPMiddleware):
+    """Middleware to tag every log line of a request with its id, method and path"""
+    
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(
+            request_id=request_id,
+            method=request.method,
+            path=request.url.path
+        )
+        
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
 class APIMetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to track API metrics and performance"""
     
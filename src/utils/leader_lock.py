@@ -0,0 +1,52 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.config.database import scheduler_locks_collection
+
+# Identifies this process as a lock owner
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+async def acquire_lock(name: str, ttl_seconds: int, owner: str = INSTANCE_ID) -> bool:
+    """
+    Acquire or renew a named lock shared by all workers
+
+    The lock is held until it expires, so holders must renew it more often
+    than ttl_seconds. A crashed holder releases it by expiring.
+
+    Args:
+        name: Lock name, e.g. the job it guards
+        ttl_seconds: Seconds until the lock expires without renewal
+        owner: Owner ID, defaults to this process
+
+    Returns:
+        True if the caller holds the lock
+    """
+    now = datetime.utcnow()
+    try:
+        lock = await scheduler_locks_collection.find_one_and_update(
+            {"_id": name, "$or": [{"owner": owner}, {"expires_at": {"$lte": now}}]},
+            {
+                "$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)},
+                "$setOnInsert": {"acquired_at": now}
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Another owner holds an unexpired lock, so the upsert collided with it
+        return False
+    return lock is not None and lock["owner"] == owner
+
+async def release_lock(name: str, owner: str = INSTANCE_ID) -> None:
+    """
+    Release a named lock if this owner holds it
+
+    Args:
+        name: Lock name
+        owner: Owner ID, defaults to this process
+    """
+    await scheduler_locks_collection.delete_one({"_id": name, "owner": owner})
@@ -0,0 +1,134 @@
+import atexit
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
+
+import orjson
+import structlog
+
+import config
+from src.config.constants import LOG_SAMPLE_RATES, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUP_COUNT
+
+_listener: Optional[QueueListener] = None
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Queue handler that hands records to the listener thread unformatted
+
+    The queue never leaves the process, so records are not flattened to
+    strings here; only the per-request context is captured, since the
+    listener thread cannot see the caller's context variables.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not isinstance(record.msg, dict):
+            # Interpolate now, later mutations of the arguments must not show up
+            record.msg = record.getMessage()
+            record.args = None
+        record.request_context = structlog.contextvars.get_contextvars()
+        return record
+
+# Attributes every LogRecord has, anything else was passed in extra=
+_RECORD_ATTRIBUTES = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "request_context"}
+
+def _add_record_fields(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the call time, captured request context and extra= fields of stdlib records"""
+    record = event_dict["_record"]
+    # Formatting happens later on the listener thread, keep the time of the call
+    event_dict["timestamp"] = datetime.fromtimestamp(record.created, timezone.utc).isoformat().replace("+00:00", "Z")
+    for key, value in getattr(record, "request_context", {}).items():
+        event_dict.setdefault(key, value)
+    for key, value in record.__dict__.items():
+        if key not in _RECORD_ATTRIBUTES:
+            event_dict.setdefault(key, value)
+    return event_dict
+
+def _sample_events(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only a share of high-volume events, configured in LOG_SAMPLE_RATES"""
+    rate = LOG_SAMPLE_RATES.get(event_dict.get("event"))
+    if rate is not None:
+        if random.random() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+    return event_dict
+
+def _capture_exc_info(logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve exc_info=True in the calling thread, the listener has no exception in flight"""
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+def _orjson_dumps(event_dict: Dict[str, Any], default: Any = None, **kwargs: Any) -> str:
+    """JSONRenderer serializer using orjson"""
+    return orjson.dumps(event_dict, default=default).decode()
+
+def configure_logging() -> None:
+    """
+    Route stdlib logging and structlog through one non-blocking pipeline
+
+    Loggers put records on an in-process queue; a listener thread formats them
+    (JSON unless LOG_FORMAT is "console") and writes to stdout and the rotating
+    log file, so no log I/O happens on the event loop. Calling this again is
+    a no-op.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    shared_processors = [
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.add_logger_name
+    ]
+
+    structlog.configure(
+        processors=[
+            _sample_events,
+            structlog.stdlib.filter_by_level,
+            structlog.contextvars.merge_contextvars,
+            *shared_processors,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.StackInfoRenderer(),
+            _capture_exc_info,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True
+    )
+
+    renderer = structlog.dev.ConsoleRenderer(colors=False) if config.LOG_FORMAT == "console" else structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            _add_record_fields,
+            *shared_processors
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            renderer
+        ]
+    )
+
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if config.LOG_FILE:
+        handlers.append(RotatingFileHandler(
+            config.LOG_FILE, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Replace handlers added by earlier basicConfig calls or libraries
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    root.addHandler(_ContextQueueHandler(log_queue))
+    root.setLevel(config.LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, Optional
+
+from src.config.constants import (
+    LOOP_LAG_INTERVAL_SECONDS,
+    LOOP_LAG_WINDOW,
+    LOOP_LAG_REPORT_SECONDS,
+    LOOP_STALL_STACK_DEPTH
+)
+from src.utils.error_handling import logger
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop runs scheduled callbacks
+
+    A ticker sleeps for a fixed interval and records how much later than
+    asked it woke up; anything blocking the loop shows up as lag. A summary
+    is logged as the event_loop_lag metric and served by /health.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS, window: int = LOOP_LAG_WINDOW):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=window)
+        self._heartbeat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Lag statistics over the recent window, in milliseconds"""
+        if not self.samples:
+            return {"samples": 0}
+        ordered = sorted(self.samples)
+        return {
+            "samples": len(ordered),
+            "current_ms": round(self.samples[-1], 2),
+            "p50_ms": round(ordered[len(ordered) // 2], 2),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+            "max_ms": round(ordered[-1], 2)
+        }
+
+    async def run(self) -> None:
+        """Measure lag forever, logging a summary every LOOP_LAG_REPORT_SECONDS"""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        next_report = loop.time() + LOOP_LAG_REPORT_SECONDS
+
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            self._heartbeat = time.monotonic()
+            self.samples.append(max(0.0, (now - expected) * 1000))
+
+            if now >= next_report:
+                logger.info("event_loop_lag", extra=self.snapshot())
+                next_report = now + LOOP_LAG_REPORT_SECONDS
+
+    def start_stall_sampler(self, threshold_ms: float) -> None:
+        """
+        Log the loop thread's stack whenever the loop is blocked too long
+
+        A daemon thread checks the ticker's heartbeat; once the loop has not
+        come back for threshold_ms past a tick, it samples the loop thread's
+        stack once for that stall, naming the function holding the loop.
+        Nothing is sampled before the ticker's first tick, so startup work
+        done before run() is scheduled does not count as a stall.
+        Meant for debug mode: sampling costs little, but the stacks are noisy.
+
+        Args:
+            threshold_ms: Blocking time that triggers a sample
+        """
+        thread = threading.Thread(
+            target=self._sample_stalls,
+            args=(threshold_ms / 1000,),
+            name="loop-stall-sampler",
+            daemon=True
+        )
+        thread.start()
+
+    def _sample_stalls(self, threshold: float) -> None:
+        """Watch the heartbeat and sample stacks of stalls, runs on its own thread"""
+        reported_heartbeat = None
+        while True:
+            time.sleep(threshold / 2)
+            heartbeat = self._heartbeat
+            if heartbeat is None or not self.samples:
+                continue
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked < threshold or heartbeat == reported_heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported_heartbeat = heartbeat
+
+            stack = traceback.extract_stack(frame)
+            # Name the innermost frame of our own code, C calls and libraries sit above it
+            culprit = next(
+                (entry for entry in reversed(stack) if entry.filename.startswith(_APP_DIR)),
+                stack[-1]
+            )
+            logger.warning(
+                f"Event loop blocked for {blocked * 1000:.0f}ms in {culprit.name}",
+                extra={
+                    "blocked_ms": round(blocked * 1000, 1),
+                    "function": f"{culprit.name} ({os.path.relpath(culprit.filename)}:{culprit.lineno})",
+                    "stack": "".join(traceback.format_list(stack[-LOOP_STALL_STACK_DEPTH:]))
+                }
+            )
+
+# Shared monitor started at application startup
+loop_monitor = LoopLagMonitor()
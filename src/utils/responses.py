@@ -0,0 +1,48 @@
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from bson import ObjectId, Decimal128
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+def _default(value: Any) -> Any:
+    """Convert the types orjson does not serialize itself"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return float(value.to_decimal())
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.dict(by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps_mongo(content: Any) -> bytes:
+    """
+    Serialize documents read from MongoDB to JSON
+
+    datetime and date are written natively as ISO 8601, ObjectIds as strings.
+
+    Args:
+        content: Documents, lists and plain values
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson, accepting raw Mongo documents
+
+    Returning it from an endpoint skips FastAPI's response_model validation
+    and filtering, so only return documents already projected to the fields
+    of the endpoint's response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_mongo(content)
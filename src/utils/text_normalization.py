@@ -0,0 +1,37 @@
+import re
+import unicodedata
+
+# Letters that do not decompose into a base letter plus a combining mark
+_SPECIAL_LETTERS = str.maketrans({"đ": "d", "Đ": "D"})
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def fold_diacritics(text: str) -> str:
+    """
+    Remove diacritics from text, e.g. "Phở bò" -> "Pho bo"
+
+    Args:
+        text: Text to fold
+
+    Returns:
+        Text with accents and tone marks removed
+    """
+    decomposed = unicodedata.normalize("NFKD", text.translate(_SPECIAL_LETTERS))
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a food or ingredient name for matching and deduplication
+
+    Folds diacritics and case and collapses punctuation and whitespace, so
+    "Rice  Noodles", "rice-noodles" and "Rice Noodles " share one key.
+
+    Args:
+        name: Display name
+
+    Returns:
+        Normalized key, empty string for blank names
+    """
+    if not name:
+        return ""
+    folded = fold_diacritics(name).casefold()
+    return _NON_ALNUM.sub(" ", folded).strip()
@@ -0,0 +1,298 @@
+import contextlib
+import functools
+import inspect
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+
+from src.utils.error_handling import logger
+
+class Span:
+    """A timed operation inside a trace"""
+
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "trace_id", "start_ns", "end_ns", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.trace_id = trace_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration in milliseconds, up to now while the span is open"""
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+class Trace:
+    """Spans recorded for one request or unit of work"""
+
+    def __init__(self, name: str, **attributes: Any):
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self.root = Span(name, self.trace_id, None, attributes)
+
+class InMemorySpanExporter:
+    """Keeps finished traces in memory, for tests and local inspection"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, trace: Trace) -> None:
+        self.spans.append(trace.root)
+        self.spans.extend(trace.spans)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+class OpenTelemetryExporter:
+    """
+    Re-creates finished traces as OpenTelemetry spans
+
+    Only the opentelemetry-api package is needed here; where the spans go is
+    decided by the SDK the deployment configures.
+    """
+
+    def __init__(self):
+        from opentelemetry import trace as otel_trace
+        self._otel_trace = otel_trace
+        self._tracer = otel_trace.get_tracer("uqifeed")
+
+    def export(self, trace: Trace) -> None:
+        otel_spans = {}
+        # Parents start before their children, so they exist when a child is created
+        recorded = sorted([trace.root, *trace.spans], key=lambda item: item.start_ns)
+        for item in recorded:
+            parent = otel_spans.get(item.parent_id)
+            context = self._otel_trace.set_span_in_context(parent) if parent else None
+            otel_spans[item.span_id] = self._tracer.start_span(
+                item.name,
+                context=context,
+                start_time=item.start_ns,
+                attributes={k: v for k, v in item.attributes.items() if isinstance(v, (str, bool, int, float))}
+            )
+        for item in recorded:
+            otel_span = otel_spans[item.span_id]
+            if item.error:
+                otel_span.set_status(self._otel_trace.Status(self._otel_trace.StatusCode.ERROR, item.error))
+            otel_span.end(end_time=item.end_ns)
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_exporters: List[Any] = []
+
+def add_exporter(exporter: Any) -> None:
+    """Register an exporter called with every finished trace"""
+    _exporters.append(exporter)
+
+def remove_exporter(exporter: Any) -> None:
+    """Unregister an exporter"""
+    _exporters.remove(exporter)
+
+def enable_opentelemetry_export() -> bool:
+    """
+    Export traces through OpenTelemetry when its API package is installed
+
+    Returns:
+        bool: Whether the exporter was registered
+    """
+    try:
+        add_exporter(OpenTelemetryExporter())
+        return True
+    except ImportError:
+        logger.warning("OpenTelemetry export requested but opentelemetry-api is not installed")
+        return False
+
+@contextlib.contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """
+    Record spans of the enclosed work into a new trace
+
+    Args:
+        name: Name of the root span, e.g. "GET /foods/"
+        attributes: Attributes of the root span
+
+    Yields:
+        Trace: The trace being recorded, exported to every exporter on exit
+    """
+    trace = Trace(name, **attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(trace.root)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.root.error = type(e).__name__
+        raise
+    finally:
+        trace.root.end_ns = time.time_ns()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        for exporter in _exporters:
+            try:
+                exporter.export(trace)
+            except Exception as e:
+                logger.warning(f"Span exporter {type(exporter).__name__} failed: {str(e)}")
+
+def _open_span(name: str, attributes: Dict[str, Any]) -> Optional[Span]:
+    """Create a child of the current span, None outside a trace"""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    child = Span(name, trace.trace_id, parent.span_id if parent else None, attributes)
+    trace.spans.append(child)
+    return child
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the enclosed block as a span of the current trace
+
+    Outside a trace nothing is recorded, so instrumented code costs next to
+    nothing in background jobs.
+
+    Args:
+        name: Span name, e.g. "gemini.generate_content"
+        attributes: Span attributes
+
+    Yields:
+        Optional[Span]: The open span, None outside a trace
+    """
+    current = _open_span(name, attributes)
+    if current is None:
+        yield None
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+
+def traced(name: str) -> Callable:
+    """
+    Decorator recording every call of a function as a span
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorator for sync and async functions
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return sync_wrapper
+    return decorator
+
+def server_timing(trace: Trace, limit: int) -> str:
+    """
+    Summarize a trace as a Server-Timing header value
+
+    Spans are grouped by name; the groups that took longest are listed with
+    their total duration and call count, followed by the whole request.
+
+    Args:
+        trace: Finished trace
+        limit: Maximum number of span groups listed
+
+    Returns:
+        str: Header value, e.g. 'mongo.find;dur=12.4;desc="3 calls", total;dur=40.1'
+    """
+    totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+    for child in trace.spans:
+        totals[child.name][0] += child.duration_ms
+        totals[child.name][1] += 1
+
+    top: List[Tuple[str, List[float]]] = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+    entries = [
+        f'{name};dur={duration:.1f};desc="{count} call{"" if count == 1 else "s"}"'
+        for name, (duration, count) in top
+    ]
+    entries.append(f"total;dur={trace.root.duration_ms:.1f}")
+    return ", ".join(entries)
+
+class MongoCommandTracer(monitoring.CommandListener):
+    """
+    Records every MongoDB command as a span of the trace that issued it
+
+    Motor runs commands on its executor threads with a copy of the caller's
+    context, so the current trace and span are visible here.
+    """
+
+    def __init__(self):
+        self._started: Dict[Tuple[Any, int], Span] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = event.command.get(event.command_name)
+        attributes = {"db.system": "mongodb", "db.name": event.database_name, "db.operation": event.command_name}
+        if isinstance(collection, str):
+            attributes["db.collection"] = collection
+        current = _open_span(f"mongo.{event.command_name}", attributes)
+        if current is not None:
+            self._started[(event.connection_id, event.request_id)] = current
+
+    def _finish(self, event: Any, error: Optional[str] = None) -> None:
+        current = self._started.pop((event.connection_id, event.request_id), None)
+        if current is not None:
+            current.end_ns = current.start_ns + event.duration_micros * 1000
+            current.error = error
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, error=str(event.failure.get("codeName") or event.failure.get("errmsg") or "failed"))
+
+class TracingMiddleware:
+    """
+    Middleware to record each request as a trace and report it in Server-Timing
+
+    A plain ASGI middleware, so the trace stays open until the application has
+    sent the last body chunk; streamed responses are timed in full. The
+    Server-Timing header goes out with the response start, so for streams it
+    only covers the work done before the first byte.
+    """
+
+    def __init__(self, app: Any, server_timing_limit: Optional[int] = None):
+        self.app = app
+        self.server_timing_limit = server_timing_limit
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        with start_trace(f"{method} {path}", method=method, path=path) as trace:
+            async def send_with_timing(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    trace.root.attributes["status_code"] = message["status"]
+                    if self.server_timing_limit:
+                        MutableHeaders(scope=message).append(
+                            "Server-Timing", server_timing(trace, self.server_timing_limit)
+                        )
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)